@@ -0,0 +1,4 @@
+"""
+benchmarks
+Offline, CPU üzerinde çalışan pipeline benchmark paketi
+"""
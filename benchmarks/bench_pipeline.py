@@ -0,0 +1,369 @@
+"""
+benchmarks/bench_pipeline.py
+DetectionThread aşamaları ve uçtan uca döngü için benchmark'lar
+"""
+
+import os
+import tempfile
+import time
+
+import cv2
+import numpy as np
+import torch
+from ultralytics.engine.results import Results
+
+from src.core.frame_pool import release
+from src.core.raw_capture import RawCaptureWriter, ReplayCapture
+
+from .harness import benchmark, time_calls
+from .synthetic_video import generate_video, iter_frames
+from .tiny_model import save_tiny_model
+
+
+class BenchContext:
+    """Benchmark'ların paylaştığı çalışma klasörü, model, video ve frame'ler"""
+
+    def __init__(self, width=640, height=480, fps=30, seconds=3.0, repeats=30, seed=0,
+                 workdir=None):
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.seconds = seconds
+        self.repeats = repeats
+        self.seed = seed
+
+        self._tempdir = None
+        if workdir is None:
+            self._tempdir = tempfile.TemporaryDirectory(prefix="civata_bench_")
+            workdir = self._tempdir.name
+        self.workdir = os.path.abspath(workdir)
+        self._previous_cwd = None
+
+        self.model_path = os.path.join(self.workdir, "tiny_yolo.pt")
+        self.video_path = os.path.join(self.workdir, "synthetic.mp4")
+        self.frames = []  # [(frame, boxes)]
+        self._model = None
+
+    def __enter__(self):
+        # DetectionThread göreli yollara yazar (data/cropped, src/source)
+        self._previous_cwd = os.getcwd()
+        os.chdir(self.workdir)
+        os.makedirs("data/cropped", exist_ok=True)
+
+        save_tiny_model(self.model_path, self.seed)
+        self.num_frames = generate_video(self.video_path, self.width, self.height, self.fps,
+                                         self.seconds, seed=self.seed)
+        self.frames = list(iter_frames(self.width, self.height, self.num_frames, seed=self.seed))
+        return self
+
+    def __exit__(self, *exc):
+        os.chdir(self._previous_cwd)
+        if self._tempdir is not None:
+            self._tempdir.cleanup()
+
+    def make_config(self, sources=None):
+        """Benchmark için Config oluştur"""
+        from src.core.config import Config
+
+        config = Config(os.path.join(self.workdir, "bench_config.json"))
+        config.model_path = self.model_path
+        config.metrics_enabled = False
+        config.sources = sources if sources is not None else {0: self.video_path}
+        config.source_count = len(config.sources)
+        return config
+
+    def make_thread(self, load_model=True):
+        """Modeli yüklenmiş, run() edilmemiş DetectionThread döndür"""
+        from src.core.detection_thread import DetectionThread
+        from src.core.stats_aggregator import StatsAggregator
+
+        thread = DetectionThread(self.make_config())
+        if load_model:
+            if self._model is None:
+                thread.load_model()
+                self._model = thread.model
+            thread.model = self._model
+        thread.stats = StatsAggregator(1, len(thread.class_names))
+        return thread
+
+    def make_result(self, frame, boxes, track_offset=0):
+        """Sentetik kutulardan izlenmiş (track ID'li) ultralytics Results üret"""
+        rows = []
+        for i, ((x1, y1, x2, y2), damaged) in enumerate(boxes):
+            # DetectionThread.class_names: 0 = Hasarlı, 1 = Hasarsız
+            rows.append([x1, y1, x2, y2, track_offset + i + 1, 0.87, 0 if damaged else 1])
+        data = torch.tensor(rows, dtype=torch.float32) if rows else torch.zeros((0, 7))
+        return Results(frame, path="synthetic", names={0: "Hasarlı", 1: "Hasarsız"}, boxes=data)
+
+    def frame(self, i):
+        return self.frames[i % len(self.frames)][0]
+
+
+@benchmark("process_frame")
+def bench_process_frame(ctx):
+    """YOLO track + çizim + istatistik (tek kaynak)"""
+    thread = ctx.make_thread()
+    samples = time_calls(lambda i: thread.process_frame(ctx.frame(i), 0), ctx.repeats,
+                         setup=lambda i: (i,))
+    return {'samples': samples, 'items': len(samples)}
+
+
+@benchmark("draw_detections")
+def bench_draw_detections(ctx):
+    """Kayıt görüntüsü için kutu ve label çizimi (sabit track ID'ler)"""
+    thread = ctx.make_thread(load_model=False)
+    detections = [thread.extract_detections([ctx.make_result(frame, boxes)], 0).copy()
+                  for frame, boxes in ctx.frames]
+
+    def setup(i):
+        return ctx.frame(i).copy(), detections[i % len(detections)]
+
+    samples = time_calls(thread.draw_detections, ctx.repeats, setup=setup)
+    return {'samples': samples, 'items': len(samples), 'extra': _sprite_stats(thread)}
+
+
+def _sprite_stats(thread):
+    cache = thread.overlay.cache
+    total = cache.hits + cache.misses
+    return {'sprite_hit_ratio': cache.hits / total if total else 0.0, 'sprites': len(cache.items)}
+
+
+def _label_items(ctx):
+    """Frame başına (x1, y1, x2, y2, renk, label parçaları) listeleri"""
+    return [[(int(x1), int(y1), int(x2), int(y2), (0, 0, 255) if damaged else (0, 255, 0),
+              ['Hasarlı' if damaged else 'Hasarsız', " 0.87", f" ID:{j + 1}"])
+             for j, ((x1, y1, x2, y2), damaged) in enumerate(boxes)] for _, boxes in ctx.frames]
+
+
+@benchmark("draw_labels_sprite")
+def bench_draw_labels_sprite(ctx):
+    """Kutu + label çizimi, önbellekli sprite'larla (yalnızca çizim)"""
+    thread = ctx.make_thread(load_model=False)
+    labels = _label_items(ctx)
+
+    def draw(frame, items):
+        for x1, y1, x2, y2, color, parts in items:
+            thread.overlay.draw_box(frame, (x1, y1, x2, y2), color, parts)
+
+    samples = time_calls(draw, ctx.repeats,
+                         setup=lambda i: (ctx.frame(i).copy(), labels[i % len(labels)]))
+    return {'samples': samples, 'items': len(samples), 'extra': _sprite_stats(thread)}
+
+
+@benchmark("draw_labels_puttext")
+def bench_draw_labels_puttext(ctx):
+    """Karşılaştırma için önbelleksiz çizim (her label getTextSize + putText)"""
+    font = cv2.FONT_HERSHEY_SIMPLEX
+    labels = _label_items(ctx)
+
+    def draw(frame, items):
+        for x1, y1, x2, y2, color, parts in items:
+            label = "".join(parts)
+            cv2.rectangle(frame, (x1, y1), (x2, y2), color, 2)
+            label_size = cv2.getTextSize(label, font, 0.5, 2)[0]
+            label_y = y1 - 10 if y1 - 10 > 10 else y1 + 30
+            cv2.rectangle(frame, (x1, label_y - label_size[1] - 5),
+                          (x1 + label_size[0], label_y + 5), color, -1)
+            cv2.putText(frame, label, (x1, label_y), font, 0.5, (255, 255, 255), 2)
+
+    samples = time_calls(draw, ctx.repeats,
+                         setup=lambda i: (ctx.frame(i).copy(), labels[i % len(labels)]))
+    return {'samples': samples, 'items': len(samples)}
+
+
+@benchmark("save_damaged_crop")
+def bench_save_damaged_crop(ctx):
+    """Hasarlı bölgeyi kırpıp JPEG olarak kaydetme (her çağrı yeni track ID)"""
+    thread = ctx.make_thread(load_model=False)
+    box = np.array([ctx.width * 0.4, ctx.height * 0.4, ctx.width * 0.5, ctx.height * 0.5])
+
+    samples = time_calls(lambda frame, track_id: thread.save_damaged_crop(frame, box, track_id, 0),
+                         ctx.repeats, setup=lambda i: (ctx.frame(i), 100000 + i))
+    return {'samples': samples, 'items': len(samples)}
+
+
+@benchmark("add_timestamp")
+def bench_add_timestamp(ctx):
+    """Tarih damgası çizimi"""
+    thread = ctx.make_thread(load_model=False)
+    samples = time_calls(lambda frame: thread.add_timestamp(frame), ctx.repeats,
+                         setup=lambda i: (ctx.frame(i).copy(),))
+    return {'samples': samples, 'items': len(samples), 'extra': _sprite_stats(thread)}
+
+
+@benchmark("update_statistics")
+def bench_update_statistics(ctx):
+    """Sınıf sayımı ve istatistik toplama"""
+    thread = ctx.make_thread(load_model=False)
+    detections = [thread.extract_detections([ctx.make_result(frame, boxes)], 0).copy()
+                  for frame, boxes in ctx.frames]
+    samples = time_calls(lambda records: thread.update_statistics(records, 0), ctx.repeats,
+                         setup=lambda i: (detections[i % len(detections)],))
+    return {'samples': samples, 'items': len(samples)}
+
+
+@benchmark("extract_detections")
+def bench_extract_detections(ctx):
+    """Results -> yapılandırılmış tespit kayıtları (frame başına tek dönüşüm)"""
+    thread = ctx.make_thread(load_model=False)
+    results = [ctx.make_result(frame, boxes) for frame, boxes in ctx.frames]
+    samples = time_calls(lambda result: thread.extract_detections([result], 0), ctx.repeats,
+                         setup=lambda i: (results[i % len(results)],))
+    return {'samples': samples, 'items': len(samples)}
+
+
+@benchmark("display_preview")
+def bench_display_preview(ctx):
+    """GUI'ye giden önizleme: 3x3 ızgara hücresi boyutuna INTER_AREA küçültme (havuz tamponuna)"""
+    thread = ctx.make_thread(load_model=False)
+    thread.set_preview_size(0, 320, 240)
+
+    def run(frame):
+        release(thread.make_preview(0, frame))
+
+    samples = time_calls(run, ctx.repeats, setup=lambda i: (ctx.frame(i),))
+    frame = ctx.frame(0)
+    preview = thread.make_preview(0, frame)
+    extra = {'full_bytes': frame.nbytes, 'preview_bytes': preview.nbytes}
+    release(preview)
+    return {'samples': samples, 'items': len(samples), 'extra': extra}
+
+
+@benchmark("video_writer")
+def bench_video_writer(ctx):
+    """Kamera kaydındaki VideoWriter.write maliyeti"""
+    path = os.path.join(ctx.workdir, "bench_writer.mp4")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), ctx.fps, (ctx.width, ctx.height))
+    try:
+        samples = time_calls(lambda frame: writer.write(frame), ctx.repeats,
+                             setup=lambda i: (ctx.frame(i),))
+    finally:
+        writer.release()
+    return {'samples': samples, 'items': len(samples)}
+
+
+def _read_all(cap, transform=None):
+    """Kaynağı sonuna kadar oku; frame başına süreler ve toplam CPU süresi (ffmpeg süreci dahil)"""
+    samples = []
+    cpu_started = time.process_time()
+    while True:
+        started = time.perf_counter()
+        ret, frame = cap.read()
+        if not ret:
+            break
+        if transform is not None:
+            frame = transform(frame)
+        samples.append(time.perf_counter() - started)
+    cpu_seconds = time.process_time() - cpu_started
+    if hasattr(cap, "child_cpu_seconds"):
+        cpu_seconds += cap.child_cpu_seconds()
+    cap.release()
+    return samples, cpu_seconds
+
+
+def _decode_result(samples, cpu_seconds):
+    """Okuma benchmark'ı sonucu (frame başına CPU dahil)"""
+    cpu_per_frame = cpu_seconds / len(samples) * 1000 if samples else 0.0
+    return {'samples': samples, 'items': len(samples), 'extra': {'cpu_ms_per_frame': cpu_per_frame}}
+
+
+@benchmark("video_decode")
+def bench_video_decode(ctx):
+    """cv2.VideoCapture ile mp4v videonun frame frame okunması"""
+    return _decode_result(*_read_all(cv2.VideoCapture(ctx.video_path)))
+
+
+class _DecimatedCapture:
+    """OpenCV kaynağında her `step` frame'den birini döndürür (atlananlar yine decode edilir)"""
+
+    def __init__(self, cap, step):
+        self.cap = cap
+        self.step = step
+
+    def read(self):
+        for _ in range(self.step - 1):
+            if not self.cap.grab():
+                return False, None
+        return self.cap.read()
+
+    def release(self):
+        self.cap.release()
+
+
+@benchmark("video_decode_scaled")
+def bench_video_decode_scaled(ctx):
+    """OpenCV: her ikinci frame + cv2.resize ile yarı çözünürlük (ffmpeg_decode_scaled karşılığı)"""
+    size = (ctx.width // 2, ctx.height // 2)
+    cap = _DecimatedCapture(cv2.VideoCapture(ctx.video_path), 2)
+    return _decode_result(*_read_all(cap, lambda frame: cv2.resize(frame, size,
+                                                                   interpolation=cv2.INTER_AREA)))
+
+
+@benchmark("ffmpeg_decode")
+def bench_ffmpeg_decode(ctx):
+    """imageio-ffmpeg pipe ile aynı çözünürlükte okuma (önceden ayrılmış tamponlar)"""
+    from src.core.ffmpeg_source import FFmpegCapture
+
+    return _decode_result(*_read_all(FFmpegCapture(ctx.video_path, ctx.width, ctx.height)))
+
+
+@benchmark("ffmpeg_decode_scaled")
+def bench_ffmpeg_decode_scaled(ctx):
+    """ffmpeg içinde yarı FPS (fps filtresi) ve yarı çözünürlüğe ölçekleme"""
+    from src.core.ffmpeg_source import FFmpegCapture
+
+    cap = FFmpegCapture(ctx.video_path, ctx.width // 2, ctx.height // 2, fps=ctx.fps / 2)
+    return _decode_result(*_read_all(cap))
+
+
+@benchmark("replay_read")
+def bench_replay_read(ctx):
+    """Aynı frame'lerin ham rawcap kaydından (memmap, decode yok) okunması"""
+    path = os.path.join(ctx.workdir, "synthetic.rawcap")
+    if not os.path.exists(path):
+        writer = RawCaptureWriter(path, ctx.width, ctx.height, chunk_frames=max(1, ctx.num_frames // 2))
+        for i, (frame, _) in enumerate(ctx.frames):
+            writer.write(frame, i / ctx.fps, block=True)
+        writer.close()
+
+    return _decode_result(*_read_all(ReplayCapture(path, realtime=False)))
+
+
+@benchmark("end_to_end")
+def bench_end_to_end(ctx):
+    """run(): model yükleme, kaynak açma ve videonun tamamının işlenmesi"""
+    from src.core.detection_thread import DetectionThread
+
+    thread = DetectionThread(ctx.make_config())
+    emit_times = []
+    errors = []
+
+    def on_frame(frame_data):
+        release(frame_data[1])
+        emit_times.append(time.perf_counter())
+        if len(emit_times) >= ctx.num_frames:
+            thread.stop()
+
+    thread.frame_ready.connect(on_frame)
+    thread.error_occurred.connect(errors.append)
+
+    started = time.perf_counter()
+    thread.run()  # Aynı thread'de senkron çalıştır
+    wall = time.perf_counter() - started
+
+    if errors:
+        raise RuntimeError(errors[0])
+    if len(emit_times) < 2:
+        raise RuntimeError("Uçtan uca döngü frame üretmedi")
+
+    samples = list(np.diff(emit_times))
+    return {
+        'samples': samples,
+        'items': len(samples),
+        'extra': {
+            'wall_seconds': wall,
+            'frames': len(emit_times),
+            'effective_fps': len(emit_times) / wall,
+            'startup_seconds': emit_times[0] - started,
+        },
+    }
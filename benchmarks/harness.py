@@ -0,0 +1,156 @@
+"""
+benchmarks/harness.py
+Benchmark kayıt, zamanlama, JSON çıktı ve baseline karşılaştırma yardımcıları
+"""
+
+import json
+import os
+import platform
+import statistics
+import time
+from datetime import datetime
+
+# {isim: fonksiyon(ctx) -> {'samples': [...saniye], 'items': int, ...}}
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """Benchmark fonksiyonunu kaydet"""
+    def decorator(func):
+        BENCHMARKS[name] = func
+        return func
+    return decorator
+
+
+def time_calls(func, repeats, warmup=3, setup=None):
+    """func'ı repeats kez çalıştır, her çağrının süresini (saniye) döndür"""
+    for i in range(warmup):
+        args = setup(i) if setup else ()
+        func(*args)
+
+    samples = []
+    for i in range(repeats):
+        args = setup(warmup + i) if setup else ()
+        started = time.perf_counter()
+        func(*args)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def summarize(samples, items=None):
+    """Örneklerden özet istatistik üret (milisaniye)"""
+    ordered = sorted(samples)
+    count = len(ordered)
+    p95_index = min(count - 1, int(round(0.95 * (count - 1))))
+
+    summary = {
+        'count': count,
+        'mean_ms': statistics.fmean(ordered) * 1000,
+        'median_ms': statistics.median(ordered) * 1000,
+        'p95_ms': ordered[p95_index] * 1000,
+        'min_ms': ordered[0] * 1000,
+        'max_ms': ordered[-1] * 1000,
+        'stdev_ms': (statistics.stdev(ordered) * 1000) if count > 1 else 0.0,
+    }
+    if items:
+        total = sum(ordered)
+        summary['items'] = items
+        summary['items_per_sec'] = items / total if total > 0 else 0.0
+    return summary
+
+
+def environment_info(ctx=None):
+    """Sonuçların hangi ortamda alındığını kaydet"""
+    info = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+    }
+    for module in ("numpy", "cv2", "torch", "ultralytics"):
+        try:
+            info[module] = __import__(module).__version__
+        except Exception:
+            info[module] = None
+    if ctx is not None:
+        info['resolution'] = [ctx.width, ctx.height]
+        info['fps'] = ctx.fps
+    return info
+
+
+def run_benchmarks(ctx, names=None, log=print):
+    """Seçilen benchmark'ları çalıştır ve sonuç dict'i döndür"""
+    results = {}
+    for name, func in BENCHMARKS.items():
+        if names and name not in names:
+            continue
+
+        log(f"▶ {name} ...")
+        try:
+            outcome = func(ctx)
+            summary = summarize(outcome['samples'], outcome.get('items'))
+            summary.update(outcome.get('extra', {}))
+            results[name] = summary
+            log(f"  median {summary['median_ms']:.3f} ms, p95 {summary['p95_ms']:.3f} ms")
+        except Exception as e:
+            results[name] = {'error': str(e)}
+            log(f"  HATA: {e}")
+
+    return {'environment': environment_info(ctx), 'results': results}
+
+
+def save_results(data, path):
+    """Sonuçları JSON olarak kaydet"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def load_results(path):
+    """JSON sonuç dosyasını yükle"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare_results(current, baseline, tolerance=0.15, metric='median_ms'):
+    """
+    Baseline'a göre karşılaştır.
+
+    Returns:
+        list: [(isim, baseline, güncel, oran, durum)] — durum: 'ok',
+        'regression', 'improved', 'missing'
+    """
+    rows = []
+    base_results = baseline.get('results', {})
+    for name, current_summary in current.get('results', {}).items():
+        base_summary = base_results.get(name)
+        if not base_summary or metric not in base_summary or metric not in current_summary:
+            rows.append((name, None, current_summary.get(metric), None, 'missing'))
+            continue
+
+        base_value = base_summary[metric]
+        value = current_summary[metric]
+        ratio = value / base_value if base_value > 0 else float('inf')
+
+        if ratio > 1 + tolerance:
+            status = 'regression'
+        elif ratio < 1 - tolerance:
+            status = 'improved'
+        else:
+            status = 'ok'
+        rows.append((name, base_value, value, ratio, status))
+    return rows
+
+
+def format_comparison(rows, metric='median_ms'):
+    """Karşılaştırma tablosunu metin olarak üret"""
+    lines = [f"{'Benchmark':<28} {'Baseline':>12} {'Güncel':>12} {'Oran':>8}  Durum",
+             "-" * 72]
+    for name, base_value, value, ratio, status in rows:
+        base_text = f"{base_value:.3f}" if base_value is not None else "-"
+        value_text = f"{value:.3f}" if value is not None else "-"
+        ratio_text = f"{ratio:.2f}x" if ratio is not None else "-"
+        lines.append(f"{name:<28} {base_text:>12} {value_text:>12} {ratio_text:>8}  {status}")
+    lines.append(f"(metrik: {metric})")
+    return "\n".join(lines)
@@ -0,0 +1,127 @@
+"""
+benchmarks/importtime.py
+`python -X importtime` ile uygulama açılışındaki import süresini ölçer ve bütçe kontrolü yapar
+
+Kullanım:
+    python -m benchmarks.importtime --budget-ms 800
+    python -m benchmarks.importtime --target src.ui.main_window --top 20
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+from .harness import benchmark
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Pencere görünmeden önce import edilmemesi gereken modüller (arka planda yüklenir)
+DEFERRED_MODULES = ("torch", "ultralytics")
+
+# "import time:  self [us] | cumulative | <girinti>modül"
+LINE_PATTERN = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( +)(\S+)\s*$")
+
+
+def measure_imports(target="main", python=None):
+    """
+    target modülünü yeni bir süreçte import et.
+
+    Returns:
+        list: [(modül, self_us, cumulative_us, derinlik)] — import sırasıyla
+    """
+    command = [python or sys.executable, "-X", "importtime", "-c", f"import {target}"]
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"))
+    proc = subprocess.run(command, cwd=PROJECT_ROOT, capture_output=True, text=True, env=env)
+    if proc.returncode != 0:
+        lines = proc.stderr.strip().splitlines()
+        raise RuntimeError(lines[-1] if lines else f"import {target} başarısız")
+
+    records = []
+    for line in proc.stderr.splitlines():
+        match = LINE_PATTERN.match(line)
+        if match:
+            depth = (len(match.group(3)) - 1) // 2
+            records.append((match.group(4), int(match.group(1)), int(match.group(2)), depth))
+    return records
+
+
+def summarize_imports(records, top=15):
+    """Toplam süre, en pahalı modüller ve erken yüklenen ağır modüller"""
+    total_us = sum(cumulative for _, _, cumulative, depth in records if depth == 0)
+    by_cumulative = sorted(records, key=lambda r: r[2], reverse=True)
+    by_self = sorted(records, key=lambda r: r[1], reverse=True)
+    names = {name for name, *_ in records}
+    deferred_loaded = sorted(m for m in DEFERRED_MODULES
+                             if any(n == m or n.startswith(m + ".") for n in names))
+
+    return {
+        'total_ms': total_us / 1000,
+        'module_count': len(records),
+        'top_cumulative': [(name, cumulative / 1000) for name, _, cumulative, _ in by_cumulative[:top]],
+        'top_self': [(name, self_us / 1000) for name, self_us, _, _ in by_self[:top]],
+        'deferred_loaded': deferred_loaded,
+    }
+
+
+@benchmark("startup_import")
+def bench_startup_import(ctx):
+    """`import main` süresi (-X importtime, ayrı süreç)"""
+    measure_imports()  # .pyc önbelleğini ısıt
+    samples = []
+    deferred = []
+    for _ in range(min(ctx.repeats, 5)):
+        summary = summarize_imports(measure_imports())
+        samples.append(summary['total_ms'] / 1000)
+        deferred = summary['deferred_loaded']
+    return {'samples': samples, 'extra': {'deferred_loaded': deferred}}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Açılış import süresi ölçümü ve bütçe kontrolü")
+    parser.add_argument("--target", default="main", help="Import edilecek modül")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="Listelenecek modül sayısı")
+    parser.add_argument("--budget-ms", type=float, default=800.0,
+                        help="İzin verilen medyan toplam import süresi")
+    parser.add_argument("--allow-heavy", action="store_true",
+                        help="torch/ultralytics'in açılışta yüklenmesine izin ver")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    measure_imports(args.target)  # .pyc önbelleğini ısıt
+    summaries = [summarize_imports(measure_imports(args.target), args.top)
+                 for _ in range(max(1, args.repeats))]
+    totals = [s['total_ms'] for s in summaries]
+    median = statistics.median(totals)
+    last = summaries[-1]
+
+    print(f"import {args.target}: medyan {median:.1f} ms "
+          f"(min {min(totals):.1f}, max {max(totals):.1f}, {last['module_count']} modül)")
+    print(f"\n{'En pahalı modüller (kümülatif)':<48} {'ms':>10}")
+    for name, ms in last['top_cumulative']:
+        print(f"{name:<48} {ms:>10.1f}")
+    print(f"\n{'En pahalı modüller (kendi)':<48} {'ms':>10}")
+    for name, ms in last['top_self']:
+        print(f"{name:<48} {ms:>10.1f}")
+
+    failed = False
+    if median > args.budget_ms:
+        print(f"\n❌ Açılış bütçesi aşıldı: {median:.1f} ms > {args.budget_ms:.1f} ms")
+        failed = True
+    if last['deferred_loaded'] and not args.allow_heavy:
+        print(f"\n❌ Açılışta yüklenmemesi gereken modüller yüklendi: "
+              f"{', '.join(last['deferred_loaded'])}")
+        failed = True
+    if not failed:
+        print(f"\n✅ Açılış bütçesi içinde ({args.budget_ms:.1f} ms)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
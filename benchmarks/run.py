@@ -0,0 +1,88 @@
+"""
+benchmarks/run.py
+Benchmark paketini çalıştıran komut satırı aracı
+
+Kullanım:
+    python -m benchmarks.run --output benchmarks/results/latest.json
+    python -m benchmarks.run --baseline benchmarks/results/baseline.json --tolerance 0.15
+"""
+
+import argparse
+import os
+import sys
+
+# Sonuçların makineler arasında karşılaştırılabilir olması için sadece CPU
+os.environ.setdefault("CUDA_VISIBLE_DEVICES", "")
+
+# Proje kökünü import yoluna ekle (src paketi için)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from benchmarks import bench_pipeline, importtime  # noqa: F401  (benchmark'ları kaydeder)
+from benchmarks.bench_pipeline import BenchContext
+from benchmarks.harness import (BENCHMARKS, compare_results, format_comparison, load_results,
+                                run_benchmarks, save_results)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Cıvata tespit pipeline benchmark'ları")
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--seconds", type=float, default=3.0, help="Sentetik video süresi")
+    parser.add_argument("--repeats", type=int, default=30, help="Aşama başına ölçüm sayısı")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", default="", help="Virgülle ayrılmış benchmark isimleri")
+    parser.add_argument("--list", action="store_true", help="Benchmark'ları listele")
+    parser.add_argument("--output", default=os.path.join("benchmarks", "results", "latest.json"))
+    parser.add_argument("--baseline", help="Karşılaştırılacak baseline JSON")
+    parser.add_argument("--save-baseline", help="Sonuçları baseline olarak da kaydet")
+    parser.add_argument("--tolerance", type=float, default=0.15,
+                        help="İzin verilen yavaşlama oranı (0.15 = %%15)")
+    parser.add_argument("--metric", default="median_ms")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # ultralytics'in frame başına konsol çıktısı ölçümleri bozmasın
+    import logging
+    from ultralytics.utils import LOGGER
+    LOGGER.setLevel(logging.WARNING)
+
+    if args.list:
+        for name, func in BENCHMARKS.items():
+            print(f"{name:<24} {(func.__doc__ or '').strip()}")
+        return 0
+
+    names = [n.strip() for n in args.only.split(",") if n.strip()] or None
+    output = os.path.abspath(args.output)
+    baseline_path = os.path.abspath(args.baseline) if args.baseline else None
+    save_baseline = os.path.abspath(args.save_baseline) if args.save_baseline else None
+
+    with BenchContext(args.width, args.height, args.fps, args.seconds, args.repeats, args.seed) as ctx:
+        data = run_benchmarks(ctx, names)
+
+    save_results(data, output)
+    print(f"Sonuçlar kaydedildi: {output}")
+    if save_baseline:
+        save_results(data, save_baseline)
+        print(f"Baseline kaydedildi: {save_baseline}")
+
+    if baseline_path:
+        rows = compare_results(data, load_results(baseline_path), args.tolerance, args.metric)
+        print(format_comparison(rows, args.metric))
+        if any(status == 'regression' for *_, status in rows):
+            print("❌ Performans gerilemesi tespit edildi")
+            return 1
+        print("✅ Baseline'a göre gerileme yok")
+
+    if any('error' in summary for summary in data['results'].values()):
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""
+benchmarks/synthetic_video.py
+Konveyör dokusu üzerinde hareket eden cıvata benzeri dikdörtgenlerden sentetik video üretir
+"""
+
+import cv2
+import numpy as np
+
+
+def conveyor_texture(width, height, seed=0):
+    """Konveyör bandı benzeri gri, çizgili ve gürültülü arka plan üret"""
+    rng = np.random.default_rng(seed)
+    base = np.full((height, width), 70, dtype=np.int16)
+
+    # Bant üzerindeki enine çizgiler
+    for x in range(0, width, 24):
+        base[:, x:x + 3] += 25
+
+    # Üst/alt kenarlar
+    margin = max(4, height // 10)
+    base[:margin] = 40
+    base[-margin:] = 40
+
+    noise = rng.integers(-12, 13, size=(height, width), dtype=np.int16)
+    texture = np.clip(base + noise, 0, 255).astype(np.uint8)
+    return cv2.cvtColor(texture, cv2.COLOR_GRAY2BGR)
+
+
+def bolt_layout(width, height, num_bolts=6, seed=0):
+    """Cıvataların başlangıç konumları, boyutları ve hasar durumları"""
+    rng = np.random.default_rng(seed + 1)
+    bolt_w = max(8, width // 12)
+    bolt_h = max(6, height // 10)
+    spacing = width / num_bolts
+
+    bolts = []
+    for i in range(num_bolts):
+        bolts.append({
+            'x': i * spacing,
+            'y': int(rng.integers(height // 5, max(height // 5 + 1, height - height // 5 - bolt_h))),
+            'w': bolt_w,
+            'h': bolt_h,
+            'damaged': bool(i % 3 == 1),
+        })
+    return bolts
+
+
+def render_frame(texture, bolts, frame_idx, speed):
+    """Belirli bir frame'i çiz; cıvataları ve kutularını (xyxy, hasarlı mı) döndür"""
+    height, width = texture.shape[:2]
+    # Bant dokusu cıvatalarla aynı hızda kayar
+    frame = np.roll(texture, int(frame_idx * speed) % width, axis=1)
+
+    boxes = []
+    for bolt in bolts:
+        x1 = int((bolt['x'] + frame_idx * speed) % (width + bolt['w'])) - bolt['w']
+        y1 = bolt['y']
+        x2, y2 = x1 + bolt['w'], y1 + bolt['h']
+
+        color = (150, 160, 170)
+        cv2.rectangle(frame, (x1, y1), (x2, y2), color, -1)
+        # Cıvata başı
+        cv2.rectangle(frame, (x1, y1), (x1 + bolt['w'] // 4, y2), (120, 130, 140), -1)
+        if bolt['damaged']:
+            # Hasar: koyu çatlak çizgisi
+            cv2.line(frame, (x1 + bolt['w'] // 3, y1), (x2 - 2, y2), (30, 30, 30), 2)
+
+        cx1, cy1 = max(0, x1), max(0, y1)
+        cx2, cy2 = min(width, x2), min(height, y2)
+        if cx2 > cx1 and cy2 > cy1:
+            boxes.append(((cx1, cy1, cx2, cy2), bolt['damaged']))
+
+    return frame, boxes
+
+
+def iter_frames(width=640, height=480, num_frames=90, speed=6, num_bolts=6, seed=0):
+    """(frame, boxes) ikililerini üret"""
+    texture = conveyor_texture(width, height, seed)
+    bolts = bolt_layout(width, height, num_bolts, seed)
+    for frame_idx in range(num_frames):
+        yield render_frame(texture, bolts, frame_idx, speed)
+
+
+def generate_video(path, width=640, height=480, fps=30, seconds=3.0, speed=6, num_bolts=6,
+                   seed=0, codec="mp4v"):
+    """Sentetik videoyu dosyaya yaz ve frame sayısını döndür"""
+    num_frames = max(1, int(round(fps * seconds)))
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*codec), fps, (width, height))
+    if not writer.isOpened():
+        raise RuntimeError(f"Video writer açılamadı: {path}")
+
+    try:
+        for frame, _ in iter_frames(width, height, num_frames, speed, num_bolts, seed):
+            writer.write(frame)
+    finally:
+        writer.release()
+
+    return num_frames
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Sentetik cıvata videosu üret")
+    parser.add_argument("output")
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+
+    count = generate_video(args.output, args.width, args.height, args.fps, args.seconds)
+    print(f"{count} frame yazıldı: {args.output}")
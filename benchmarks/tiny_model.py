@@ -0,0 +1,41 @@
+"""
+benchmarks/tiny_model.py
+İndirme gerektirmeyen, rastgele ağırlıklı küçük YOLO modeli oluşturur
+"""
+
+import torch
+from ultralytics.nn.tasks import DetectionModel, yaml_model_load
+
+# YOLOv8 mimarisi, çok dar kanal genişliğiyle (~0.35M parametre)
+TINY_SCALE = [0.33, 0.125, 256]  # [depth, width, max_channels]
+CLASS_NAMES = {0: "Hasarlı", 1: "Hasarsız"}
+
+
+def build_tiny_model(seed=0, names=None):
+    """Rastgele başlatılmış küçük bir DetectionModel döndür"""
+    names = names or CLASS_NAMES
+
+    cfg = yaml_model_load("yolov8n.yaml")  # ultralytics paketiyle gelir, indirme yok
+    cfg["scales"] = {"t": TINY_SCALE}
+    cfg["scale"] = "t"
+    cfg["nc"] = len(names)
+
+    torch.manual_seed(seed)
+    model = DetectionModel(cfg=cfg, nc=len(names), verbose=False)
+    model.names = dict(names)
+    model.eval()
+    return model
+
+
+def save_tiny_model(path, seed=0, names=None):
+    """Modeli load_yolo_model_safe ile yüklenebilecek checkpoint olarak kaydet"""
+    model = build_tiny_model(seed, names)
+    torch.save({"model": model, "train_args": {}, "epoch": -1}, str(path))
+    return str(path)
+
+
+if __name__ == "__main__":
+    import sys
+
+    output = sys.argv[1] if len(sys.argv) > 1 else "tiny_yolo.pt"
+    print(f"Küçük model kaydedildi: {save_tiny_model(output)}")
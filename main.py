@@ -5,6 +5,7 @@ Ana uygulama dosyası
 
 import sys
 import os
+import argparse
 from pathlib import Path
 from datetime import datetime
 from PyQt6.QtWidgets import QApplication, QMainWindow, QVBoxLayout, QWidget
@@ -15,11 +16,12 @@ from PyQt6.QtGui import QIcon, QFont
 from src.ui.main_window import MainWindow
 from src.core.config import Config
 from src.utils.logger import setup_logger
+from src.utils.metrics import start_metrics_server
 
 class CivataDetectionApp(QApplication):
     """Ana uygulama sınıfı"""
     
-    def __init__(self, argv):
+    def __init__(self, argv, config_file="config.json", soak_hours=None):
         super().__init__(argv)
         
         # Uygulama ayarları
@@ -30,16 +32,24 @@ class CivataDetectionApp(QApplication):
         # Gerekli klasörleri kontrol et ve oluştur
         self.ensure_directories()
         
+        # Konfigürasyonu yükle (log ayarları buradan okunur)
+        self.config = Config(config_file)
+        apply_capture_options(self.config)
+        
         # Logger'ı başlat
-        self.logger = setup_logger()
+        self.logger = setup_logger(config=self.config)
         
-        # Konfigürasyonu yükle
-        self.config = Config()
+        # Metrik endpoint'ini başlat
+        self.metrics_server = start_metrics_server(self.config, self.logger)
         
         # Ana pencereyi oluştur
         self.main_window = None
         self.init_ui()
         
+        # Soak modu (uzun süreli bellek testi)
+        if soak_hours:
+            self.main_window.start_soak(soak_hours)
+        
     def ensure_directories(self):
         """Gerekli klasörleri kontrol et ve oluştur"""
         directories = [
@@ -70,8 +80,29 @@ class CivataDetectionApp(QApplication):
             self.logger.error(f"UI başlatma hatası: {e}")
             sys.exit(1)
 
+def apply_capture_options(config):
+    """FFmpeg yakalama seçenekleri (süreç geneli ortam değişkeni; ilk VideoCapture'dan önce bir kez)"""
+    # RTSP varsayılanı UDP'dir; kayıplı ağlarda TCP daha kararlı. Alt süreçler ortamı devralır
+    if config.stream_rtsp_transport and "OPENCV_FFMPEG_CAPTURE_OPTIONS" not in os.environ:
+        os.environ["OPENCV_FFMPEG_CAPTURE_OPTIONS"] = f"rtsp_transport;{config.stream_rtsp_transport}"
+
+def parse_args(argv):
+    """Komut satırı argümanlarını ayrıştır"""
+    parser = argparse.ArgumentParser(description="YOLO Hasarlı Cıvata Tespit Sistemi")
+    parser.add_argument("--headless", action="store_true",
+                        help="GUI olmadan çalıştır (config.json'daki model ve kaynaklarla)")
+    parser.add_argument("--config", default="config.json", help="Konfigürasyon dosyası")
+    parser.add_argument("--soak", type=float, metavar="SAAT",
+                        help="Kaynakları döngüde oynatıp bellek büyümesini izle (rapor logs/ altına)")
+    parser.add_argument("--inference-server", action="store_true",
+                        help="Paylaşımlı çıkarım sunucusunu başlat (istemciler inference_backend=server ile bağlanır)")
+    args, _ = parser.parse_known_args(argv[1:])
+    return args
+
 def main():
     """Ana fonksiyon"""
+    args = parse_args(sys.argv)
+    
     # Gerekli dizinleri oluştur
     os.makedirs("src/models", exist_ok=True)
     os.makedirs("data/cropped", exist_ok=True)
@@ -81,7 +112,18 @@ def main():
     today_folder = datetime.now().strftime("%d%m%Y")
     os.makedirs(f"src/source/{today_folder}", exist_ok=True)
     
-    app = CivataDetectionApp(sys.argv)
+    if args.inference_server:
+        from src.core.inference_server import run_server
+        config = Config(args.config)
+        sys.exit(run_server(config, setup_logger(config=config)))
+    
+    if args.headless:
+        from src.core.headless_runner import run_headless
+        config = Config(args.config)
+        apply_capture_options(config)
+        sys.exit(run_headless(config, setup_logger(config=config), sys.argv, args.soak))
+    
+    app = CivataDetectionApp(sys.argv, args.config, args.soak)
     
     # Uygulama stilini ayarla
     app.setStyle('Fusion')
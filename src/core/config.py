@@ -4,10 +4,13 @@ Uygulama konfigürasyon sınıfı
 """
 
 import json
+import logging
 import os
 from pathlib import Path
 from typing import Dict, List, Union
 
+logger = logging.getLogger("CivataDetection.config")
+
 class Config:
     """Uygulama konfigürasyon sınıfı"""
     
@@ -20,6 +23,13 @@ class Config:
         self.iou_threshold = 0.45
         self.source_count = 1
         self.sources = {}  # {index: source_path_or_camera_id}
+        self.max_sources = 8  # Arayüzde seçilebilecek en fazla kaynak
+        
+        # Kaynak zamanlama (ağırlıklı adil paylaşım)
+        self.default_source_fps = 30.0  # Kaynak başına hedef işleme FPS'i
+        self.default_source_priority = 1.0  # Kapasite yetmediğinde pay ağırlığı
+        self.source_target_fps = {}  # {index: fps} kaynak bazında geçersiz kılma
+        self.source_priority = {}  # {index: ağırlık}
         
         # Klasör yolları
         self.output_dir = "data/outputs"
@@ -31,6 +41,85 @@ class Config:
         self.record_video = True
         self.video_fps = 30
         self.video_codec = "mp4v"
+        self.recording_mode = "continuous"  # "continuous": tüm oturum, "event": yalnızca hasar olayları
+        self.record_segment_seconds = 300.0  # Sürekli kaydın parça süresi (0: tek dosya)
+        self.record_ffmpeg_codec = "libx264"  # ffmpeg varsa parça encoder'ı (fragmented MP4)
+        self.record_ffmpeg_preset = "veryfast"
+        self.event_preroll_seconds = 5.0  # Olaydan önce bellekte tutulan süre
+        self.event_postroll_seconds = 5.0  # Son hasarlı frame'den sonra kayda devam süresi
+        self.event_jpeg_quality = 85  # Pre-roll tamponu JPEG kalitesi (0: sıkıştırmasız)
+        self.event_max_clip_seconds = 300.0  # Tek klibin en uzun süresi
+        self.overlay_sprite_cache_size = 512  # Önbellekteki etiket/tarih damgası sprite sayısı (LRU)
+        self.record_overlays = True  # Kayıtlara kutu ve etiket çizilir (False: yalnızca tarih damgası)
+        self.display_show_labels = True  # GUI'de sınıf adı ve güven skoru etiketi
+        self.display_show_ids = True  # GUI'de track ID
+        self.display_preview_downscale = True  # GUI'ye görüntü alanı boyutunda küçültülmüş frame gönder
+        self.frame_pool_enabled = True  # Okuma, kayıt ve GUI frame'leri kaynak başına tampon havuzundan
+        self.frame_pool_max_free = 8  # Havuzda boşta bekletilen en fazla tampon (kaynak başına)
+        self.loop_video_files = False  # Video dosyası bitince başa sar (soak testi için)
+        self.file_max_throughput = False  # Video dosyalarını gerçek zamanlı değil, olabildiğince hızlı işle
+        self.max_throughput_display_fps = 5.0  # Maksimum hız modunda GUI'ye gönderilen frame sınırı (0: hiç)
+        self.progress_log_interval = 5.0  # Maksimum hız modunda ilerleme logu aralığı (sn, 0: kapalı)
+        
+        # Video dosyası örnekleme (uzun kayıtları tarama): her N. frame işlenir
+        self.sample_stride = 1  # 1: her frame
+        self.sample_interval = 0.0  # >0 ise stride yerine saniye cinsinden aralık
+        self.sample_seek_stride = 60  # Adım bundan büyükse grab() yerine konum atlanır (anahtar frame'e seek)
+        self.sample_adaptive = True  # Hasar bulununca çevresini tam hızda işle
+        self.sample_dense_seconds = 2.0  # Hasardan sonra tam hızda işlenecek süre
+        
+        # Video kaynak arşivi (tespit orijinal dosyadan okur, arşiv arka planda alınır)
+        self.archive_sources = True
+        self.archive_dir = "src/source"
+        self.archive_method = "auto"  # "auto", "hardlink", "reflink" veya "copy"
+        self.archive_max_mb_per_sec = 50.0  # Kopyalama/okuma hız sınırı (0: sınırsız)
+        
+        # Video dosyası decode ayarları
+        self.decode_backend = "opencv"  # "opencv" veya "ffmpeg" (imageio-ffmpeg pipe)
+        self.ffmpeg_width = 640  # ffmpeg içinde ölçekleme; 0: orijinal/en-boy oranı korunur
+        self.ffmpeg_height = 0
+        self.ffmpeg_fps = 0.0  # 0: tüm frame'ler, >0: ffmpeg fps filtresiyle seyreltme
+        self.ffmpeg_threads = 0  # 0: ffmpeg otomatik seçer
+        self.ffmpeg_prefetch = 4  # Önceden decode edilen frame sayısı
+        
+        # Çalışma modu: "thread" (tek QThread) veya "process" (kaynak başına yakalama + çıkarım süreci)
+        self.execution_mode = "thread"
+        self.process_ring_slots = 3  # Kaynak başına paylaşımlı bellek frame slotu
+        self.process_max_frame_width = 1280  # Daha büyük frame'ler yakalama sürecinde küçültülür
+        self.process_max_frame_height = 720
+        self.process_torch_threads = 0  # 0: çekirdek sayısı / kaynak sayısı
+        self.process_max_restarts = 5  # Çöken süreçler en fazla bu kadar yeniden başlatılır
+        
+        # Yük atma: çıkarım yetişemezse frame'ler okuma ile çıkarım arasında politikaya göre atılır
+        # "none" (okuma çıkarımı bekler), "drop_oldest", "latest_only", "every_nth", "priority"
+        self.load_shedding_policy = "none"
+        self.source_shed_policy = {}  # {index: politika} kaynak bazında geçersiz kılma
+        self.shed_queue_size = 4  # Kaynak başına bekleyen frame sınırı (priority'de ortak havuz payı)
+        self.shed_every_n = 3  # every_nth: kuyruk doluyken her N. frame kabul edilir
+        
+        # Çıkarım arka ucu: "local" (modeli bu süreç yükler) veya "server" (paylaşımlı çıkarım sunucusu)
+        self.inference_backend = "local"
+        self.inference_server_address = "127.0.0.1:9200"  # "host:port" veya Unix socket yolu
+        self.inference_server_authkey = "civata"
+        self.inference_server_timeout = 5.0  # Yanıt için en fazla bekleme (sn)
+        self.inference_server_max_batch = 8
+        self.inference_server_max_delay_ms = 5.0  # İlk istekten sonra batch'i doldurmak için bekleme
+        self.inference_server_metrics_port = 9109
+        
+        # Ağ akışı (RTSP/HTTP) kaynakları
+        self.stream_max_latency = 0.2  # Akış takılırsa bundan eski bekleyen frame verilmez
+        self.stream_open_timeout = 10.0
+        self.stream_read_timeout = 5.0  # Bu süre frame gelmezse yeniden bağlanılır
+        self.stream_reconnect_initial = 0.5  # Yeniden bağlanma beklemesi (her denemede iki katı)
+        self.stream_reconnect_max = 30.0
+        self.stream_rtsp_transport = "tcp"  # "tcp" veya "udp" (başlangıçta uygulanır)
+        
+        # Ham frame kaydı (rawcap) ve tekrar oynatma
+        self.raw_capture_enabled = False  # Kamera frame'lerini işlenmeden kaydet
+        self.raw_capture_dir = "data/raw"
+        self.raw_capture_compression = "none"  # "none" (memmap) veya "zlib"
+        self.raw_capture_chunk_frames = 300
+        self.replay_realtime = True  # False: rawcap kaynakları olabildiğince hızlı oynatılır
         
         # Tespit ayarları
         self.max_det = 300  # Maksimum tespit sayısı
@@ -38,16 +127,62 @@ class Config:
         self.track_buffer = 30  # Tracking buffer
         self.match_thresh = 0.8  # Matching eşiği
         
+        # İstatistik ayarları
+        self.stats_emit_hz = 4.0  # UI'ye saniyede kaç özet gönderilecek
+        self.stats_window_seconds = 10.0  # Kayan pencere süresi
+        
         # UI ayarları
         self.window_width = 1400
         self.window_height = 900
         self.video_width = 640
         self.video_height = 480
         
+        # Log görünümü ayarları
+        self.log_view_max_lines = 1000  # QPlainTextEdit'te tutulacak en fazla satır
+        self.log_flush_interval_ms = 250  # Tamponun GUI'ye aktarılma aralığı
+        self.log_rate_per_source = 5.0  # Kaynak başına saniyede en fazla satır
+        self.log_burst = 20  # Hız sınırından önce izin verilen ani satır sayısı
+        
+        # Log dosyası ayarları
+        self.log_json = False  # True: satır başına bir JSON kaydı (.jsonl)
+        self.log_max_bytes = 10 * 1024 * 1024  # Bu boyutu aşan dosya döndürülür
+        self.log_backup_count = 14  # Saklanacak eski log dosyası sayısı
+        self.log_rotate_when = "midnight"  # Zaman bazlı döndürme (TimedRotatingFileHandler)
+        
         # Sınıf bilgileri
         self.class_names = ["Hasarsız", "Hasarlı"]
         self.class_colors = [(0, 255, 0), (0, 0, 255)]  # BGR format
         
+        # Disk kotası: kayıtlar (src/source), kırpılmış görüntüler, loglar, ham kayıtlar
+        self.storage_manager_enabled = True
+        self.storage_quotas_gb = {  # Kategori başına üst sınır (0: sınırsız)
+            'recordings': 0.0,
+            'crops': 0.0,
+            'logs': 1.0,
+            'raw': 0.0
+        }
+        self.storage_min_free_gb = 2.0  # Boş alan bunun altına inerse en eski dosyalar silinir
+        self.storage_crop_protect_hours = 24.0  # Bu süreden yeni kırpılmış görüntüler silinmez
+        self.storage_check_interval = 10.0  # saniye
+        self.storage_rescan_hours = 6.0  # Başka süreçlerin yazdıkları için tam tarama aralığı (0: yalnız başta)
+        
+        # Soak (uzun süreli) test ayarları
+        self.soak_sample_interval = 60  # saniye
+        self.soak_warmup_seconds = 300  # Eğim hesabına alınmayan ilk süre
+        self.soak_max_rss_slope_mb_per_hour = 50.0
+        self.soak_max_heap_slope_mb_per_hour = 20.0
+        self.soak_probe_slope_limits = {
+            'tracked_objects': 5000,
+            'queue_depth': 10,
+            'log_lines': 5000
+        }
+        self.soak_top_allocators = 15
+        
+        # Metrik endpoint ayarları (Prometheus)
+        self.metrics_enabled = True
+        self.metrics_host = "127.0.0.1"
+        self.metrics_port = 9108
+        
         # Konfigürasyonu yükle
         self.load_config()
         
@@ -63,14 +198,20 @@ class Config:
                     if hasattr(self, key):
                         setattr(self, key, value)
                         
-                print(f"Konfigürasyon yüklendi: {self.config_file}")
+                # JSON anahtarları string olarak gelir, kaynak indekslerini int'e çevir
+                self.sources = {int(k): v for k, v in self.sources.items()}
+                self.source_target_fps = {int(k): v for k, v in self.source_target_fps.items()}
+                self.source_priority = {int(k): v for k, v in self.source_priority.items()}
+                self.source_shed_policy = {int(k): v for k, v in self.source_shed_policy.items()}
+                        
+                logger.info(f"Konfigürasyon yüklendi: {self.config_file}")
             else:
-                print("Konfigürasyon dosyası bulunamadı, varsayılan değerler kullanılıyor")
+                logger.warning("Konfigürasyon dosyası bulunamadı, varsayılan değerler kullanılıyor")
                 self.save_config()  # Varsayılan konfigürasyonu kaydet
                 
         except Exception as e:
-            print(f"Konfigürasyon yükleme hatası: {e}")
-            print("Varsayılan değerler kullanılıyor")
+            logger.error(f"Konfigürasyon yükleme hatası: {e}")
+            logger.warning("Varsayılan değerler kullanılıyor")
             
     def save_config(self):
         """Konfigürasyonu dosyaya kaydet"""
@@ -82,6 +223,11 @@ class Config:
                 'iou_threshold': self.iou_threshold,
                 'source_count': self.source_count,
                 'sources': self.sources,
+                'max_sources': self.max_sources,
+                'default_source_fps': self.default_source_fps,
+                'default_source_priority': self.default_source_priority,
+                'source_target_fps': self.source_target_fps,
+                'source_priority': self.source_priority,
                 'output_dir': self.output_dir,
                 'cropped_dir': self.cropped_dir,
                 'models_dir': self.models_dir,
@@ -89,28 +235,130 @@ class Config:
                 'record_video': self.record_video,
                 'video_fps': self.video_fps,
                 'video_codec': self.video_codec,
+                'recording_mode': self.recording_mode,
+                'record_segment_seconds': self.record_segment_seconds,
+                'record_ffmpeg_codec': self.record_ffmpeg_codec,
+                'record_ffmpeg_preset': self.record_ffmpeg_preset,
+                'event_preroll_seconds': self.event_preroll_seconds,
+                'event_postroll_seconds': self.event_postroll_seconds,
+                'event_jpeg_quality': self.event_jpeg_quality,
+                'event_max_clip_seconds': self.event_max_clip_seconds,
+                'overlay_sprite_cache_size': self.overlay_sprite_cache_size,
+                'record_overlays': self.record_overlays,
+                'display_show_labels': self.display_show_labels,
+                'display_show_ids': self.display_show_ids,
+                'display_preview_downscale': self.display_preview_downscale,
+                'frame_pool_enabled': self.frame_pool_enabled,
+                'frame_pool_max_free': self.frame_pool_max_free,
+                'loop_video_files': self.loop_video_files,
+                'file_max_throughput': self.file_max_throughput,
+                'max_throughput_display_fps': self.max_throughput_display_fps,
+                'progress_log_interval': self.progress_log_interval,
+                'sample_stride': self.sample_stride,
+                'sample_interval': self.sample_interval,
+                'sample_seek_stride': self.sample_seek_stride,
+                'sample_adaptive': self.sample_adaptive,
+                'sample_dense_seconds': self.sample_dense_seconds,
+                'archive_sources': self.archive_sources,
+                'archive_dir': self.archive_dir,
+                'archive_method': self.archive_method,
+                'archive_max_mb_per_sec': self.archive_max_mb_per_sec,
+                'decode_backend': self.decode_backend,
+                'ffmpeg_width': self.ffmpeg_width,
+                'ffmpeg_height': self.ffmpeg_height,
+                'ffmpeg_fps': self.ffmpeg_fps,
+                'ffmpeg_threads': self.ffmpeg_threads,
+                'ffmpeg_prefetch': self.ffmpeg_prefetch,
+                'execution_mode': self.execution_mode,
+                'process_ring_slots': self.process_ring_slots,
+                'process_max_frame_width': self.process_max_frame_width,
+                'process_max_frame_height': self.process_max_frame_height,
+                'process_torch_threads': self.process_torch_threads,
+                'process_max_restarts': self.process_max_restarts,
+                'load_shedding_policy': self.load_shedding_policy,
+                'source_shed_policy': self.source_shed_policy,
+                'shed_queue_size': self.shed_queue_size,
+                'shed_every_n': self.shed_every_n,
+                'inference_backend': self.inference_backend,
+                'inference_server_address': self.inference_server_address,
+                'inference_server_authkey': self.inference_server_authkey,
+                'inference_server_timeout': self.inference_server_timeout,
+                'inference_server_max_batch': self.inference_server_max_batch,
+                'inference_server_max_delay_ms': self.inference_server_max_delay_ms,
+                'inference_server_metrics_port': self.inference_server_metrics_port,
+                'stream_max_latency': self.stream_max_latency,
+                'stream_open_timeout': self.stream_open_timeout,
+                'stream_read_timeout': self.stream_read_timeout,
+                'stream_reconnect_initial': self.stream_reconnect_initial,
+                'stream_reconnect_max': self.stream_reconnect_max,
+                'stream_rtsp_transport': self.stream_rtsp_transport,
+                'raw_capture_enabled': self.raw_capture_enabled,
+                'raw_capture_dir': self.raw_capture_dir,
+                'raw_capture_compression': self.raw_capture_compression,
+                'raw_capture_chunk_frames': self.raw_capture_chunk_frames,
+                'replay_realtime': self.replay_realtime,
                 'max_det': self.max_det,
                 'track_thresh': self.track_thresh,
                 'track_buffer': self.track_buffer,
                 'match_thresh': self.match_thresh,
+                'stats_emit_hz': self.stats_emit_hz,
+                'stats_window_seconds': self.stats_window_seconds,
                 'window_width': self.window_width,
                 'window_height': self.window_height,
                 'video_width': self.video_width,
                 'video_height': self.video_height,
+                'log_view_max_lines': self.log_view_max_lines,
+                'log_flush_interval_ms': self.log_flush_interval_ms,
+                'log_rate_per_source': self.log_rate_per_source,
+                'log_burst': self.log_burst,
+                'log_json': self.log_json,
+                'log_max_bytes': self.log_max_bytes,
+                'log_backup_count': self.log_backup_count,
+                'log_rotate_when': self.log_rotate_when,
                 'class_names': self.class_names,
-                'class_colors': self.class_colors
+                'class_colors': self.class_colors,
+                'storage_manager_enabled': self.storage_manager_enabled,
+                'storage_quotas_gb': self.storage_quotas_gb,
+                'storage_min_free_gb': self.storage_min_free_gb,
+                'storage_crop_protect_hours': self.storage_crop_protect_hours,
+                'storage_check_interval': self.storage_check_interval,
+                'storage_rescan_hours': self.storage_rescan_hours,
+                'soak_sample_interval': self.soak_sample_interval,
+                'soak_warmup_seconds': self.soak_warmup_seconds,
+                'soak_max_rss_slope_mb_per_hour': self.soak_max_rss_slope_mb_per_hour,
+                'soak_max_heap_slope_mb_per_hour': self.soak_max_heap_slope_mb_per_hour,
+                'soak_probe_slope_limits': self.soak_probe_slope_limits,
+                'soak_top_allocators': self.soak_top_allocators,
+                'metrics_enabled': self.metrics_enabled,
+                'metrics_host': self.metrics_host,
+                'metrics_port': self.metrics_port
             }
             
             with open(self.config_file, 'w', encoding='utf-8') as f:
                 json.dump(config_data, f, indent=4, ensure_ascii=False)
                 
-            print(f"Konfigürasyon kaydedildi: {self.config_file}")
+            logger.info(f"Konfigürasyon kaydedildi: {self.config_file}")
             
         except Exception as e:
-            print(f"Konfigürasyon kaydetme hatası: {e}")
+            logger.error(f"Konfigürasyon kaydetme hatası: {e}")
             
+    def get_source_fps(self, index):
+        """Kaynağın hedef işleme FPS'i"""
+        return float(self.source_target_fps.get(index, self.default_source_fps))
+        
+    def get_source_priority(self, index):
+        """Kaynağın zamanlama ağırlığı"""
+        return float(self.source_priority.get(index, self.default_source_priority))
+        
+    def get_source_shed_policy(self, index):
+        """Kaynağın yük atma politikası"""
+        return self.source_shed_policy.get(index, self.load_shedding_policy)
+        
     def validate_model_path(self):
         """Model dosyasının geçerliliğini kontrol et"""
+        if self.inference_backend == "server":
+            return True, "Model çıkarım sunucusunda"
+            
         if not self.model_path:
             return False, "Model dosyası seçilmedi"
             
@@ -125,6 +373,9 @@ class Config:
         
     def validate_sources(self):
         """Kaynakların geçerliliğini kontrol et"""
+        from .raw_capture import is_rawcap_source
+        from .stream_source import is_stream_source
+        
         if not self.sources:
             return False, "Hiç kaynak seçilmedi"
             
@@ -134,8 +385,18 @@ class Config:
                 
             source = self.sources[i]
             
+            # Rawcap kaydı kontrolü
+            if is_rawcap_source(source):
+                if not os.path.isfile(os.path.join(source, "meta.json")):
+                    return False, f"Rawcap kaydı bulunamadı: {source}"
+                    
+            # Ağ akışı; erişilebilirlik bağlanırken kontrol edilir
+            elif is_stream_source(source):
+                if not source.split("://", 1)[1].strip("/"):
+                    return False, f"Geçersiz akış adresi: {source}"
+                    
             # Video dosyası kontrolü
-            if isinstance(source, str):
+            elif isinstance(source, str):
                 if not os.path.exists(source):
                     return False, f"Video dosyası bulunamadı: {source}"
                     
@@ -162,9 +423,9 @@ class Config:
         for directory in directories:
             try:
                 Path(directory).mkdir(parents=True, exist_ok=True)
-                print(f"Klasör hazırlandı: {directory}")
+                logger.debug(f"Klasör hazırlandı: {directory}")
             except Exception as e:
-                print(f"Klasör oluşturma hatası ({directory}): {e}")
+                logger.error(f"Klasör oluşturma hatası ({directory}): {e}")
                 
     def get_output_filename(self, source_id, extension="mp4"):
         """Çıktı dosyası adı oluştur"""
@@ -4,24 +4,39 @@ YOLO model ile tespit işlemlerini yapan thread sınıfı
 """
 
 import cv2
-import numpy as np
+import logging
 from datetime import datetime
 from pathlib import Path
 import time
 import os
 
 from PyQt6.QtCore import QThread, pyqtSignal, QMutex, QWaitCondition
-from ultralytics import YOLO
 from collections import defaultdict
 from ..utils.model_loader import load_yolo_model_safe
+from ..utils.metrics import get_metrics, RateMeter
+from ..utils.storage_manager import disk_low, get_storage_manager, storage_usage, track_file
+from .stats_aggregator import StatsAggregator
+from .raw_capture import RawCaptureWriter, ReplayCapture, is_rawcap_source, new_capture_path
+from .source_archive import get_source_archiver
+from .ffmpeg_source import FFmpegCapture, ffmpeg_available
+from .stream_source import StreamCapture, is_stream_source, mask_url
+from .scheduler import WeightedSourceScheduler
+from .load_shedding import SheddingCapture, SharedBudget, SHED_POLICIES
+from .progress import FileProgress, format_duration
+from .sampling import SampledCapture, stride_for
+from .event_recorder import EventRecorder
+from .segmented_recorder import SegmentedRecorder
+from .overlay import OverlayRenderer, CLASS_NAMES, CLASS_COLORS
+from .detections import DetectionBuffer, empty_detections, class_counts
+from .frame_pool import FramePool, is_pooled, retain, release
+from .preview import PreviewSizes, make_preview
 
 class DetectionThread(QThread):
     """YOLO tespit işlemlerini yapan thread"""
     
     # Sinyaller
-    frame_ready = pyqtSignal(tuple)  # (source_id, frame)
+    frame_ready = pyqtSignal(tuple)  # (source_id, önizleme frame'i, tespitler: DETECTION_DTYPE kayıtları, tam boyut (w, h))
     detection_stats = pyqtSignal(dict)  # istatistikler
-    log_message = pyqtSignal(str)
     error_occurred = pyqtSignal(str)
     
     def __init__(self, config):
@@ -29,6 +44,9 @@ class DetectionThread(QThread):
         self.config = config
         self.model = None
         self.caps = []
+        self.file_sources = set()  # Video dosyası olan kaynak indeksleri
+        self.stream_sources = set()  # Ağ akışı (RTSP/HTTP) olan kaynak indeksleri
+        self.reused_buffer_sources = set()  # read() okuyucunun iç tamponunu döndüren kaynaklar
         self.is_running = False
         self.is_paused = False
         self.mutex = QMutex()
@@ -39,19 +57,54 @@ class DetectionThread(QThread):
         self.tracked_objects = defaultdict(dict)  # {source_id: {track_id: info}}
         self.damage_count = 0
         self.total_detections = 0
+        self.stats = None  # init_sources içinde kaynak sayısına göre oluşturulur (çıkarım sürecinde yok)
+        self.scheduler = None  # init_sources içinde oluşturulur
+        self.shed_budget = None  # priority politikasındaki kaynakların ortak kuyruk kapasitesi
+        self.progress = {}  # {source_id: FileProgress} video dosyası kaynakları
+        self.last_progress_log = 0.0
+        self.last_display = defaultdict(float)  # {source_id: son UI'ye gönderim zamanı}
+        self.read_failures = defaultdict(int)  # {source_id: art arda okunamayan frame}
+        self.frame_counts = defaultdict(int)  # {source_id: işlenen frame sayısı} (kayıtların frame_idx'i)
+        self.detection_buffers = defaultdict(DetectionBuffer)  # {source_id: yeniden kullanılan kayıt tamponu}
+        self.frame_pools = {}  # {source_id: FramePool} okuma ve kayıt kopyası tamponları
+        self.preview_pools = {}  # {source_id: FramePool} GUI önizleme tamponları
+        self.preview_sizes = PreviewSizes()  # {source_id: görüntü alanı boyutu} GUI'den
         
         # Video kayıt için
         self.video_writers = []
+        self.raw_writers = []  # Ham frame kaydı (rawcap), kaynak başına
+        self.event_recorders = []  # Olay tetiklemeli kayıt, kaynak başına
+        self.damage_in_frame = defaultdict(bool)  # {source_id: son frame'de hasarlı iz var mı}
         self.should_record = False
         
         # Sınıf adları
-        self.class_names = ["Hasarlı","Hasarsız"]
+        self.class_names = list(CLASS_NAMES)
+        
+        # Kayıtlara çizilen etiket ve tarih damgası için sprite önbelleği
+        self.overlay = OverlayRenderer(self.config.overlay_sprite_cache_size)
+        
+        # Loglar QueueHandler üzerinden yazılır; thread disk/GUI için beklemez
+        self.logger = logging.getLogger("CivataDetection.detection")
+        
+        # Metrikler (Prometheus endpoint'i için)
+        self.metrics = get_metrics()
+        self.capture_meters = defaultdict(RateMeter)  # {source_id: RateMeter}
+        self.inference_meters = defaultdict(RateMeter)
+        
+    def log(self, message, source_id=None, level=logging.INFO, track_id=None):
+        """Yapılandırılmış log kaydı (source/track_id alanlarıyla)"""
+        self.logger.log(level, message, extra={'source': source_id, 'track_id': track_id})
+            
+    def observe_stage(self, stage, source_id, started):
+        """Aşama gecikmesini histogram'a kaydet"""
+        self.metrics.observe("civata_stage_latency_seconds", time.perf_counter() - started,
+                             "Pipeline aşama gecikmeleri", stage=stage, source=source_id)
         
     def run(self):
         """Ana thread döngüsü"""
         try:
             self.is_running = True
-            self.log_message.emit("Thread başlatıldı")
+            self.log("Thread başlatıldı")
             
             # Model yükle
             if not self.load_model():
@@ -72,7 +125,10 @@ class DetectionThread(QThread):
     def load_model(self):
         """YOLO modelini yükle - basit versiyon"""
         try:
-            self.log_message.emit(f"Model yükleniyor: {self.config.model_path}")
+            if self.config.inference_backend == "server":
+                return self.connect_inference_server()
+            
+            self.log(f"Model yükleniyor: {self.config.model_path}")
             
             # Model dosyası kontrolü
             if not os.path.exists(self.config.model_path):
@@ -85,11 +141,11 @@ class DetectionThread(QThread):
             if self.model is None:
                 raise Exception("Model yüklenemedi")
             
-            self.log_message.emit("✅ Model başarıyla yüklendi")
+            self.log("✅ Model başarıyla yüklendi")
             
             # Model sınıflarını logla
             if hasattr(self.model, 'names'):
-                self.log_message.emit(f"Model sınıfları: {self.model.names}")
+                self.log(f"Model sınıfları: {self.model.names}")
             
             return True
             
@@ -97,17 +153,36 @@ class DetectionThread(QThread):
             self.error_occurred.emit(f"Model yükleme hatası: {str(e)}")
             return False
             
+    def connect_inference_server(self):
+        """Model yerine paylaşımlı çıkarım sunucusuna bağlan"""
+        from .inference_server import InferenceClient
+        
+        address = self.config.inference_server_address
+        self.log(f"Çıkarım sunucusuna bağlanılıyor: {address}")
+        try:
+            self.model = InferenceClient(address, self.config.inference_server_authkey,
+                                         timeout=self.config.inference_server_timeout)
+        except Exception as e:
+            self.error_occurred.emit(f"Çıkarım sunucusuna bağlanılamadı ({address}): {str(e)}")
+            return False
+        
+        self.log(f"✅ Çıkarım sunucusuna bağlanıldı, model sınıfları: {self.model.names}")
+        return True
+        
     def init_sources(self):
         """Video kaynaklarını başlat"""
         try:
             self.caps = []
             self.video_writers = []
+            self.raw_writers = []
+            self.event_recorders = []
             
             # Bugünün klasörünü oluştur
             from datetime import datetime
             today_folder = datetime.now().strftime("%d%m%Y")
             self.source_dir = f"src/source/{today_folder}"
             os.makedirs(self.source_dir, exist_ok=True)
+            get_storage_manager(self.config)
             
             # Sources dictionary'den değerleri al
             source_list = []
@@ -119,33 +194,7 @@ class DetectionThread(QThread):
                     return False
             
             for i, source in enumerate(source_list):
-                processed_source = source
-                
-                if isinstance(source, str):
-                    # Video dosyası - klasöre kopyala
-                    if os.path.exists(source):
-                        import shutil
-                        filename = os.path.basename(source)
-                        # Aynı isimde dosya varsa üzerine yazma
-                        target_path = os.path.join(self.source_dir, filename)
-                        
-                        if not os.path.exists(target_path):
-                            shutil.copy2(source, target_path)
-                            self.log_message.emit(f"Video kopyalandı: {target_path}")
-                        else:
-                            self.log_message.emit(f"Video zaten mevcut: {target_path}")
-                        
-                        processed_source = target_path
-                    
-                    cap = cv2.VideoCapture(processed_source)
-                    self.log_message.emit(f"Video dosyası açıldı: {processed_source}")
-                    
-                elif isinstance(source, int):
-                    # Kamera
-                    cap = cv2.VideoCapture(source)
-                    self.should_record = True
-                    self.log_message.emit(f"Kamera {source} açıldı")
-                    processed_source = source
+                cap, processed_source = self.open_source(i, source)
                     
                 if not cap.isOpened():
                     self.error_occurred.emit(f"Kaynak {i} açılamadı: {processed_source}")
@@ -156,50 +205,265 @@ class DetectionThread(QThread):
                 cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
                 cap.set(cv2.CAP_PROP_FPS, 30)
                 
-                self.caps.append(cap)
-                
-                # Video kayıt için writer oluştur (sadece kamera için)
-                if isinstance(source, int) and self.should_record:
+                # Video kayıt için writer oluştur (sadece kamera ve ağ akışı için)
+                is_live = isinstance(source, int) or i in self.stream_sources
+                event_mode = self.config.recording_mode == "event"
+                if is_live and self.should_record and not event_mode:
                     self.init_video_writer(i, cap)
                 else:
                     self.video_writers.append(None)
                     
+                # Olay kaydı: yalnızca hasar görülen aralıklar (pre-roll + post-roll)
+                if is_live and self.should_record and event_mode:
+                    self.event_recorders.append(self.create_event_recorder(i, cap.get(cv2.CAP_PROP_FPS)))
+                else:
+                    self.event_recorders.append(None)
+                    
+                # Ham frame kaydı (sadece kamera ve ağ akışı için)
+                if is_live and self.config.raw_capture_enabled:
+                    self.init_raw_writer(i, cap)
+                else:
+                    self.raw_writers.append(None)
+                    
+                # Yük atma katmanı (seçiliyse okuma kendi thread'inde, çıkarımı beklemeden)
+                wrapped = self.wrap_load_shedding(i, cap)
+                if wrapped is cap and self.reuses_buffers(cap):
+                    self.reused_buffer_sources.add(i)
+                self.caps.append(wrapped)
+                    
+            # İstatistik toplayıcı (kaynak x sınıf)
+            self.stats = StatsAggregator(
+                len(self.caps),
+                num_classes=len(self.class_names),
+                emit_hz=self.config.stats_emit_hz,
+                window_seconds=self.config.stats_window_seconds,
+                damaged_class=self.class_names.index("Hasarlı")
+            )
+            
+            # Kaynak zamanlayıcı (hedef FPS + öncelik ağırlığı)
+            self.scheduler = WeightedSourceScheduler(
+                [self.config.get_source_priority(i) for i in range(len(self.caps))],
+                [self.target_fps(i) for i in range(len(self.caps))]
+            )
+            
+            # Video dosyalarının ilerlemesi (yüzde, FPS, ETA)
+            for i in self.file_sources:
+                self.progress[i] = FileProgress(self.caps[i].get(cv2.CAP_PROP_FRAME_COUNT))
+            if self.config.file_max_throughput and self.file_sources:
+                self.log("Maksimum hız modu: video dosyaları beklemeden işleniyor")
+                    
             return True
             
         except Exception as e:
             self.error_occurred.emit(f"Kaynak başlatma hatası: {str(e)}")
             return False
             
+    def open_source(self, source_id, source, archive=True):
+        """Kaynağı türüne göre aç; (cap, loglarda görünecek ad) döndür"""
+        processed_source = source
+        
+        if is_rawcap_source(source):
+            # Ham kayıt tekrar oynatma (decode yok)
+            realtime = self.config.replay_realtime and not self.config.file_max_throughput
+            cap = self.wrap_sampling(source_id, ReplayCapture(source, realtime=realtime))
+            self.file_sources.add(source_id)
+            mode = "orijinal zamanlama" if realtime else "maksimum hız"
+            self.log(f"Rawcap kaydı açıldı: {source} ({len(cap.reader)} frame, {mode})")
+            
+        elif is_stream_source(source):
+            # IP kamera; kamera gibi kaydedilir, kopan bağlantı arka planda yenilenir
+            cap = self.open_stream(source)
+            self.stream_sources.add(source_id)
+            self.should_record = True
+            processed_source = mask_url(source)
+            if cap.isOpened():
+                self.log(f"Ağ akışı açıldı: {processed_source}")
+            
+        elif isinstance(source, str):
+            # Video dosyası - orijinalinden okunur, arşiv kopyası arka planda alınır
+            if archive and os.path.exists(source) and self.config.archive_sources:
+                get_source_archiver(self.config).submit(source)
+                self.log(f"Video arşiv kuyruğuna eklendi: {source}")
+            
+            cap = self.wrap_sampling(source_id, self.open_video_file(source))
+            self.file_sources.add(source_id)
+            self.log(f"Video dosyası açıldı: {source}")
+            
+        elif isinstance(source, int):
+            # Kamera
+            cap = cv2.VideoCapture(source)
+            self.should_record = True
+            self.log(f"Kamera {source} açıldı")
+            
+        return cap, processed_source
+        
+    def reuses_buffers(self, cap):
+        """Okuyucu her read()'de aynı iç tamponu mu döndürüyor (ffmpeg, rawcap; örneklemeli de)"""
+        if isinstance(cap, SampledCapture):
+            cap = cap.cap
+        return isinstance(cap, (FFmpegCapture, ReplayCapture))
+        
+    def wrap_load_shedding(self, source_id, cap):
+        """Kaynağın yük atma politikası seçiliyse okuyucuyu SheddingCapture ile sar"""
+        policy = self.config.get_source_shed_policy(source_id)
+        if policy == "none":
+            return cap
+        if self.config.file_max_throughput and source_id in self.file_sources:
+            # Maksimum hız modunda dosya çıkarım hızında okunur; atılacak frame yoktur
+            return cap
+        if isinstance(cap, SampledCapture):
+            # Örnekleme zaten seyreltir; adaptif geri dönüş okuyucu thread'iyle çakışmasın
+            return cap
+        if policy not in SHED_POLICIES:
+            self.log(f"Bilinmeyen yük atma politikası: {policy}, kaynak {source_id} için kapalı",
+                     source_id, logging.WARNING)
+            return cap
+            
+        budget = None
+        if policy == "priority":
+            if self.shed_budget is None:
+                self.shed_budget = SharedBudget(self.config.shed_queue_size)
+            budget = self.shed_budget
+            
+        # Ham kayıt atılan frame'ler dahil her frame'i alır
+        tap = None
+        if self.raw_writers[source_id] is not None:
+            tap = lambda frame: self.record_raw(source_id, frame)
+            
+        wrapped = SheddingCapture(
+            cap, source_id, policy,
+            queue_size=self.config.shed_queue_size,
+            every_n=self.config.shed_every_n,
+            is_file=source_id in self.file_sources,
+            is_stream=source_id in self.stream_sources,
+            pace_fps=cap.get(cv2.CAP_PROP_FPS) or self.config.get_source_fps(source_id),
+            priority=self.config.get_source_priority(source_id),
+            budget=budget,
+            tap=tap,
+            copy_frames=self.reuses_buffers(cap),
+            pool=self.frame_pool(source_id)
+        )
+        self.log(f"Kaynak {source_id} yük atma politikası: {policy}", source_id)
+        return wrapped
+        
+    def wrap_sampling(self, source_id, cap):
+        """Örnekleme açıksa video dosyasını her N. frame'i okuyan sarmalayıcıyla sar"""
+        if not cap.isOpened():
+            return cap
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+        stride = stride_for(self.config.sample_stride, self.config.sample_interval, fps)
+        if stride <= 1:
+            return cap
+            
+        sampled = SampledCapture(
+            cap, source_id, stride,
+            seek_stride=self.config.sample_seek_stride,
+            adaptive=self.config.sample_adaptive,
+            dense_frames=int(self.config.sample_dense_seconds * fps)
+        )
+        mode = ", hasar çevresi tam hızda" if self.config.sample_adaptive else ""
+        self.log(f"Kaynak {source_id} örnekleme: her {stride}. frame ({stride / fps:.2f} sn){mode}", source_id)
+        return sampled
+        
+    def target_fps(self, source_id):
+        """Zamanlayıcı hedef FPS'i (maksimum hız modunda video dosyaları sınırsız)"""
+        if self.config.file_max_throughput and source_id in self.file_sources:
+            return 0.0
+        return self.config.get_source_fps(source_id)
+        
+    def open_video_file(self, path):
+        """Video dosyasını seçili decode backend'i ile aç"""
+        if self.config.decode_backend == "ffmpeg":
+            if ffmpeg_available():
+                cap = FFmpegCapture(path, self.config.ffmpeg_width, self.config.ffmpeg_height,
+                                    self.config.ffmpeg_fps, self.config.ffmpeg_threads,
+                                    self.config.ffmpeg_prefetch)
+                self.log(f"ffmpeg decode: {cap.width}x{cap.height} @ {cap.fps:.1f} FPS")
+                return cap
+            self.log("imageio-ffmpeg bulunamadı, OpenCV ile okunuyor", level=logging.WARNING)
+        return cv2.VideoCapture(path)
+        
+    def open_stream(self, url):
+        """Ağ akışını gecikmesi sınırlı okuyucu ile aç (ilk bağlantıyı bekler)"""
+        return StreamCapture(
+            url,
+            open_timeout=self.config.stream_open_timeout,
+            read_timeout=self.config.stream_read_timeout,
+            max_latency=self.config.stream_max_latency,
+            reconnect_initial=self.config.stream_reconnect_initial,
+            reconnect_max=self.config.stream_reconnect_max
+        )
+        
     def init_video_writer(self, source_id, cap):
         """Video kayıt için writer oluştur"""
         try:
-            # Çıktı dosyası adı - kaynak klasörüne kaydet
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_filename = f"camera_{source_id}_{timestamp}.mp4"
-            output_path = os.path.join(self.source_dir, output_filename)
-            
             # Video özelliklerini al
             fps = int(cap.get(cv2.CAP_PROP_FPS)) or 30
             width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
             height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-            
-            # Writer oluştur
-            fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-            writer = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
-            
-            if writer.isOpened():
-                self.video_writers.append(writer)
-                self.log_message.emit(f"Video kaydı başlatıldı: {output_path}")
-            else:
-                self.video_writers.append(None)
-                self.log_message.emit(f"Video writer oluşturulamadı: {output_path}")
+            self.video_writers.append(self.create_segment_writer(source_id, fps, width, height))
                 
         except Exception as e:
             self.video_writers.append(None)
-            self.log_message.emit(f"Video writer hatası: {str(e)}")
+            self.log(f"Video writer hatası: {str(e)}", level=logging.ERROR)
+            
+    def create_segment_writer(self, source_id, fps, width, height):
+        """Kaynak klasörüne parçalı sürekli kayıt başlat (camera_<id>_<zaman>.mp4 parçaları)"""
+        writer = SegmentedRecorder(
+            self.source_dir, f"camera_{source_id}", width, height,
+            fps=fps,
+            segment_seconds=self.config.record_segment_seconds,
+            codec=self.config.record_ffmpeg_codec,
+            preset=self.config.record_ffmpeg_preset,
+            cv_codec=self.config.video_codec,
+            source_id=source_id
+        )
+        if not writer.isOpened():
+            writer.release()
+            self.log(f"Video writer oluşturulamadı: {self.source_dir}", source_id, logging.ERROR)
+            return None
+        encoder = self.config.record_ffmpeg_codec if writer.use_ffmpeg else self.config.video_codec
+        self.log(f"Video kaydı başlatıldı: {self.source_dir} ({encoder}, "
+                 f"{self.config.record_segment_seconds:.0f} sn parçalar)", source_id)
+        return writer
+        
+    def create_event_recorder(self, source_id, fps):
+        """Kaynak için olay tetiklemeli kayıt oluştur"""
+        recorder = EventRecorder(
+            source_id, self.source_dir,
+            fps=int(fps) or self.config.video_fps,
+            preroll=self.config.event_preroll_seconds,
+            postroll=self.config.event_postroll_seconds,
+            jpeg_quality=self.config.event_jpeg_quality,
+            max_clip_seconds=self.config.event_max_clip_seconds,
+            codec=self.config.video_codec
+        )
+        self.log(f"Olay kaydı hazır: {self.config.event_preroll_seconds:.0f} sn öncesi, "
+                 f"{self.config.event_postroll_seconds:.0f} sn sonrası", source_id)
+        return recorder
+        
+    def init_raw_writer(self, source_id, cap):
+        """Kamera için ham frame (rawcap) kaydını başlat"""
+        try:
+            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            path = new_capture_path(self.config.raw_capture_dir, f"camera_{source_id}")
+            
+            writer = RawCaptureWriter(
+                path, width, height,
+                compression=self.config.raw_capture_compression,
+                chunk_frames=self.config.raw_capture_chunk_frames,
+                source_info=f"camera:{mask_url(str(self.config.sources.get(source_id)))}"
+            )
+            self.raw_writers.append(writer)
+            self.log(f"Ham frame kaydı başlatıldı: {path}")
+            
+        except Exception as e:
+            self.raw_writers.append(None)
+            self.log(f"Ham kayıt hatası: {str(e)}", level=logging.ERROR)
             
     def process_loop(self):
-        """Ana işlem döngüsü"""
+        """Ana işlem döngüsü (kaynak sırası ağırlıklı adil zamanlayıcıdan gelir)"""
         while self.is_running:
             # Pause kontrolü
             self.mutex.lock()
@@ -210,113 +474,282 @@ class DetectionThread(QThread):
             if not self.is_running:
                 break
                 
-            # Her kaynaktan frame al ve işle
-            for source_id, cap in enumerate(self.caps):
-                if not self.is_running:
+            source_id, wait = self.scheduler.next_source()
+            if source_id is None:
+                if not any(self.scheduler.enabled):
+                    # Tüm kaynaklar (video dosyaları) bitti
+                    self.log("Tüm kaynaklar tamamlandı")
                     break
                     
-                ret, frame = cap.read()
-                if not ret:
-                    self.log_message.emit(f"Kaynak {source_id} frame alınamadı")
-                    continue
-                    
-                # Frame'i işle
-                processed_frame = self.process_frame(frame, source_id)
-                
-                # Tarih damgası ekle (kamera için)
-                if source_id < len(self.video_writers) and self.video_writers[source_id]:
-                    processed_frame = self.add_timestamp(processed_frame)
-                    
-                # Video kaydet (kamera için)
-                if source_id < len(self.video_writers) and self.video_writers[source_id]:
-                    self.video_writers[source_id].write(processed_frame)
-                    
-                # UI'ye gönder
-                self.frame_ready.emit((source_id, processed_frame))
+                # Hiçbir kaynağın hedef zamanı gelmedi
+                self.emit_statistics()
+                time.sleep(min(wait, 0.05))
+                continue
                 
-            # FPS kontrolü
-            time.sleep(1/30)  # ~30 FPS
+            started = time.perf_counter()
+            if self.process_source(source_id, self.caps[source_id]):
+                self.scheduler.record(source_id, time.perf_counter() - started)
+            else:
+                # Frame yok (akış/yük atma boş, okuma hatası, video sonu): FPS ve kapasite payına sayılmaz
+                self.scheduler.defer(source_id)
+            
+            # İstatistik özetini sabit hızda gönder
+            self.emit_statistics()
+            
+    def process_source(self, source_id, cap):
+        """Kaynaktan bir frame oku, işle ve UI'ye gönder"""
+        started = time.perf_counter()
+        ret, frame = self.read_frame(source_id, cap)
+        self.observe_stage("read", source_id, started)
+        if not ret and isinstance(cap, SheddingCapture) and not cap.ended:
+            # Okuyucu henüz yeni frame getirmedi; okunamayan/atılan frame'leri kendisi sayar
+            return False
+            
+        if not ret and self.config.loop_video_files and source_id in self.file_sources:
+            # Dosya bitti, başa sar (soak testi)
+            cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            if isinstance(cap, SheddingCapture):
+                # Okuyucu baştan yeniden başladı; ilk frame sonraki denemede gelir
+                return False
+            ret, frame = self.read_frame(source_id, cap)
+            
+        if not ret:
+            if source_id in self.stream_sources:
+                # Yeni frame gelmedi veya yeniden bağlanılıyor; akış kendi loglar
+                self.metrics.inc("civata_dropped_frames_total", 1, "Okunamayan/atlanan frame sayısı",
+                                 source=source_id, reason="stream_no_frame")
+                return False
+            if source_id in self.file_sources:
+                # Video bitti; kaynak zamanlamadan çıkar, kapasite diğerlerine kalır
+                self.scheduler.disable(source_id)
+                progress = self.progress.get(source_id)
+                if progress is not None:
+                    progress.finish()
+                    self.log(f"Kaynak {source_id} video sonuna ulaştı: {progress.position} frame, "
+                             f"{format_duration(progress.elapsed)}, "
+                             f"ort. {progress.position / max(progress.elapsed, 1e-6):.1f} FPS", source_id)
+                else:
+                    self.log(f"Kaynak {source_id} video sonuna ulaştı", source_id)
+                return False
+            self.metrics.inc("civata_dropped_frames_total", 1,
+                             "Okunamayan/atlanan frame sayısı", source=source_id, reason="read_failed")
+            self.read_failures[source_id] += 1
+            if self.read_failures[source_id] % 100 == 1:
+                self.log(f"Kaynak {source_id} frame alınamadı ({self.read_failures[source_id]} kez)",
+                         source_id, logging.WARNING)
+            return False
             
+        if self.read_failures[source_id]:
+            self.log(f"Kaynak {source_id} yeniden frame veriyor "
+                     f"({self.read_failures[source_id]} frame alınamamıştı)", source_id)
+            self.read_failures[source_id] = 0
+            
+        try:
+            self.handle_frame(source_id, cap, frame)
+        finally:
+            # Okuma aşamasının kiralaması biter; kayıt/GUI tuttuysa tampon onlar bırakınca havuza döner
+            release(frame)
+        return True
+        
+    def handle_frame(self, source_id, cap, frame):
+        """Okunan frame'i işle, kaydet ve UI'ye gönder"""
+        self.metrics.inc("civata_frames_captured_total", 1, "Okunan frame sayısı", source=source_id)
+        if source_id in self.progress:
+            self.progress[source_id].update(int(cap.get(cv2.CAP_PROP_POS_FRAMES)))
+        
+        # Ham frame'i işlemeden önce kaydet (yük atma açıksa okuyucu thread'i kaydeder)
+        if not isinstance(cap, SheddingCapture):
+            self.record_raw(source_id, frame)
+            
+        self.metrics.set_gauge("civata_capture_fps", self.capture_meters[source_id].tick(),
+                               "Kaynak başına okuma FPS", source=source_id)
+            
+        # Frame'i işle (ham frame değişmez; kutular GUI'de, kayıt için kopyaya çizilir)
+        detections = self.process_frame(frame, source_id)
+        self.metrics.inc("civata_frames_processed_total", 1, "İşlenen frame sayısı", source=source_id)
+        self.metrics.set_gauge("civata_inference_fps", self.inference_meters[source_id].tick(),
+                               "Kaynak başına işleme FPS", source=source_id)
+        
+        writer = self.video_writers[source_id] if source_id < len(self.video_writers) else None
+        recorder = self.event_recorders[source_id] if source_id < len(self.event_recorders) else None
+        
+        # Kayıt görüntüsü: kutular (record_overlays) ve tarih damgası (kamera için)
+        if writer or recorder:
+            started = time.perf_counter()
+            recorded_frame = self.render_recording(frame, detections, source_id)
+            self.observe_stage("draw", source_id, started)
+            
+        # Video kaydet (kamera için)
+        if writer:
+            started = time.perf_counter()
+            writer.write(recorded_frame)
+            self.observe_stage("write", source_id, started)
+            
+        # Olay kaydı (pre-roll tamponuna ekle, hasar varsa klibi başlat/uzat)
+        if recorder:
+            started = time.perf_counter()
+            recorder.add(recorded_frame, event=self.damage_in_frame[source_id])
+            self.observe_stage("write", source_id, started)
+            
+        if writer or recorder:
+            release(recorded_frame)  # Kuyruğa aldılarsa kendi kiralamaları sürer
+            
+        # UI'ye gönder (GUI tüketince kuyruk derinliği azalır)
+        if self.should_display(source_id):
+            self.metrics.add_gauge("civata_queue_depth", 1, "Bekleyen öğe sayısı",
+                                   queue="ui_frames", source=source_id)
+            # Kayıtlar kaynağın tamponunun görünümü; GUI thread'ine kopyası gider.
+            # Tespitler tam çözünürlük koordinatlarında; frame'i GUI gösterdikten sonra bırakır (release)
+            started = time.perf_counter()
+            preview = self.make_preview(source_id, frame)
+            self.observe_stage("preview", source_id, started)
+            self.frame_ready.emit((source_id, preview, detections.copy(), (frame.shape[1], frame.shape[0])))
+            
+    def set_preview_size(self, source_id, width, height):
+        """Kaynağın GUI görüntü alanı boyutu (GUI thread'inden, yeniden boyutlandırmada çağrılır)"""
+        self.preview_sizes.set(source_id, width, height)
+        
+    def make_preview(self, source_id, frame):
+        """GUI'ye gidecek frame: görüntü alanı boyutunda önizleme, gerekmiyorsa frame'in kendisi"""
+        if self.config.display_preview_downscale:
+            pool = None
+            if self.config.frame_pool_enabled:
+                pool = self.preview_pools.get(source_id)
+                if pool is None:
+                    pool = self.preview_pools[source_id] = FramePool(f"preview{source_id}",
+                                                                     self.config.frame_pool_max_free)
+            preview = make_preview(frame, self.preview_sizes.get(source_id), pool)
+            if preview is not None:
+                return preview
+        if source_id in self.reused_buffer_sources and not is_pooled(frame):
+            # Havuz kapalı veya ilk frame: okuyucunun tamponu sonraki okumada ezilir, GUI kopyayı alır
+            return frame.copy()
+        return retain(frame)
+        
+    def frame_pool(self, source_id):
+        """Kaynağın frame tampon havuzu (kapalıysa None)"""
+        if not self.config.frame_pool_enabled:
+            return None
+        pool = self.frame_pools.get(source_id)
+        if pool is None:
+            pool = self.frame_pools[source_id] = FramePool(f"source{source_id}", self.config.frame_pool_max_free)
+        return pool
+        
+    def read_frame(self, source_id, cap):
+        """Frame'i havuzdan kiralanan tampona oku (yük atmada okuyucu thread'i kendisi okur)"""
+        pool = self.frame_pool(source_id)
+        if pool is None or isinstance(cap, SheddingCapture):
+            return cap.read()
+        return pool.read(cap)
+        
+    def should_display(self, source_id):
+        """Maksimum hız modunda GUI darboğaz olmasın; dosya frame'leri seyreltilerek gönderilir"""
+        if not (self.config.file_max_throughput and source_id in self.file_sources):
+            return True
+        display_fps = self.config.max_throughput_display_fps
+        if display_fps <= 0:
+            return False
+        now = time.monotonic()
+        if now - self.last_display[source_id] < 1.0 / display_fps:
+            return False
+        self.last_display[source_id] = now
+        return True
+        
+    def record_raw(self, source_id, frame):
+        """Ham frame'i kayıt kuyruğuna ekle (arka plan thread'i yazar)"""
+        raw_writer = self.raw_writers[source_id] if source_id < len(self.raw_writers) else None
+        if raw_writer is None:
+            return
+        if not raw_writer.write(frame):
+            self.metrics.inc("civata_dropped_frames_total", 1, "Okunamayan/atlanan frame sayısı",
+                             source=source_id, reason="raw_capture_full")
+        self.metrics.set_gauge("civata_queue_depth", raw_writer.pending, "Bekleyen öğe sayısı",
+                               queue="raw_capture", source=source_id)
+        
     def process_frame(self, frame, source_id):
-        """Frame'i YOLO ile işle"""
+        """Frame'i YOLO ile işle; tespit kayıtlarını döndür (frame'e çizilmez, sonraki çağrıda üzerine yazılır)"""
+        self.damage_in_frame[source_id] = False
+        frame_idx = self.frame_counts[source_id]
+        self.frame_counts[source_id] += 1
         try:
             # YOLO ile tespit yap
-            results = self.model.track(
-                frame, 
-                conf=self.config.confidence_threshold/100,
-                persist=True,
-                tracker="bytetrack.yaml"
-            )
-            
-            # Sonuçları işle
-            if results and len(results) > 0:
-                result = results[0]
-                processed_frame = self.draw_detections(frame.copy(), result, source_id)
-                
-                # İstatistikleri güncelle
-                self.update_statistics(result)
+            started = time.perf_counter()
+            if self.config.inference_backend == "server":
+                # Takip durumu sunucuda kaynak başına tutulur
+                results = self.model.track(
+                    frame,
+                    conf=self.config.confidence_threshold/100,
+                    stream_id=source_id
+                )
             else:
-                processed_frame = frame.copy()
-                
-            return processed_frame
+                results = self.model.track(
+                    frame, 
+                    conf=self.config.confidence_threshold/100,
+                    persist=True,
+                    tracker="bytetrack.yaml"
+                )
+            self.observe_stage("inference", source_id, started)
             
-        except Exception as e:
-            self.log_message.emit(f"Frame işleme hatası: {str(e)}")
-            return frame
+            # Sonuçları tek seferde kayıtlara çevir; Results burada bırakılır
+            detections = self.extract_detections(results, source_id, frame_idx)
+            results = None
             
-    def draw_detections(self, frame, result, source_id):
-        """Tespit sonuçlarını frame üzerine çiz"""
+            # Hasarlı izleri ham (çizilmemiş) frame'den kırp
+            self.save_damaged(frame, detections, source_id)
+            
+            # İstatistikleri güncelle
+            self.update_statistics(detections, source_id)
+            return detections
+            
+        except Exception as e:
+            self.log(f"Frame işleme hatası: {str(e)}", source_id, logging.ERROR)
+            return empty_detections()
+            
+    def extract_detections(self, results, source_id, frame_idx=0):
+        """model.track çıktısını kaynağın kayıt tamponuna çevir (DETECTION_DTYPE)"""
+        if not results:
+            return self.detection_buffers[source_id].fill(None, source_id, frame_idx)
+        result = results[0]
+        detections = self.detection_buffers[source_id].fill(result.boxes, source_id, frame_idx)
+        # Predictor son Results'ı bir sonraki çağrıya kadar tutar; frame referansı bırakılır
+        result.orig_img = None
+        return detections
+        
+    def save_damaged(self, frame, detections, source_id):
+        """Track ID'si olan hasarlı tespitleri kırp ve kaydet"""
+        damaged = detections[(detections['cls'] == self.class_names.index("Hasarlı"))
+                             & (detections['track_id'] != -1)]
+        self.damage_in_frame[source_id] = len(damaged) > 0
+        for x1, y1, x2, y2, _, _, track_id, _, _ in damaged.tolist():
+            self.save_damaged_crop(frame, (x1, y1, x2, y2), track_id, source_id)
+            
+    def draw_detections(self, frame, detections):
+        """Tespit kutularını ve etiketlerini frame üzerine çiz (kayıt görüntüsü için)"""
         try:
-            if result.boxes is not None and len(result.boxes) > 0:
-                boxes = result.boxes.xyxy.cpu().numpy()
-                confs = result.boxes.conf.cpu().numpy()
-                classes = result.boxes.cls.cpu().numpy()
-                
-                # Track ID'leri varsa al
-                track_ids = None
-                if result.boxes.id is not None:
-                    track_ids = result.boxes.id.cpu().numpy()
-                
-                for i, (box, conf, cls) in enumerate(zip(boxes, confs, classes)):
-                    x1, y1, x2, y2 = map(int, box)
-                    class_name = self.class_names[int(cls)]
-                    
-                    # Track ID
-                    track_id = int(track_ids[i]) if track_ids is not None else -1
+            for x1, y1, x2, y2, conf, class_id, track_id, _, _ in detections.tolist():
+                # Label parçaları (her parça sprite önbelleğinden gelir)
+                label_parts = [self.class_names[class_id], f" {conf:.2f}"]
+                if track_id != -1:
+                    label_parts.append(f" ID:{track_id}")
                     
-                    # Renk seçimi (Hasarlı: kırmızı, Hasarsız: yeşil)
-                    color = (0, 0, 255) if class_name == "Hasarlı" else (0, 255, 0)
-                    
-                    # Bounding box çiz
-                    cv2.rectangle(frame, (x1, y1), (x2, y2), color, 2)
-                    
-                    # Label oluştur
-                    label = f"{class_name} {conf:.2f}"
-                    if track_id != -1:
-                        label += f" ID:{track_id}"
-                        
-                    # Label pozisyonu
-                    label_size = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 2)[0]
-                    label_y = y1 - 10 if y1 - 10 > 10 else y1 + 30
-                    
-                    # Label arka planı
-                    cv2.rectangle(frame, (x1, label_y - label_size[1] - 5), 
-                                (x1 + label_size[0], label_y + 5), color, -1)
-                    
-                    # Label yazısı
-                    cv2.putText(frame, label, (x1, label_y), 
-                              cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 2)
-                    
-                    # Hasarlı tespit edilirse kırp ve kaydet
-                    if class_name == "Hasarlı" and track_id != -1:
-                        self.save_damaged_crop(frame, box, track_id, source_id)
-                        
+                # Bounding box ve label çiz (Hasarlı: kırmızı, Hasarsız: yeşil)
+                self.overlay.draw_box(frame, (int(x1), int(y1), int(x2), int(y2)),
+                                      CLASS_COLORS[class_id], label_parts)
+                
             return frame
             
         except Exception as e:
-            self.log_message.emit(f"Çizim hatası: {str(e)}")
+            self.log(f"Çizim hatası: {str(e)}", level=logging.ERROR)
             return frame
             
+    def render_recording(self, frame, detections, source_id=None):
+        """Kayda yazılacak görüntü: ham frame'in (havuz tamponuna) kopyası, kutular (record_overlays) ve tarih damgası"""
+        pool = self.frame_pool(source_id) if source_id is not None else None
+        recorded = pool.copy(frame) if pool is not None else frame.copy()
+        if self.config.record_overlays:
+            self.draw_detections(recorded, detections)
+        return self.add_timestamp(recorded)
+            
     def save_damaged_crop(self, frame, box, track_id, source_id):
         """Hasarlı tespit edilen bölgeyi kırp ve kaydet"""
         try:
@@ -324,6 +757,10 @@ class DetectionThread(QThread):
             if track_id in self.tracked_objects[source_id]:
                 return
                 
+            # Disk dolu: yazmayı deneyip beklemek yerine atla (sonraki frame'lerde tekrar denenir)
+            if disk_low():
+                return
+                
             x1, y1, x2, y2 = map(int, box)
             
             # Kırpılacak bölgeyi genişlet (padding)
@@ -344,7 +781,10 @@ class DetectionThread(QThread):
                 filepath = Path("data/cropped") / filename
                 
                 # Kaydet
-                cv2.imwrite(str(filepath), cropped)
+                if not cv2.imwrite(str(filepath), cropped):
+                    self.log(f"Kırpılmış görüntü yazılamadı: {filepath}", source_id, logging.ERROR)
+                    return
+                track_file("crops", filepath)
                 
                 # Takip et
                 self.tracked_objects[source_id][track_id] = {
@@ -354,60 +794,97 @@ class DetectionThread(QThread):
                 }
                 
                 self.damage_count += 1
-                self.log_message.emit(f"Hasarlı cıvata kaydedildi: {filename}")
+                if self.stats is not None:
+                    self.stats.add_saved(source_id)
+                self.metrics.inc("civata_damaged_saved_total", 1, "Kaydedilen hasarlı cıvata sayısı",
+                                 source=source_id)
+                self.log(f"Hasarlı cıvata kaydedildi: {filename}", source_id, track_id=track_id)
                 
         except Exception as e:
-            self.log_message.emit(f"Kırpma hatası: {str(e)}")
+            self.log(f"Kırpma hatası: {str(e)}", source_id, logging.ERROR)
             
     def add_timestamp(self, frame):
         """Frame'e tarih damgası ekle"""
         try:
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             
-            # Timestamp pozisyonu (sol üst köşe)
-            position = (10, 30)
-            font = cv2.FONT_HERSHEY_SIMPLEX
-            font_scale = 0.7
-            color = (255, 255, 255)  # Beyaz
-            thickness = 2
-            
-            # Arka plan için siyah dikdörtgen
-            text_size = cv2.getTextSize(timestamp, font, font_scale, thickness)[0]
-            cv2.rectangle(frame, (5, 5), (text_size[0] + 15, text_size[1] + 15), (0, 0, 0), -1)
-            
-            # Timestamp yazısı
-            cv2.putText(frame, timestamp, position, font, font_scale, color, thickness)
+            # Sol üst köşe, siyah arka plan; metin saniyede bir değiştiğinden sprite önbellekten gelir
+            self.overlay.draw_timestamp(frame, timestamp)
             
             return frame
             
         except Exception as e:
-            self.log_message.emit(f"Timestamp ekleme hatası: {str(e)}")
+            self.log(f"Timestamp ekleme hatası: {str(e)}", level=logging.ERROR)
             return frame
             
-    def update_statistics(self, result):
-        """İstatistikleri güncelle"""
+    def update_statistics(self, detections, source_id):
+        """İstatistikleri artımlı olarak güncelle (UI'ye emit_statistics gönderir)"""
         try:
-            if result.boxes is not None:
-                self.total_detections += len(result.boxes)
+            classes = detections['cls']
+            if len(classes) > 0:
+                counts = class_counts(detections, len(self.class_names))
+                self.total_detections += len(classes)
                 
-                # Sınıf bazında sayım
-                classes = result.boxes.cls.cpu().numpy()
-                damaged_count = sum(1 for cls in classes if int(cls) == 1)  # Hasarlı
+                for class_id, count in enumerate(counts):
+                    self.metrics.inc("civata_detections_total", int(count),
+                                     "Sınıf bazında toplam tespit sayısı", class_id=class_id)
+                self.metrics.set_gauge("civata_damage_count", self.damage_count,
+                                       "DetectionThread.damage_count değeri")
+                self.metrics.set_gauge("civata_total_detections", self.total_detections,
+                                       "DetectionThread.total_detections değeri")
                 
-                # İstatistik dictionary'si oluştur
-                stats = {
-                    'total_detections': self.total_detections,
-                    'damaged_count': self.damage_count,
-                    'current_damaged': damaged_count,
-                    'fps': 30,  # Yaklaşık FPS
-                    'model_conf': self.config.confidence_threshold
-                }
+                # Adaptif örneklemede hasar bulunan bölge tam hızda işlenir
+                cap = self.caps[source_id] if source_id < len(self.caps) else None
+                if isinstance(cap, SampledCapture) and counts[self.class_names.index("Hasarlı")]:
+                    cap.mark_damage()
                 
-                # UI'ye gönder
-                self.detection_stats.emit(stats)
+            if self.stats is not None:
+                self.stats.add_frame(source_id, classes)
                 
         except Exception as e:
-            self.log_message.emit(f"İstatistik güncelleme hatası: {str(e)}")
+            self.log(f"İstatistik güncelleme hatası: {str(e)}", source_id, logging.ERROR)
+            
+    def emit_statistics(self):
+        """Emit aralığı dolduysa istatistik özetini UI'ye gönder"""
+        if self.stats is None:
+            return
+            
+        snapshot = self.stats.maybe_snapshot({'model_conf': self.config.confidence_threshold})
+        if snapshot is not None:
+            # Zamanlayıcı raporu: kaynak başına ulaşılan FPS ve kapasite payı
+            snapshot['scheduler'] = self.scheduler.report()
+            snapshot['progress'] = [dict(source=i, **p.report()) for i, p in sorted(self.progress.items())]
+            snapshot['storage'] = storage_usage()
+            now = time.monotonic()
+            snapshot['frame_pools'] = [pool.report(now) for pools in (self.frame_pools, self.preview_pools)
+                                       for _, pool in sorted(pools.items())]
+            self.log_progress()
+            for entry in snapshot['scheduler']:
+                cap = self.caps[entry['source']]
+                entry['shed'] = cap.dropped if isinstance(cap, SheddingCapture) else 0
+                self.metrics.set_gauge("civata_scheduler_achieved_fps", entry['achieved_fps'],
+                                       "Zamanlayıcının kaynağa verdiği FPS", source=entry['source'])
+                self.metrics.set_gauge("civata_scheduler_share", entry['share'],
+                                       "Kaynağın çıkarım süresi payı", source=entry['source'])
+            self.detection_stats.emit(snapshot)
+            
+    def log_progress(self):
+        """Maksimum hız modunda video dosyalarının ilerlemesini aralıklı logla"""
+        interval = self.config.progress_log_interval
+        if not self.config.file_max_throughput or interval <= 0:
+            return
+        now = time.monotonic()
+        if now - self.last_progress_log < interval:
+            return
+        self.last_progress_log = now
+        
+        for source_id, progress in sorted(self.progress.items()):
+            report = progress.report()
+            if report['finished']:
+                continue
+            percent = f"%{report['percent']:.1f}" if report['percent'] is not None else "?"
+            self.log(f"Kaynak {source_id} ilerleme: {percent} ({report['position']}/{report['total']}), "
+                     f"{report['fps']:.1f} FPS, kalan {format_duration(report['eta'])}", source_id)
             
     def stop(self):
         """Thread'i durdur"""
@@ -423,6 +900,11 @@ class DetectionThread(QThread):
             self.condition.wakeAll()
         self.mutex.unlock()
         
+        # Yük atma okuyucuları video dosyasını duraklatmada ilerletmesin
+        for source_id, cap in enumerate(self.caps):
+            if isinstance(cap, SheddingCapture) and source_id in self.file_sources:
+                cap.set_paused(self.is_paused)
+        
     def cleanup(self):
         """Kaynakları temizle"""
         try:
@@ -436,7 +918,23 @@ class DetectionThread(QThread):
                 if writer is not None:
                     writer.release()
                     
-            self.log_message.emit("Kaynaklar temizlendi")
+            # Süren olay kliplerini bitir
+            for recorder in self.event_recorders:
+                if recorder is not None:
+                    recorder.close()
+                    
+            # Ham kayıtları bitir (kuyruktakiler yazılır)
+            for writer in self.raw_writers:
+                if writer is not None:
+                    writer.close()
+                    self.log(f"Ham kayıt kapatıldı: {writer.path} "
+                                          f"({writer.written} frame, {writer.dropped} atlandı)")
+                    
+            # Çıkarım sunucusu bağlantısını kapat
+            if hasattr(self.model, 'close'):
+                self.model.close()
+                
+            self.log("Kaynaklar temizlendi")
             
         except Exception as e:
-            self.log_message.emit(f"Temizleme hatası: {str(e)}")
\ No newline at end of file
+            self.log(f"Temizleme hatası: {str(e)}", level=logging.ERROR)
\ No newline at end of file
@@ -0,0 +1,65 @@
+"""
+src/core/detections.py
+Tespit sonuçlarının yapılandırılmış numpy kayıtları
+
+ultralytics Results frame başına bir kez (tek .cpu().numpy() ile)
+kaynak başına önceden ayrılmış bir yapılandırılmış diziye çevrilir;
+çizim, istatistik, kırpma seçimi ve GUI bu kayıtları kullanır. Results
+nesneleri (ve tuttukları orig_img referansı) dönüşümden hemen sonra
+bırakılabilir.
+"""
+
+import numpy as np
+
+DETECTION_DTYPE = np.dtype([
+    ('x1', np.float32), ('y1', np.float32), ('x2', np.float32), ('y2', np.float32),
+    ('conf', np.float32),
+    ('cls', np.int16),
+    ('track_id', np.int32),  # Takip yoksa -1
+    ('source', np.int16),
+    ('frame_idx', np.int64),
+])
+
+
+def empty_detections():
+    """Tespit olmayan frame için boş kayıt dizisi"""
+    return np.empty(0, DETECTION_DTYPE)
+
+
+def class_counts(records, num_classes):
+    """Sınıf başına tespit sayısı (bincount)"""
+    return np.bincount(records['cls'], minlength=num_classes)[:num_classes]
+
+
+class DetectionBuffer:
+    """
+    Kaynak başına yeniden kullanılan kayıt tamponu.
+
+    fill() tamponun ilk n kaydını döndürür (görünüm); sonraki fill() çağrısı
+    üzerine yazar. Başka bir thread'e/sürece gönderilecek kayıtlar
+    kopyalanmalıdır.
+    """
+
+    def __init__(self, capacity=64):
+        self.records = np.empty(capacity, DETECTION_DTYPE)
+
+    def fill(self, boxes, source_id, frame_idx):
+        """Boxes -> kayıtlar; boxes.data sütunları x1, y1, x2, y2, [track_id], conf, cls"""
+        if boxes is None or len(boxes) == 0:
+            return self.records[:0]
+        data = boxes.data.cpu().numpy()
+        n = len(data)
+        if n > len(self.records):
+            self.records = np.empty(max(n, 2 * len(self.records)), DETECTION_DTYPE)
+
+        records = self.records[:n]
+        records['x1'] = data[:, 0]
+        records['y1'] = data[:, 1]
+        records['x2'] = data[:, 2]
+        records['y2'] = data[:, 3]
+        records['track_id'] = data[:, 4] if data.shape[1] == 7 else -1
+        records['conf'] = data[:, -2]
+        records['cls'] = data[:, -1]
+        records['source'] = source_id
+        records['frame_idx'] = frame_idx
+        return records
@@ -0,0 +1,169 @@
+"""
+src/core/event_recorder.py
+Olay tetiklemeli video kaydı (bellekte pre-roll halka tamponu ile)
+
+Son `preroll` saniyenin frame'leri kaynak başına bellekte tutulur
+(varsayılan JPEG sıkıştırılmış). "Hasarlı" bir iz görünce pre-roll,
+olay süresi ve `postroll` saniye tek bir klip olarak yazılır; post-roll
+sürerken gelen yeni olaylar klibi uzatır, böylece çakışan olaylar tek
+klipte birleşir. Encode arka plan thread'inde yapılır.
+"""
+
+import logging
+import os
+import queue
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+import cv2
+
+from ..utils.metrics import get_metrics
+from ..utils.storage_manager import disk_low, track_file
+from .frame_pool import retain, release
+
+
+class EventRecorder:
+    """
+    Bir kaynağın olay kliplerini yazar.
+
+    add() tespit döngüsünden her frame için çağrılır ve bloklamaz; yazma
+    kuyruğu dolarsa frame atlanır ve `dropped` artar. Verilen frame
+    sonradan değiştirilmemelidir (jpeg_quality=0 iken kopyalanmadan tutulur).
+    """
+
+    def __init__(self, source_id, output_dir, fps=30.0, preroll=5.0, postroll=5.0, jpeg_quality=85,
+                 max_clip_seconds=300.0, codec="mp4v"):
+        self.source_id = source_id
+        self.output_dir = output_dir
+        self.fps = fps if fps and fps > 0 else 30.0
+        self.preroll = max(0.0, preroll)
+        self.postroll = max(0.0, postroll)
+        self.jpeg_quality = int(jpeg_quality)
+        self.max_clip_seconds = max_clip_seconds
+        self.codec = codec
+        self.logger = logging.getLogger("CivataDetection.recorder")
+        self.metrics = get_metrics()
+
+        self.ring = deque()  # [(zaman, frame veya JPEG baytları)]
+        self.ring_bytes = 0
+        self.clip_start = None
+        self.clip_end = None  # Kayıt sürüyorsa post-roll bitiş zamanı
+        self.clips = 0
+        self.dropped = 0
+
+        # Pre-roll bir seferde kuyruğa girer; kuyruk sınırı onu ve birkaç saniyelik encode gecikmesini karşılar
+        self.max_pending = int(self.fps * (self.preroll + 5.0)) + 10
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self._run, name=f"event-recorder-{source_id}", daemon=True)
+        self.thread.start()
+
+    @property
+    def recording(self):
+        return self.clip_end is not None
+
+    def _pack(self, frame):
+        if self.jpeg_quality <= 0:
+            return retain(frame)  # Havuz tamponu halkadan çıkınca/yazılınca bırakılır
+        ok, data = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+        return data if ok else frame.copy()
+
+    def _submit_frame(self, payload):
+        if self.queue.qsize() >= self.max_pending:
+            self.dropped += 1
+            self.metrics.inc("civata_dropped_frames_total", 1, "Okunamayan/atlanan frame sayısı",
+                             source=self.source_id, reason="event_record_full")
+            release(payload)
+            return
+        self.queue.put(("frame", payload))
+
+    def add(self, frame, event=False, timestamp=None):
+        """Frame'i ekle; event=True ise bu frame'de hasarlı iz var"""
+        now = time.time() if timestamp is None else timestamp
+
+        if self.recording:
+            if event:
+                limit = self.clip_start + self.max_clip_seconds if self.max_clip_seconds else float("inf")
+                self.clip_end = min(max(self.clip_end, now + self.postroll), limit)
+            # Kayıt sürerken frame sıkıştırılmadan doğrudan encode kuyruğuna gider
+            self._submit_frame(retain(frame))
+            if now >= self.clip_end:
+                self._close_clip()
+            return
+
+        payload = self._pack(frame)
+        self.ring.append((now, payload))
+        self.ring_bytes += payload.nbytes
+        while self.ring and self.ring[0][0] < now - self.preroll:
+            _, evicted = self.ring.popleft()
+            self.ring_bytes -= evicted.nbytes
+            release(evicted)
+
+        if event and not disk_low():
+            self._open_clip(now, frame.shape)
+        self.metrics.set_gauge("civata_event_ring_bytes", self.ring_bytes,
+                               "Pre-roll halka tamponunun bellek kullanımı", source=self.source_id)
+
+    def _open_clip(self, now, shape):
+        """Pre-roll frame'leriyle yeni klip başlat"""
+        self.clip_start = self.ring[0][0] if self.ring else now
+        self.clip_end = now + self.postroll
+        name = f"event_{self.source_id}_{datetime.fromtimestamp(now).strftime('%Y%m%d_%H%M%S_%f')[:-3]}.mp4"
+        self.queue.put(("open", os.path.join(self.output_dir, name), (shape[1], shape[0])))
+        for _, payload in self.ring:
+            self._submit_frame(payload)
+        self.ring.clear()
+        self.ring_bytes = 0
+
+    def _close_clip(self):
+        self.queue.put(("close", self.clip_end - self.clip_start))
+        self.clip_start = self.clip_end = None
+        self.clips += 1
+        self.metrics.inc("civata_event_clips_total", 1, "Yazılan olay klipleri", source=self.source_id)
+
+    def _run(self):
+        writer = None
+        path = None
+        written = 0
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            kind = item[0]
+            try:
+                if kind == "open":
+                    _, path, size = item
+                    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*self.codec), self.fps, size)
+                    written = 0
+                    if not writer.isOpened():
+                        self.logger.error(f"Olay klibi açılamadı: {path}")
+                        writer = None
+                elif kind == "frame":
+                    if writer is not None:
+                        frame = item[1]
+                        if frame.ndim < 3:  # JPEG baytları
+                            frame = cv2.imdecode(frame, cv2.IMREAD_COLOR)
+                        writer.write(frame)
+                        written += 1
+                    release(item[1])
+                elif kind == "close" and writer is not None:
+                    writer.release()
+                    writer = None
+                    track_file("recordings", path)
+                    self.logger.info(f"Olay klibi kaydedildi: {path} ({written} frame, {item[1]:.1f} sn)")
+            except Exception as e:
+                self.logger.error(f"Olay kaydı hatası: {e}")
+        if writer is not None:
+            writer.release()
+
+    def close(self):
+        """Süren klibi bitir, kuyruktakileri yaz"""
+        if self.recording:
+            self._close_clip()
+        self.queue.put(None)
+        self.thread.join()
+        for _, payload in self.ring:
+            release(payload)
+        self.ring.clear()
+        self.ring_bytes = 0
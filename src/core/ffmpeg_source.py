@@ -0,0 +1,219 @@
+"""
+src/core/ffmpeg_source.py
+imageio-ffmpeg ile pipe üzerinden video okuma (ffmpeg içinde ölçekleme ve frame atlama)
+
+ffmpeg ayrı bir süreçte (çok thread'li) decode eder, frame'i doğrudan
+istenen çözünürlüğe ve BGR24 formatına çevirip stdout'a ham olarak yazar.
+Arka plan thread'i bu veriyi önceden ayrılmış numpy tamponlarına okur;
+tespit döngüsü bir sonraki frame'i beklerken decode devam eder.
+"""
+
+import queue
+import subprocess
+import threading
+
+import cv2
+import numpy as np
+
+
+def ffmpeg_available():
+    """imageio-ffmpeg ve ffmpeg binary'si kullanılabilir mi"""
+    try:
+        import imageio_ffmpeg
+        imageio_ffmpeg.get_ffmpeg_exe()
+        return True
+    except Exception:
+        return False
+
+
+def probe_video(path):
+    """Video boyutu, FPS ve süresi (ffmpeg çıktısından)"""
+    import imageio_ffmpeg
+
+    frames = imageio_ffmpeg.read_frames(path)
+    try:
+        meta = next(frames)
+    finally:
+        frames.close()
+    return meta
+
+
+def output_size(source_size, width=0, height=0):
+    """Hedef çözünürlük; 0 verilen kenar en-boy oranı korunarak (çift sayı) hesaplanır"""
+    src_w, src_h = source_size
+    if width <= 0 and height <= 0:
+        return src_w, src_h
+    if height <= 0:
+        height = max(2, int(round(src_h * width / src_w / 2)) * 2)
+    elif width <= 0:
+        width = max(2, int(round(src_w * height / src_h / 2)) * 2)
+    return width, height
+
+
+class FFmpegCapture:
+    """
+    ffmpeg pipe kaynağını cv2.VideoCapture arayüzüyle sunar.
+
+    read() ile dönen frame tampon havuzundandır ve sonraki `buffers - 1`
+    okuma boyunca geçerlidir; daha uzun tutulacaksa kopyalanmalıdır.
+    """
+
+    def __init__(self, path, width=640, height=0, fps=0.0, threads=0, prefetch=4):
+        import imageio_ffmpeg
+
+        self.path = path
+        self.exe = imageio_ffmpeg.get_ffmpeg_exe()
+        self.threads = threads
+        self.prefetch = max(1, prefetch)
+
+        meta = probe_video(path)
+        self.source_fps = float(meta.get('fps') or 30.0)
+        self.duration = float(meta.get('duration') or 0.0)
+        self.width, self.height = output_size(meta['source_size'], width, height)
+        self.fps = float(fps) if fps and fps < self.source_fps else self.source_fps
+        self.target_fps = fps if fps and fps < self.source_fps else 0.0
+
+        self.frame_bytes = self.width * self.height * 3
+        # Tüketicinin elindeki + okunmakta olan + kuyruktakiler
+        self.buffers = [np.empty((self.height, self.width, 3), dtype=np.uint8)
+                        for _ in range(self.prefetch + 2)]
+        self.free = queue.Queue()
+        self.filled = queue.Queue()
+
+        self.process = None
+        self.reader = None
+        self.position = 0
+        self.current = None  # Tüketicideki tampon indeksi
+        self._opened = False
+        self._start(0)
+
+    def _command(self, start_seconds):
+        command = [self.exe, "-nostdin", "-loglevel", "error"]
+        if self.threads:
+            command += ["-threads", str(self.threads)]
+        if start_seconds > 0:
+            command += ["-ss", f"{start_seconds:.3f}"]
+        command += ["-i", self.path]
+
+        filters = []
+        if self.target_fps:
+            filters.append(f"fps={self.target_fps}")
+        filters.append(f"scale={self.width}:{self.height}:flags=area")
+        command += ["-vf", ",".join(filters), "-pix_fmt", "bgr24", "-f", "rawvideo", "-an", "-"]
+        return command
+
+    def _start(self, frame_index):
+        """ffmpeg sürecini ve okuyucu thread'i (yeniden) başlat"""
+        self._stop()
+        self.free = queue.Queue()
+        self.filled = queue.Queue()
+        for i in range(len(self.buffers)):
+            self.free.put(i)
+        self.current = None
+        self.position = frame_index
+
+        self.process = subprocess.Popen(self._command(frame_index / self.fps),
+                                        stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                                        stderr=subprocess.DEVNULL, bufsize=0)
+        self.reader = threading.Thread(target=self._read_loop, args=(self.process, self.free, self.filled),
+                                       name="ffmpeg-reader", daemon=True)
+        self.reader.start()
+        self._opened = True
+
+    def _read_loop(self, process, free, filled):
+        """Pipe'tan tam frame'leri boş tamponlara oku"""
+        stream = process.stdout
+        try:
+            while True:
+                index = free.get()
+                if index is None:
+                    break
+                view = memoryview(self.buffers[index].reshape(-1))
+                received = 0
+                while received < self.frame_bytes:
+                    count = stream.readinto(view[received:])
+                    if not count:
+                        return  # Video bitti veya süreç kapandı
+                    received += count
+                filled.put(index)
+        except (OSError, ValueError):
+            pass
+        finally:
+            filled.put(None)
+
+    def _stop(self):
+        if self.process is not None:
+            self.free.put(None)
+            if self.process.poll() is None:
+                self.process.kill()
+            self.process.wait()
+            self.reader.join(timeout=2)
+            self.process.stdout.close()
+        self.process = None
+        self.reader = None
+
+    def isOpened(self):
+        return self._opened
+
+    def grab(self):
+        if not self._opened:
+            return False
+        # Önceki frame'in tamponunu okuyucuya geri ver
+        if self.current is not None:
+            self.free.put(self.current)
+            self.current = None
+        index = self.filled.get()
+        if index is None:
+            self.filled.put(None)  # Sonraki çağrılar da EOF görsün
+            return False
+        self.current = index
+        self.position += 1
+        return True
+
+    def retrieve(self, image=None, flag=None):
+        if self.current is None:
+            return False, None
+        frame = self.buffers[self.current]
+        if image is not None and image.shape == frame.shape:
+            np.copyto(image, frame)
+            frame = image
+        return True, frame
+
+    def read(self, image=None):
+        if not self.grab():
+            return False, None
+        return self.retrieve(image)
+
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.width)
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.height)
+        if prop == cv2.CAP_PROP_FPS:
+            return float(self.fps)
+        if prop == cv2.CAP_PROP_FRAME_COUNT:
+            return float(int(self.duration * self.fps))
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            return float(self.position)
+        if prop == cv2.CAP_PROP_POS_MSEC:
+            return float(self.position / self.fps * 1000)
+        return 0.0
+
+    def set(self, prop, value):
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            self._start(int(max(0, value)))
+            return True
+        return False
+
+    def child_cpu_seconds(self):
+        """ffmpeg sürecinin harcadığı CPU süresi (psutil yoksa 0)"""
+        try:
+            import psutil
+            times = psutil.Process(self.process.pid).cpu_times()
+            return times.user + times.system
+        except Exception:
+            return 0.0
+
+    def release(self):
+        self._stop()
+        self._opened = False
@@ -0,0 +1,174 @@
+"""
+src/core/frame_pool.py
+Kaynak başına yeniden kullanılan frame tamponları (referans sayımlı kiralama)
+
+Her okuma, kayıt kopyası ve GUI kopyası için yeni bir ~900 KB dizi
+ayırmak yerine tamponlar havuzdan kiralanır. Kiralanan frame bir
+PooledFrame'dir (numpy dizisi); okuyucu, kuyruk ve sinyal arayüzleri
+değişmeden taşınır. Frame'i kendi kuyruğunda tutan her aşama retain()
+çağırır, işi bitince release() eder; sayaç sıfıra inince tampon havuza
+döner. release() unutulursa tampon, frame'e son referans da kalktığında
+geri alınır. Havuza ait olmayan dizilerde retain/release bir şey yapmaz.
+"""
+
+import threading
+
+import cv2
+import numpy as np
+
+from ..utils.metrics import get_metrics
+
+
+class PooledFrame(np.ndarray):
+    """Havuzdan kiralanmış frame; görünümleri (slice, reshape) aynı kiralamayı taşır"""
+
+    _lease = None
+
+    def __array_finalize__(self, obj):
+        # Kopyaların (base'i olmayan yeni diziler) havuzla ilişkisi yoktur
+        self._lease = getattr(obj, '_lease', None) if self.base is not None else None
+
+
+class _Lease:
+    """Bir tamponun kiralanması: referans sayacı ve havuza dönüş"""
+
+    __slots__ = ("pool", "buffer", "refs")
+
+    def __init__(self, pool, buffer):
+        self.pool = pool
+        self.buffer = buffer
+        self.refs = 1
+
+    def __del__(self):
+        # release() eksik kaldı ama frame'e referans kalmadı: tampon güvenle geri alınabilir
+        if self.refs > 0:
+            self.refs = 0
+            self.pool._give_back(self.buffer, reclaimed=True)
+
+
+def is_pooled(frame):
+    """Frame havuzdan mı kiralandı"""
+    return getattr(frame, '_lease', None) is not None
+
+
+def retain(frame):
+    """Frame'i tutan yeni bir aşama (kuyruk, GUI) için sayacı artır; frame'i döndür"""
+    lease = getattr(frame, '_lease', None)
+    if lease is not None:
+        with lease.pool.lock:
+            if lease.refs > 0:
+                lease.refs += 1
+    return frame
+
+
+def release(frame):
+    """Aşama frame'le işini bitirdi; son referanssa tampon havuza döner"""
+    lease = getattr(frame, '_lease', None)
+    if lease is None:
+        return
+    with lease.pool.lock:
+        if lease.refs <= 0:
+            return
+        lease.refs -= 1
+        if lease.refs:
+            return
+    lease.pool._give_back(lease.buffer)
+
+
+class FramePool:
+    """Aynı boyuttaki frame'ler için tampon havuzu (kaynak başına bir tane)"""
+
+    def __init__(self, name, max_free=8):
+        self.name = name
+        self.max_free = max(0, int(max_free))
+        self.lock = threading.RLock()  # __del__ ile geri dönüş kilit tutulurken de gelebilir
+        self.free = []
+        self.shape = None  # Son okunan frame boyutu (read() bu boyutta tampon kiralar)
+        self.allocated = 0
+        self.reused = 0
+        self.reclaimed = 0  # release() unutulup referansı kalkınca geri alınanlar
+        self.in_use = 0
+        self.metrics = get_metrics()
+        self.last_report = (0.0, 0)
+
+    def acquire(self, shape, dtype=np.uint8):
+        """Havuzdan (yoksa yeni ayrılmış) bir tampon kirala; sayaç 1"""
+        buffer = None
+        with self.lock:
+            for i, candidate in enumerate(self.free):
+                if candidate.shape == shape and candidate.dtype == dtype:
+                    buffer = self.free.pop(i)
+                    break
+            self.in_use += 1
+            if buffer is None:
+                self.allocated += 1
+            else:
+                self.reused += 1
+        if buffer is None:
+            buffer = np.empty(shape, dtype)
+            self.metrics.inc("civata_frame_pool_allocations_total", 1, "Havuzun yeni ayırdığı frame tamponları",
+                             pool=self.name)
+        frame = buffer.view(PooledFrame)
+        frame._lease = _Lease(self, buffer)
+        return frame
+
+    def _give_back(self, buffer, reclaimed=False):
+        with self.lock:
+            self.in_use -= 1
+            if reclaimed:
+                self.reclaimed += 1
+            if len(self.free) < self.max_free:
+                self.free.append(buffer)
+
+    def copy(self, frame):
+        """Frame'in kiralanmış tampondaki kopyası"""
+        pooled = self.acquire(frame.shape, frame.dtype)
+        np.copyto(pooled, frame)
+        return pooled
+
+    def resize(self, frame, size, interpolation=cv2.INTER_AREA):
+        """Frame'in size=(w, h) boyutuna ölçeklenmiş hali, kiralanmış tamponda"""
+        pooled = self.acquire((size[1], size[0]) + frame.shape[2:], frame.dtype)
+        cv2.resize(frame, size, dst=pooled, interpolation=interpolation)
+        return pooled
+
+    def read(self, cap):
+        """cap.read(image=tampon) ile kiralanmış tampona oku (ilk frame boyutu öğrenmek için doğrudan)"""
+        if self.shape is None:
+            ret, frame = cap.read()
+            if ret:
+                self.shape = frame.shape
+            return ret, frame
+
+        buffer = self.acquire(self.shape)
+        ret, frame = cap.read(image=buffer)
+        if frame is not buffer:
+            # Okunamadı ya da boyut değişti; okuyucu kendi dizisini döndürdü
+            release(buffer)
+            if ret:
+                self.shape = frame.shape
+        return ret, frame
+
+    def report(self, now):
+        """Havuz durumu; allocation_rate son rapordan beri saniyedeki yeni ayırma"""
+        last_time, last_allocated = self.last_report
+        with self.lock:
+            allocated, in_use, free = self.allocated, self.in_use, len(self.free)
+        rate = (allocated - last_allocated) / (now - last_time) if last_time and now > last_time else 0.0
+        self.last_report = (now, allocated)
+
+        self.metrics.set_gauge("civata_frame_pool_buffers", in_use, "Havuz tamponları (kullanımda / boşta)",
+                               pool=self.name, state="in_use")
+        self.metrics.set_gauge("civata_frame_pool_buffers", free, "Havuz tamponları (kullanımda / boşta)",
+                               pool=self.name, state="free")
+        self.metrics.set_gauge("civata_frame_pool_allocation_rate", rate,
+                               "Saniyedeki yeni frame tamponu ayırma", pool=self.name)
+        return {
+            'pool': self.name,
+            'in_use': in_use,
+            'free': free,
+            'allocated': allocated,
+            'reused': self.reused,
+            'reclaimed': self.reclaimed,
+            'allocation_rate': rate,
+        }
@@ -0,0 +1,151 @@
+"""
+src/core/headless_runner.py
+GUI olmadan tespit çalıştıran runner (istasyon/servis kullanımı için)
+"""
+
+import signal
+
+from PyQt6.QtCore import QCoreApplication, QObject, QTimer
+
+from .frame_pool import release
+from .process_pipeline import create_detection_runner
+from ..utils.metrics import get_metrics, start_metrics_server
+from ..utils.soak_monitor import SoakMonitor
+
+
+def queue_depth_total():
+    """Metrik registry'deki tüm kuyruk derinliklerinin toplamı"""
+    return sum(get_metrics().series("civata_queue_depth").values())
+
+
+class HeadlessRunner(QObject):
+    """DetectionThread'i GUI olmadan çalıştırır, çıktıları logger'a yönlendirir"""
+
+    def __init__(self, config, logger, soak_hours=None):
+        super().__init__()
+        self.config = config
+        self.logger = logger
+        self.detection_thread = None
+        self.metrics_server = None
+        self.exit_code = 0
+        
+        # Soak modu
+        self.soak_hours = soak_hours
+        self.soak_monitor = None
+        self.soak_timer = None
+
+    def start(self):
+        """Metrik sunucusunu ve tespit thread'ini başlat"""
+        valid, message = self.config.validate_model_path()
+        if not valid:
+            self.logger.error(message)
+            return False
+
+        valid, message = self.config.validate_sources()
+        if not valid:
+            self.logger.error(message)
+            return False
+
+        self.metrics_server = start_metrics_server(self.config, self.logger)
+
+        self.detection_thread = create_detection_runner(self.config)
+        self.detection_thread.frame_ready.connect(self.on_frame)
+        self.detection_thread.detection_stats.connect(self.on_stats)
+        self.detection_thread.error_occurred.connect(self.on_error)
+        self.detection_thread.finished.connect(self.on_finished)
+
+        if self.soak_hours:
+            self.start_soak()
+
+        self.detection_thread.start()
+        self.logger.info("Headless tespit başlatıldı")
+        return True
+
+    def start_soak(self):
+        """Kaynakları döngüde oynat ve bellek büyümesini izlemeye başla"""
+        self.config.loop_video_files = True
+
+        self.soak_monitor = SoakMonitor(self.config, self.config.logs_dir)
+        self.soak_monitor.add_probe(
+            "tracked_objects",
+            lambda: sum(len(ids) for ids in self.detection_thread.tracked_objects.values()))
+        self.soak_monitor.add_probe("queue_depth", queue_depth_total)
+        self.soak_monitor.start()
+
+        self.soak_timer = QTimer(self)
+        self.soak_timer.timeout.connect(self.on_soak_tick)
+        self.soak_timer.start(int(self.config.soak_sample_interval * 1000))
+        self.logger.info(f"Soak modu: {self.soak_hours} saat, "
+                         f"{self.config.soak_sample_interval} sn aralıkla örnekleme")
+
+    def on_soak_tick(self):
+        """Periyodik örnek al, süre dolduysa durdur"""
+        sample = self.soak_monitor.sample()
+        self.logger.info(f"Soak örneği - RSS: {sample['rss_mb']:.1f} MB, "
+                         f"Heap: {sample['heap_mb']:.1f} MB, Probe: {sample['probes']}")
+        if sample['elapsed'] >= self.soak_hours * 3600:
+            self.soak_timer.stop()
+            self.stop()
+
+    def finish_soak(self):
+        """Soak raporunu yaz ve sonucu çıkış koduna yansıt"""
+        if self.soak_timer:
+            self.soak_timer.stop()
+        passed = self.soak_monitor.finish()
+        self.logger.info(f"Soak raporu: {self.soak_monitor.report_path}")
+        if passed:
+            self.logger.info("✅ Soak testi başarılı")
+        else:
+            for failure in self.soak_monitor.failures:
+                self.logger.error(f"Soak limiti aşıldı: {failure}")
+            self.exit_code = 1
+
+    def stop(self):
+        """Tespit thread'ini durdur"""
+        if self.detection_thread and self.detection_thread.isRunning():
+            self.logger.info("Headless tespit durduruluyor...")
+            self.detection_thread.stop()
+
+    def on_frame(self, frame_data):
+        """Frame tüketici yok; sadece kuyruk metriğini düş ve tamponu bırak"""
+        source_id = frame_data[0]
+        release(frame_data[1])
+        get_metrics().add_gauge("civata_queue_depth", -1, queue="ui_frames", source=source_id)
+
+    def on_stats(self, stats):
+        """İstatistikler metrik endpoint'inden okunur, burada işlem gerekmez"""
+        pass
+
+    def on_error(self, error_message):
+        """Hataları logla"""
+        self.exit_code = 1
+        self.logger.error(error_message)
+
+    def on_finished(self):
+        """Thread bittiğinde uygulamadan çık"""
+        if self.soak_monitor:
+            self.finish_soak()
+        if self.metrics_server:
+            self.metrics_server.stop()
+        self.logger.info("Headless tespit sonlandı")
+        QCoreApplication.instance().exit(self.exit_code)
+
+
+def run_headless(config, logger, argv=None, soak_hours=None):
+    """Headless modda event loop'u çalıştır ve çıkış kodunu döndür"""
+    app = QCoreApplication.instance() or QCoreApplication(argv or [])
+    runner = HeadlessRunner(config, logger, soak_hours)
+
+    # Ctrl+C / SIGTERM ile temiz kapanış
+    signal.signal(signal.SIGINT, lambda *_: runner.stop())
+    signal.signal(signal.SIGTERM, lambda *_: runner.stop())
+
+    # Python sinyal işleyicilerinin çalışabilmesi için event loop'u düzenli uyandır
+    wake_timer = QTimer()
+    wake_timer.timeout.connect(lambda: None)
+    wake_timer.start(200)
+
+    if not runner.start():
+        return 1
+
+    return app.exec()
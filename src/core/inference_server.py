@@ -0,0 +1,363 @@
+"""
+src/core/inference_server.py
+Tek model yükleyen, birden çok istemciye dinamik mikro-batch ile hizmet veren yerel çıkarım sunucusu
+
+İstemciler (GUI, headless runner, çok süreçli moddaki çıkarım süreçleri)
+Unix domain socket veya loopback TCP üzerinden frame gönderir. Sunucu
+gelen istekleri en fazla `max_batch` adet veya ilk isteğin üzerinden
+`max_delay` saniye geçene kadar biriktirip tek bir batch olarak modele
+verir. Takip (ByteTrack) sunucuda istemci ve kaynak başına ayrı tutulur.
+
+Başlatma:
+    python main.py --inference-server --config config.json
+"""
+
+import logging
+import os
+import queue
+import socket
+import threading
+import time
+from multiprocessing.connection import Client, Listener
+
+import numpy as np
+
+from ..utils.metrics import get_metrics, MetricsServer
+
+BATCH_SIZE_BUCKETS = (1, 2, 3, 4, 6, 8, 12, 16, 24, 32, 64)
+
+
+def parse_address(address):
+    """"127.0.0.1:9200" -> TCP (host, port); diğer her şey Unix socket yolu"""
+    host, sep, port = address.rpartition(":")
+    if sep and port.isdigit() and not address.startswith(("/", ".")):
+        return host or "127.0.0.1", int(port)
+    return address
+
+
+class HostArray(np.ndarray):
+    """torch tensor'ün .cpu().numpy() zincirini destekleyen numpy dizisi"""
+
+    def cpu(self):
+        return self
+
+    def numpy(self):
+        return np.asarray(self)
+
+
+class RemoteBoxes:
+    """Sunucudan gelen kutular; ultralytics Boxes'ın kullanılan alanları"""
+
+    def __init__(self, response):
+        self.xyxy = response['xyxy'].view(HostArray)
+        self.conf = response['conf'].view(HostArray)
+        self.cls = response['cls'].view(HostArray)
+        self.id = None if response['id'] is None else response['id'].view(HostArray)
+
+    @property
+    def data(self):
+        """ultralytics Boxes.data düzeni: x1, y1, x2, y2, [track_id], conf, cls"""
+        columns = [self.xyxy] + ([self.id[:, None]] if self.id is not None else [])
+        columns += [self.conf[:, None], self.cls[:, None]]
+        return np.hstack(columns).view(HostArray)
+
+    def __len__(self):
+        return len(self.conf)
+
+
+class RemoteResult:
+    """Sunucu yanıtı; DetectionThread'in ultralytics Results'tan okuduğu alanlar"""
+
+    def __init__(self, response, names):
+        self.boxes = RemoteBoxes(response)
+        self.names = names
+        self.speed = {'batch_size': response['batch_size'], 'server_ms': response['server_ms']}
+
+
+class InferenceClient:
+    """
+    Çıkarım sunucusu istemcisi.
+
+    Bağlantı başına aynı anda tek istek vardır; bağlantı koparsa sonraki
+    çağrıda yeniden bağlanılır.
+    """
+
+    def __init__(self, address, authkey, name=None, timeout=5.0):
+        self.address = parse_address(address)
+        self.authkey = authkey.encode() if isinstance(authkey, str) else authkey
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        self.timeout = timeout
+        self.conn = None
+        self.names = {}
+        self.request_id = 0
+        self.connect()
+
+    def connect(self):
+        self.conn = Client(self.address, authkey=self.authkey)
+        self.conn.send({'client': self.name})
+        hello = self.conn.recv()
+        self.names = hello['names']
+
+    def close(self):
+        if self.conn is not None:
+            try:
+                self.conn.close()
+            except OSError:
+                pass
+        self.conn = None
+
+    def track(self, frame, conf=0.25, stream_id=0, persist=True, tracker=None):
+        """YOLO.track benzeri; takip durumu sunucuda (istemci, stream_id) başına tutulur"""
+        return [self.request(frame, conf, stream_id, track=True)]
+
+    def predict(self, frame, conf=0.25):
+        """Takipsiz tespit"""
+        return [self.request(frame, conf, 0, track=False)]
+
+    def request(self, frame, conf, stream_id, track):
+        if self.conn is None:
+            self.connect()
+
+        frame = np.ascontiguousarray(frame)
+        self.request_id += 1
+        try:
+            self.conn.send({'request': self.request_id, 'shape': frame.shape, 'conf': conf,
+                            'stream': stream_id, 'track': track})
+            # Frame pickle edilmeden ham bayt olarak gönderilir (send_bytes tek boyutlu tampon bekler)
+            self.conn.send_bytes(frame.reshape(-1))
+            if not self.conn.poll(self.timeout):
+                raise TimeoutError(f"{self.timeout} sn içinde yanıt gelmedi")
+            response = self.conn.recv()
+        except (OSError, EOFError, TimeoutError) as e:
+            self.close()
+            raise ConnectionError(f"Çıkarım sunucusu hatası: {e}")
+
+        if 'error' in response:
+            raise RuntimeError(response['error'])
+        return RemoteResult(response, self.names)
+
+
+class _Request:
+    __slots__ = ('client', 'header', 'frame', 'received')
+
+    def __init__(self, client, header, frame):
+        self.client = client
+        self.header = header
+        self.frame = frame
+        self.received = time.monotonic()
+
+
+class _ClientConnection:
+    def __init__(self, conn, name):
+        self.conn = conn
+        self.name = name
+        self.lock = threading.Lock()
+
+    def send(self, message):
+        with self.lock:
+            self.conn.send(message)
+
+
+class InferenceServer:
+    """Dinamik mikro-batch'li çıkarım sunucusu"""
+
+    def __init__(self, model, address, authkey, max_batch=8, max_delay=0.005,
+                 tracker="bytetrack.yaml"):
+        self.model = model
+        self.address = parse_address(address)
+        self.authkey = authkey.encode() if isinstance(authkey, str) else authkey
+        self.max_batch = max(1, max_batch)
+        self.max_delay = max(0.0, max_delay)
+        self.tracker_config = tracker
+        self.names = dict(getattr(model, 'names', {}) or {})
+        self.logger = logging.getLogger("CivataDetection.server")
+        self.metrics = get_metrics()
+
+        self.requests = queue.Queue()
+        self.trackers = {}  # {(istemci, stream_id): BYTETracker}
+        self.clients = set()
+        self.stop_event = threading.Event()
+        self.listener = None
+
+    def start(self):
+        """Dinlemeye başla (bağlantılar arka plan thread'lerinde kabul edilir)"""
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.remove(self.address)  # Önceki çalıştırmadan kalan socket dosyası
+        self.listener = Listener(self.address, authkey=self.authkey)
+        threading.Thread(target=self._accept_loop, name="inference-accept", daemon=True).start()
+        self.logger.info(f"Çıkarım sunucusu dinliyor: {self.address} "
+                         f"(batch ≤ {self.max_batch}, bekleme ≤ {self.max_delay * 1000:.1f} ms)")
+
+    def stop(self):
+        self.stop_event.set()
+        if self.listener is not None:
+            self.listener.close()
+
+    def serve_forever(self):
+        """Batch döngüsü (çağıran thread'de çalışır)"""
+        while not self.stop_event.is_set():
+            batch = self._collect_batch()
+            if batch:
+                self._run_batch(batch)
+
+    def _accept_loop(self):
+        while not self.stop_event.is_set():
+            try:
+                conn = self.listener.accept()
+            except OSError:
+                return  # Listener kapatıldı
+            except Exception as e:
+                self.logger.warning(f"Bağlantı reddedildi: {e}")
+                continue
+            threading.Thread(target=self._client_loop, args=(conn,),
+                             name="inference-client", daemon=True).start()
+
+    def _client_loop(self, conn):
+        client = None
+        try:
+            hello = conn.recv()
+            client = _ClientConnection(conn, str(hello.get('client', 'anonim')))
+            conn.send({'names': self.names, 'max_batch': self.max_batch})
+            self.clients.add(client)
+            self.metrics.set_gauge("civata_server_clients", len(self.clients), "Bağlı istemci sayısı")
+            self.logger.info(f"İstemci bağlandı: {client.name}")
+
+            while not self.stop_event.is_set():
+                header = conn.recv()
+                data = conn.recv_bytes()
+                frame = np.frombuffer(data, dtype=np.uint8).reshape(header['shape'])
+                self.requests.put(_Request(client, header, frame))
+        except (EOFError, OSError):
+            pass
+        except Exception as e:
+            self.logger.error(f"Geçersiz istek, bağlantı kapatılıyor: {e}")
+        finally:
+            conn.close()
+            if client is not None:
+                self.clients.discard(client)
+                self.metrics.set_gauge("civata_server_clients", len(self.clients), "Bağlı istemci sayısı")
+                self.logger.info(f"İstemci ayrıldı: {client.name}")
+
+    def _collect_batch(self):
+        """İlk isteği bekle; max_batch dolana veya max_delay geçene kadar ekle"""
+        try:
+            first = self.requests.get(timeout=0.5)
+        except queue.Empty:
+            return []
+        batch = [first]
+        deadline = first.received + self.max_delay
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self.requests.get(timeout=remaining) if remaining > 0
+                             else self.requests.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run_batch(self, batch):
+        started = time.monotonic()
+        self.metrics.observe("civata_server_batch_size", len(batch), "Modele verilen batch boyutu",
+                             buckets=BATCH_SIZE_BUCKETS)
+
+        # Güven eşiği farklı istekler ayrı çalıştırılır (genelde hepsi aynıdır)
+        groups = {}
+        for request in batch:
+            groups.setdefault(request.header['conf'], []).append(request)
+
+        for conf, requests in groups.items():
+            try:
+                results = self.model.predict([r.frame for r in requests], conf=conf, verbose=False)
+            except Exception as e:
+                self.logger.error(f"Batch çıkarım hatası: {e}")
+                for request in requests:
+                    self._reply(request, {'request': request.header['request'], 'error': str(e)})
+                continue
+
+            server_ms = (time.monotonic() - started) * 1000
+            for request, result in zip(requests, results):
+                response = self._detections(request, result)
+                response.update({'request': request.header['request'], 'batch_size': len(batch),
+                                 'server_ms': server_ms})
+                self._reply(request, response)
+                self.metrics.observe("civata_server_queue_seconds", started - request.received,
+                                     "Batch'e girene kadar kuyrukta geçen süre", client=request.client.name)
+
+    def _reply(self, request, response):
+        try:
+            request.client.send(response)
+        except (OSError, ValueError):
+            return
+        name = request.client.name
+        self.metrics.inc("civata_server_requests_total", 1, "Sunucuya gelen istekler", client=name)
+        self.metrics.observe("civata_server_latency_seconds", time.monotonic() - request.received,
+                             "İsteğin alınmasından yanıta kadar geçen süre", client=name)
+
+    def _tracker(self, key):
+        """İstemci ve kaynak başına ayrı ByteTrack durumu"""
+        tracker = self.trackers.get(key)
+        if tracker is None:
+            from ultralytics.trackers.byte_tracker import BYTETracker
+            from ultralytics.utils import YAML, IterableSimpleNamespace
+            from ultralytics.utils.checks import check_yaml
+
+            args = IterableSimpleNamespace(**YAML.load(check_yaml(self.tracker_config)))
+            tracker = self.trackers[key] = BYTETracker(args=args)
+        return tracker
+
+    def _detections(self, request, result):
+        """Results -> numpy dizileri (takip isteniyorsa kaynak takipçisinden geçirilir)"""
+        det = result.boxes.cpu().numpy()
+        response = {
+            'xyxy': det.xyxy.astype(np.float32),
+            'conf': det.conf.astype(np.float32),
+            'cls': det.cls.astype(np.float32),
+            'id': None,
+        }
+        if not request.header.get('track'):
+            return response
+
+        tracker = self._tracker((request.client.name, request.header.get('stream', 0)))
+        tracks = tracker.update(det, result.orig_img)
+        if len(tracks) == 0:
+            # ultralytics ile aynı: onaylanmamış yeni izler gösterilmez
+            if any(not t.is_activated for t in tracker.tracked_stracks):
+                empty = np.zeros((0,), dtype=np.float32)
+                response.update(xyxy=np.zeros((0, 4), dtype=np.float32), conf=empty, cls=empty)
+            return response
+
+        # tracks sütunları: x1, y1, x2, y2, track_id, skor, sınıf, indeks
+        response.update(xyxy=tracks[:, :4].astype(np.float32), id=tracks[:, 4].astype(np.float32),
+                        conf=tracks[:, 5].astype(np.float32), cls=tracks[:, 6].astype(np.float32))
+        return response
+
+
+def run_server(config, logger):
+    """Konfigürasyondaki modeli yükleyip sunucuyu çalıştır; çıkış kodu döndür"""
+    from ..utils.model_loader import load_yolo_model_safe
+
+    model = load_yolo_model_safe(config.model_path)
+    if model is None:
+        logger.error(f"Model yüklenemedi: {config.model_path}")
+        return 1
+
+    server = InferenceServer(model, config.inference_server_address, config.inference_server_authkey,
+                             config.inference_server_max_batch,
+                             config.inference_server_max_delay_ms / 1000)
+    metrics_server = None
+    if config.metrics_enabled:
+        metrics_server = MetricsServer(get_metrics(), config.metrics_host,
+                                       config.inference_server_metrics_port)
+        metrics_server.start()
+        logger.info(f"Sunucu metrikleri: {metrics_server.url}")
+
+    try:
+        server.start()
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Çıkarım sunucusu durduruluyor...")
+    finally:
+        server.stop()
+        if metrics_server is not None:
+            metrics_server.stop()
+    return 0
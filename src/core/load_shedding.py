@@ -0,0 +1,251 @@
+"""
+src/core/load_shedding.py
+Yakalama ile çıkarım arasında yük atma (backpressure) katmanı
+
+Çıkarım okumadan yavaşsa kaynak okuma ayrı bir thread'de kendi hızında
+(kamera/akış: gerçek zamanlı, video dosyası: kendi FPS'i) devam eder ve
+frame'ler kaynak başına sınırlı bir kuyruğa girer. Kuyruk dolduğunda
+hangi frame'in atılacağını politika belirler:
+
+    drop_oldest  En eski bekleyen frame atılır (FIFO, kısa patlamaları yumuşatır)
+    latest_only  Yalnızca en yeni frame tutulur (en düşük gecikme)
+    every_nth    Kuyruk doluyken yeni frame'lerin yalnızca her N.'si kabul edilir
+                 (kalan frame'ler zamana yayılır)
+    priority     Kuyruk kapasitesi kaynaklar arasında ortaktır; toplam aşılınca
+                 en düşük öncelikli kaynağın en eski frame'i atılır (her kaynağın
+                 en yeni frame'i korunur, düşük öncelikliler tamamen durmaz)
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+
+import cv2
+
+from ..utils.metrics import get_metrics
+from .frame_pool import is_pooled, release
+
+SHED_POLICIES = ("none", "drop_oldest", "latest_only", "every_nth", "priority")
+
+# Aşırı yük uyarısı en fazla bu aralıkla loglanır (sn)
+OVERLOAD_LOG_INTERVAL = 10.0
+
+
+class SharedBudget:
+    """priority politikasındaki kaynakların ortak kuyruk kapasitesi"""
+
+    def __init__(self, per_source):
+        self.per_source = max(1, int(per_source))
+        self.lock = threading.Lock()
+        self.members = []
+
+    @property
+    def capacity(self):
+        return self.per_source * len(self.members)
+
+    def add(self, capture):
+        self.members.append(capture)
+        # Yüksek öncelikli kaynak ortak kapasitenin tamamını tutabilir
+        for member in self.members:
+            if member.pool is not None:
+                member.pool.max_free = max(member.pool.max_free, self.capacity + 2)
+
+    def pending(self):
+        return sum(len(member.frames) for member in self.members)
+
+    def victim(self):
+        """Frame'i atılacak kaynak: en düşük öncelik, eşitlikte en uzun kuyruk"""
+        candidates = [member for member in self.members if len(member.frames) > 1]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda member: (member.priority, -len(member.frames)))
+
+
+class SheddingCapture:
+    """
+    Kaynağı arka plan thread'inde okuyup politikaya göre frame atan
+    cv2.VideoCapture uyumlu sarmalayıcı.
+
+    read() beklemez: bekleyen frame yoksa hemen (False, None) döner ve
+    zamanlayıcı kaynağı sonra yeniden dener; kaynak bittiyse `ended` True olur. `tap` verilirse her okunan
+    frame atılmadan önce ona iletilir (ör. ham kayıt tüm frame'leri alsın).
+    Tamponlarını yeniden kullanan okuyucular (ffmpeg, rawcap) için
+    `copy_frames` açılmalıdır; aksi halde kuyruktaki frame'ler ezilir.
+    `pool` verilirse frame'ler havuz tamponlarına okunur (kopya gerekmez);
+    atılan frame'lerin tamponu havuza döner.
+    """
+
+    def __init__(self, cap, source_id, policy="drop_oldest", queue_size=4, every_n=3,
+                 is_file=False, is_stream=False, pace_fps=0.0, priority=1.0,
+                 budget=None, tap=None, copy_frames=False, pool=None):
+        if policy not in SHED_POLICIES or policy == "none":
+            raise ValueError(f"Geçersiz yük atma politikası: {policy}")
+
+        self.cap = cap
+        self.source_id = source_id
+        self.policy = policy
+        self.every_n = max(1, int(every_n))
+        self.is_file = is_file
+        self.is_stream = is_stream
+        self.interval = 1.0 / pace_fps if is_file and pace_fps > 0 else 0.0
+        self.priority = priority
+        self.budget = budget
+        self.tap = tap
+        self.copy_frames = copy_frames
+        self.pool = pool
+        self.logger = logging.getLogger("CivataDetection.shedding")
+        self.metrics = get_metrics()
+
+        capacity = 1 if policy == "latest_only" else max(1, int(queue_size))
+        self.frames = deque(maxlen=None if policy == "priority" else capacity)
+        self.lock = budget.lock if budget is not None else threading.Lock()
+        if budget is not None:
+            budget.add(self)
+        elif pool is not None:
+            # Kuyruk dolu iken de okuyucu, çıkarım ve kayıt tamponları boşta beklesin
+            pool.max_free = max(pool.max_free, capacity + 2)
+
+        self.dropped = 0
+        self.read_failures = 0
+        self.offered = 0
+        self.ended = False
+        self.paused = False
+        self.last_warning = time.monotonic()
+        self.dropped_at_warning = 0
+
+        self.stop_event = threading.Event()
+        self.thread = None
+        self._start()
+
+    def _start(self):
+        self.stop_event.clear()
+        self.ended = False
+        self.thread = threading.Thread(target=self._run, name=f"shed-{self.source_id}", daemon=True)
+        self.thread.start()
+
+    def _stop(self):
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join(timeout=2.0)
+
+    def _run(self):
+        next_due = time.monotonic()
+        while not self.stop_event.is_set():
+            if self.paused:
+                self.stop_event.wait(0.05)
+                next_due = time.monotonic()
+                continue
+
+            if self.interval:
+                # Video dosyası kendi FPS'inde "oynar"; çıkarım yetişemezse frame atılır
+                delay = next_due - time.monotonic()
+                if delay > 0 and self.stop_event.wait(delay):
+                    break
+                next_due = max(next_due + self.interval, time.monotonic() - self.interval)
+
+            ret, frame = self.pool.read(self.cap) if self.pool is not None else self.cap.read()
+            if not ret:
+                if self.is_file:
+                    with self.lock:
+                        self.ended = True
+                    return
+                # Ağ akışı yeni frame getirmedi (akış kendi loglar) veya kamera okunamadı
+                if not self.is_stream:
+                    self.read_failures += 1
+                    self.metrics.inc("civata_dropped_frames_total", 1, "Okunamayan/atlanan frame sayısı",
+                                     source=self.source_id, reason="read_failed")
+                    if self.read_failures % 100 == 1:
+                        self.logger.warning(f"Kaynak {self.source_id} frame alınamadı "
+                                            f"({self.read_failures} kez)")
+                self.stop_event.wait(0.01)
+                continue
+
+            if self.tap is not None:
+                self.tap(frame)
+            self._offer(frame.copy() if self.copy_frames and not is_pooled(frame) else frame)
+
+    def _offer(self, frame):
+        """Frame'i politikaya göre kuyruğa ekle, atılanları say"""
+        dropped = 0
+        with self.lock:
+            self.offered += 1
+            if self.policy == "priority":
+                self.frames.append(frame)
+                while self.budget.pending() > self.budget.capacity:
+                    victim = self.budget.victim()
+                    release(victim.frames.popleft())
+                    victim._count_drop(1)
+            elif self.policy == "every_nth" and len(self.frames) == self.frames.maxlen:
+                if self.offered % self.every_n == 0:
+                    release(self.frames.popleft())
+                    self.frames.append(frame)
+                else:
+                    release(frame)
+                dropped = 1
+            else:
+                if len(self.frames) == self.frames.maxlen:
+                    release(self.frames.popleft())
+                    dropped = 1
+                self.frames.append(frame)
+            if dropped:
+                self._count_drop(dropped)
+            depth = len(self.frames)
+
+        self.metrics.set_gauge("civata_queue_depth", depth, "Bekleyen öğe sayısı",
+                               queue="shedding", source=self.source_id)
+
+    def _count_drop(self, count):
+        """Atılan frame'leri say; aşırı yükü aralıklı olarak logla"""
+        self.dropped += count
+        self.metrics.inc("civata_frames_shed_total", count, "Yük atma ile çıkarıma girmeden atılan frame'ler",
+                         source=self.source_id, policy=self.policy)
+
+        now = time.monotonic()
+        if now - self.last_warning >= OVERLOAD_LOG_INTERVAL:
+            recent = self.dropped - self.dropped_at_warning
+            self.logger.warning(f"Kaynak {self.source_id} aşırı yüklü: son {now - self.last_warning:.0f} sn'de "
+                                f"{recent} frame atıldı ({self.policy})")
+            self.last_warning = now
+            self.dropped_at_warning = self.dropped
+
+    def read(self):
+        """Sıradaki frame (latest_only'de en yeni); yoksa beklemeden (False, None)"""
+        with self.lock:
+            if not self.frames:
+                return False, None
+            return True, self.frames.popleft()
+
+    @property
+    def pending(self):
+        return len(self.frames)
+
+    def set_paused(self, paused):
+        """Video dosyası okumayı duraklat (duraklatmada dosya ilerlemesin)"""
+        self.paused = paused
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def get(self, prop):
+        return self.cap.get(prop)
+
+    def set(self, prop, value):
+        if prop != cv2.CAP_PROP_POS_FRAMES:
+            return self.cap.set(prop, value)
+        # Konum değişince okuyucu durdurulur, bekleyen frame'ler atılmadan temizlenir
+        self._stop()
+        self._clear()
+        result = self.cap.set(prop, value)
+        self._start()
+        return result
+
+    def _clear(self):
+        with self.lock:
+            while self.frames:
+                release(self.frames.popleft())
+
+    def release(self):
+        self._stop()
+        self._clear()
+        self.cap.release()
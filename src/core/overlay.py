@@ -0,0 +1,120 @@
+"""
+src/core/overlay.py
+Tespit kutuları, etiketler ve tarih damgası için önbellekli overlay çizimi
+
+cv2.getTextSize/putText her çağrıda metni yeniden ölçüp rasterize eder;
+oysa etiket parçaları ("Hasarlı", " 0.87", " ID:12") ve saniyede bir
+değişen tarih damgası frame'den frame'e tekrar eder. Etiket arka planı
+düz renk olduğundan her parça, arka planıyla birlikte bir kez opak BGR
+sprite olarak çizilir ve LRU önbellekte tutulur; frame'e tek bir numpy
+dilim atamasıyla kopyalanır. Sonuç putText ile aynıdır (yalnızca parça
+birleşimlerinde birkaç kenar yumuşatma pikseli farklı olabilir).
+
+Canlı görüntüde kutuları VideoWidget ekran çözünürlüğünde kendisi çizer;
+buradaki çizim kayıt görüntüsü (record_overlays) içindir.
+"""
+
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+
+# Model sınıfları ve kutu renkleri (BGR; Hasarlı: kırmızı, Hasarsız: yeşil)
+CLASS_NAMES = ("Hasarlı", "Hasarsız")
+CLASS_COLORS = ((0, 0, 255), (0, 255, 0))
+
+
+class SpriteCache:
+    """En son kullanılanları tutan (LRU) sprite önbelleği"""
+
+    def __init__(self, max_items=512):
+        self.max_items = max(1, int(max_items))
+        self.items = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, render):
+        """Anahtarın sprite'ı; yoksa render() ile oluşturulur"""
+        sprite = self.items.get(key)
+        if sprite is not None:
+            self.items.move_to_end(key)
+            self.hits += 1
+            return sprite
+
+        self.misses += 1
+        sprite = render()
+        self.items[key] = sprite
+        if len(self.items) > self.max_items:
+            self.items.popitem(last=False)
+        return sprite
+
+
+def blit(frame, sprite, x, y):
+    """Opak sprite'ı sol üst köşesi (x, y) olacak şekilde kopyala; frame dışı kırpılır"""
+    sh, sw = sprite.shape[:2]
+    h, w = frame.shape[:2]
+    x0, y0 = max(x, 0), max(y, 0)
+    x1, y1 = min(x + sw, w), min(y + sh, h)
+    if x0 < x1 and y0 < y1:
+        frame[y0:y1, x0:x1] = sprite[y0 - y:y1 - y, x0 - x:x1 - x]
+
+
+class OverlayRenderer:
+    """Tespit etiketlerini ve tarih damgasını önbellekli sprite'larla çizer"""
+
+    def __init__(self, cache_size=512, label_scale=0.5, label_thickness=2,
+                 timestamp_scale=0.7, timestamp_thickness=2):
+        self.cache = SpriteCache(cache_size)
+        self.label_scale = label_scale
+        self.label_thickness = label_thickness
+        self.timestamp_scale = timestamp_scale
+        self.timestamp_thickness = timestamp_thickness
+        # Parça genişliklerinde kalınlık payı var; art arda dizilince bir kez sayılır
+        self.overlap = label_thickness // 2
+
+    def _label_part(self, text, color, text_color):
+        """Etiket parçası: arka plan rengi üzerine çizilmiş yazı (taban çizgisi üst kenardan h+5)"""
+        (width, height), _ = cv2.getTextSize(text, FONT, self.label_scale, self.label_thickness)
+        sprite = np.empty((height + 11, width + 1, 3), np.uint8)
+        sprite[:] = color
+        cv2.putText(sprite, text, (0, height + 5), FONT, self.label_scale, text_color, self.label_thickness)
+        return sprite
+
+    def draw_label(self, frame, parts, x, y, color, text_color=(255, 255, 255)):
+        """
+        Kutunun üstüne parçalardan oluşan etiketi çiz (ör. ["Hasarlı", " 0.87", " ID:12"]).
+
+        Yerleşim eski getTextSize/putText çizimiyle aynıdır: arka plan
+        (x, taban-h-5)-(x+genişlik, taban+5), taban çizgisi kutunun 10 px üstü.
+        """
+        color = tuple(color)
+        sprites = [self.cache.get(("label", part, color, text_color),
+                                  lambda part=part: self._label_part(part, color, text_color))
+                   for part in parts]
+        label_y = y - 10 if y - 10 > 10 else y + 30
+        top = label_y - (sprites[0].shape[0] - 11) - 5
+        last = len(sprites) - 1
+        for i, sprite in enumerate(sprites):
+            # Son parça hariç, sonraki parçanın başladığı sütuna kadar kopyalanır
+            advance = sprite.shape[1] - 1 - self.overlap
+            blit(frame, sprite if i == last else sprite[:, :advance], x, top)
+            x += advance
+
+    def draw_box(self, frame, box, color, parts):
+        """Kutu çerçevesi ve etiketi"""
+        x1, y1, x2, y2 = box
+        cv2.rectangle(frame, (x1, y1), (x2, y2), color, 2)
+        self.draw_label(frame, parts, x1, y1, color)
+
+    def _timestamp(self, text, color):
+        (width, height), _ = cv2.getTextSize(text, FONT, self.timestamp_scale, self.timestamp_thickness)
+        sprite = np.zeros((height + 11, width + 11, 3), np.uint8)  # (5, 5)-(w+15, h+15) siyah alan
+        cv2.putText(sprite, text, (5, 25), FONT, self.timestamp_scale, color, self.timestamp_thickness)
+        return sprite
+
+    def draw_timestamp(self, frame, text, color=(255, 255, 255)):
+        """Sol üst köşeye siyah arka planlı tarih damgası (eski add_timestamp yerleşimi)"""
+        sprite = self.cache.get(("timestamp", text, color), lambda: self._timestamp(text, color))
+        blit(frame, sprite, 5, 5)
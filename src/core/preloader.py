@@ -0,0 +1,54 @@
+"""
+src/core/preloader.py
+Ağır modülleri (torch, ultralytics) pencere açıldıktan sonra arka planda yükleyen thread
+"""
+
+import importlib
+import logging
+import time
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from ..utils.metrics import get_metrics
+
+# (modül, kullanıcıya gösterilecek isim) — sırayla yüklenir
+HEAVY_MODULES = [
+    ("torch", "PyTorch"),
+    ("ultralytics", "Ultralytics"),
+    ("ultralytics.trackers", "ByteTrack"),
+]
+
+
+class ModulePreloader(QThread):
+    """HEAVY_MODULES listesini import eder ve ilerlemeyi bildirir"""
+    
+    progress = pyqtSignal(int, str)  # (yüzde, yüklenen modül)
+    loaded = pyqtSignal(bool, str)  # (başarılı mı, hata mesajı)
+    
+    def __init__(self, modules=None):
+        super().__init__()
+        self.modules = list(modules or HEAVY_MODULES)
+        self.logger = logging.getLogger("CivataDetection.preload")
+        self.metrics = get_metrics()
+        self.durations = {}
+        
+    def run(self):
+        total = len(self.modules)
+        for i, (module, label) in enumerate(self.modules):
+            self.progress.emit(int(100 * i / total), label)
+            started = time.perf_counter()
+            try:
+                importlib.import_module(module)
+            except Exception as e:
+                self.logger.error(f"{label} yüklenemedi: {e}")
+                self.loaded.emit(False, f"{label} yüklenemedi: {e}")
+                return
+                
+            elapsed = time.perf_counter() - started
+            self.durations[module] = elapsed
+            self.metrics.set_gauge("civata_startup_import_seconds", elapsed,
+                                   "Arka planda modül import süresi", module=module)
+            self.logger.info(f"{label} yüklendi ({elapsed:.2f} s)")
+            
+        self.progress.emit(100, "Hazır")
+        self.loaded.emit(True, "")
@@ -0,0 +1,57 @@
+"""
+src/core/preview.py
+GUI için görüntü alanı boyutunda önizleme frame'leri
+
+Tam çözünürlüklü frame yalnızca kayıt ve kırpma için kullanılır; GUI'ye
+her kaynağın görüntü alanı boyutuna INTER_AREA ile küçültülmüş bir kopya
+gider. Böylece thread'ler arası taşınan bayt ve GUI thread'indeki
+ölçekleme maliyeti, ızgarada çok kaynak varken de düşük kalır. Önizleme
+en-boy oranı korunarak görüntü alanına sığdırılır (VideoWidget de aynı
+`fit_size` ile gösterir). Görüntü alanı frame'den büyükse frame olduğu
+gibi gönderilir (büyütmeyi VideoWidget yapar).
+"""
+
+import cv2
+
+
+class PreviewSizes:
+    """Kaynak başına görüntü alanı boyutu (GUI thread'i yazar, tespit thread'i okur)"""
+
+    def __init__(self):
+        self.sizes = {}
+
+    def set(self, source_id, width, height):
+        """Görüntü alanı boyutunu (fiziksel piksel) güncelle; 0 önizlemeyi kapatır"""
+        if width > 0 and height > 0:
+            self.sizes[source_id] = (int(width), int(height))
+        else:
+            self.sizes.pop(source_id, None)
+
+    def get(self, source_id):
+        return self.sizes.get(source_id)
+
+
+def fit_size(size, target):
+    """(w, h) boyutunun en-boy oranı korunarak target (w, h) içine sığdırılmış hali"""
+    w, h = size
+    scale = min(target[0] / w, target[1] / h)
+    return max(1, round(w * scale)), max(1, round(h * scale))
+
+
+def preview_size(frame, target):
+    """Önizleme boyutu (w, h); küçültme gerekmiyorsa None"""
+    if target is None:
+        return None
+    h, w = frame.shape[:2]
+    size = fit_size((w, h), target)
+    return size if size[0] < w or size[1] < h else None
+
+
+def make_preview(frame, target, pool=None):
+    """Frame'in görüntü alanına küçültülmüş kopyası (havuz varsa kiralanmış tamponda); gerekmiyorsa None"""
+    size = preview_size(frame, target)
+    if size is None:
+        return None
+    if pool is not None:
+        return pool.resize(frame, size)
+    return cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
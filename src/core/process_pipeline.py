@@ -0,0 +1,659 @@
+"""
+src/core/process_pipeline.py
+Çok süreçli çalışma modu: kaynak başına yakalama ve çıkarım süreçleri
+
+Her kaynak için ayrı bir yakalama ve bir çıkarım süreci başlatılır; GIL
+tüm işi tek çekirdeğe bağlamaz ve kaynak eklendikçe iş çekirdeklere
+dağılır. Frame'ler süreçler arasında pickle edilmeden
+multiprocessing.shared_memory halka tamponlarında taşınır; kuyruklardan
+yalnızca slot indeksi ve küçük meta veriler geçer. GUI tarafındaki
+ProcessDetectionRunner sonuçları okur, çöken süreçleri yeniden başlatır
+ve DetectionThread ile aynı sinyalleri yayar.
+"""
+
+import logging
+import logging.handlers
+import multiprocessing
+import os
+import queue
+import signal
+import sys
+import time
+from collections import defaultdict
+from multiprocessing import shared_memory
+
+import cv2
+import numpy as np
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from ..utils.metrics import get_metrics, RateMeter
+from ..utils.storage_manager import get_storage_manager, storage_usage, track_file
+from .stats_aggregator import StatsAggregator
+from .detections import class_counts
+from .frame_pool import FramePool, release
+from .preview import PreviewSizes, make_preview
+from .raw_capture import is_rawcap_source
+from .sampling import SampledCapture
+from .scheduler import MISS_RETRY_INTERVAL, MISS_RETRY_MAX
+from .source_archive import get_source_archiver
+from .stream_source import is_stream_source
+
+# Çöken süreç kontrol aralığı (saniye)
+SUPERVISE_INTERVAL = 0.5
+
+
+class SharedFrameRing:
+    """
+    shared_memory üzerinde sabit sayıda frame slotu.
+
+    Slotlar en büyük frame boyutuna göre ayrılır; daha küçük frame'ler
+    slotun sol üst köşesine yazılır, gerçek boyut kuyruk mesajıyla taşınır.
+    """
+
+    def __init__(self, slots, height, width, name=None):
+        self.shape = (slots, height, width, 3)
+        size = slots * height * width * 3
+        self.owner = name is None
+        self.shm = shared_memory.SharedMemory(name=name, create=self.owner, size=size)
+        self.frames = np.ndarray(self.shape, dtype=np.uint8, buffer=self.shm.buf)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def write(self, slot, frame):
+        """Frame'i slota kopyala (sığmazsa en-boy oranıyla küçült); (h, w) döndür"""
+        _, max_h, max_w, _ = self.shape
+        h, w = frame.shape[:2]
+        if h > max_h or w > max_w:
+            scale = min(max_h / h, max_w / w)
+            w, h = max(1, int(w * scale)), max(1, int(h * scale))
+            frame = cv2.resize(frame, (w, h), interpolation=cv2.INTER_AREA)
+        self.frames[slot, :h, :w] = frame
+        return h, w
+
+    def view(self, slot, h, w):
+        """Slottaki frame (kopya değil)"""
+        return self.frames[slot, :h, :w]
+
+    def close(self):
+        self.frames = None
+        self.shm.close()
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def _setup_worker(results):
+    """Alt süreç logları ve sinyalleri"""
+    # Ctrl+C tüm süreç grubuna gider; durdurmayı ana süreç yönetir.
+    # SIGTERM temiz çıkış sayılır (çıkış kodu 0), yeniden başlatılmaz.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    # Loglar sonuç kuyruğu üzerinden ana sürece gönderilir
+    logger = logging.getLogger("CivataDetection")
+    logger.handlers.clear()
+    logger.addHandler(logging.handlers.QueueHandler(results))
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+def _get_slot(free_slots, stop_event, block):
+    """Boş slot al; block=False ise kısa beklemeden sonra None"""
+    while not stop_event.is_set():
+        try:
+            return free_slots.get(timeout=0.5)
+        except queue.Empty:
+            if not block:
+                return None
+    return None
+
+
+def capture_worker(source_id, source, config, ring_name, ring_shape, free_slots, frames, results,
+                   stop_event, resume_event, start_frame=0):
+    """Kaynaktan frame oku ve paylaşımlı halka tampona yaz (ayrı süreç)"""
+    from .detection_thread import DetectionThread
+
+    _setup_worker(results)
+    # Kaynak açma kodu thread moduyla aynı; QThread başlatılmaz
+    helper = DetectionThread(config)
+    cap, name = helper.open_source(source_id, source, archive=False)
+    if not cap.isOpened():
+        results.put(("fatal", source_id, f"Kaynak {source_id} açılamadı: {name}"))
+        return
+
+    is_file = source_id in helper.file_sources
+    is_stream = source_id in helper.stream_sources
+    if isinstance(cap, SampledCapture) and cap.adaptive:
+        # Hasar çıkarım sürecinde bulunur; yakalama süreci birkaç frame önde olduğundan geri dönülemez
+        helper.log(f"Kaynak {source_id}: adaptif örnekleme çok süreçli modda desteklenmiyor, "
+                   f"sabit adımla (her {cap.stride}. frame) örnekleniyor", source_id, logging.WARNING)
+    # Kayıtlar kaynağın kendi FPS'iyle yazılır (thread modundaki gibi); çıkarım sürecine frame'lerle gider
+    source_fps = cap.get(cv2.CAP_PROP_FPS)
+    if is_file and start_frame:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+
+    raw_writer = None
+    if not is_file and config.raw_capture_enabled:
+        helper.init_raw_writer(source_id, cap)
+        raw_writer = helper.raw_writers[-1]
+
+    ring = SharedFrameRing(*ring_shape, name=ring_name)
+    # Dosyalar hedef FPS'te (maksimum hız modunda beklemeden) oynatılır; canlı kaynaklar kendi hızında gelir
+    fps = config.get_source_fps(source_id)
+    interval = 1.0 / fps if is_file and fps > 0 and not config.file_max_throughput else 0.0
+    next_due = time.monotonic()
+    position = start_frame
+    read_failures = 0
+
+    try:
+        while not stop_event.is_set():
+            if not resume_event.is_set():
+                resume_event.wait(0.1)
+                next_due = time.monotonic()
+                continue
+
+            if interval:
+                wait = next_due - time.monotonic()
+                if wait > 0:
+                    time.sleep(wait)
+                next_due = max(next_due + interval, time.monotonic() - interval)
+
+            ret, frame = cap.read()
+            if not ret:
+                if is_file and config.loop_video_files:
+                    cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                    position = 0
+                    continue
+                if is_file:
+                    frames.put(None)
+                    results.put(("eof", source_id))
+                    break
+                # Kamera/akış geçici olarak frame vermedi; çıkarılmış USB kamerada süreç boşa dönmesin
+                read_failures += 1
+                if not is_stream and read_failures % 100 == 1:
+                    helper.log(f"Kaynak {source_id} frame alınamadı ({read_failures} kez)", source_id,
+                               logging.WARNING)
+                stop_event.wait(min(MISS_RETRY_INTERVAL * 2 ** min(read_failures - 1, 16), MISS_RETRY_MAX))
+                continue
+            read_failures = 0
+            position += 1
+
+            if raw_writer is not None:
+                raw_writer.write(frame)
+
+            # Dosyada frame atlanmaz; canlı kaynakta çıkarım yetişemezse frame atılır
+            slot = _get_slot(free_slots, stop_event, block=is_file)
+            if slot is None:
+                continue
+            h, w = ring.write(slot, frame)
+            frames.put((slot, h, w, position, time.time(), source_fps))
+    finally:
+        cap.release()
+        if raw_writer is not None:
+            raw_writer.close()
+        ring.close()
+        if stop_event.is_set():
+            frames.cancel_join_thread()
+            results.cancel_join_thread()
+
+
+def inference_worker(source_id, config, in_ring_name, out_ring_name, ring_shape, in_free, frames,
+                     out_free, results, stop_event, is_live, torch_threads=0):
+    """Halka tampondaki frame'lerde tespit yap, ham frame'i ve tespitleri GUI'ye gönder (ayrı süreç)"""
+    from .detection_thread import DetectionThread
+
+    _setup_worker(results)
+    if torch_threads:
+        import torch
+        torch.set_num_threads(torch_threads)
+
+    # Tespit, çizim ve kırpma kodu thread moduyla aynı; QThread başlatılmaz
+    processor = DetectionThread(config)
+    if not processor.load_model():
+        results.put(("fatal", source_id, f"Model yüklenemedi: {config.model_path}"))
+        return
+    # İstatistikler ana süreçte, gönderilen tespit kayıtlarından toplanır
+    processor.stats = None
+
+    writer = None
+    recorder = None
+    if is_live:
+        processor.source_dir = f"src/source/{time.strftime('%d%m%Y')}"
+        os.makedirs(processor.source_dir, exist_ok=True)
+
+    in_ring = SharedFrameRing(*ring_shape, name=in_ring_name)
+    out_ring = SharedFrameRing(*ring_shape, name=out_ring_name)
+    try:
+        while not stop_event.is_set():
+            try:
+                message = frames.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            if message is None:
+                break
+
+            # Canlı kaynakta yalnızca en yeni frame işlenir, bekleyenler atılır
+            dropped = 0
+            while is_live:
+                try:
+                    newer = frames.get_nowait()
+                except queue.Empty:
+                    break
+                in_free.put(message[0])
+                message = newer
+                dropped += 1
+
+            slot, h, w, position, captured, source_fps = message
+            started = time.perf_counter()
+            saved_before = set(processor.tracked_objects[source_id])
+            frame = in_ring.view(slot, h, w)
+            detections = processor.process_frame(frame, source_id)
+            cost = time.perf_counter() - started
+
+            if is_live:
+                recorded = processor.render_recording(frame, detections, source_id)
+                if config.recording_mode == "event":
+                    if recorder is None:
+                        recorder = processor.create_event_recorder(source_id, source_fps)
+                    recorder.add(recorded, event=processor.damage_in_frame[source_id])
+                else:
+                    if writer is None:
+                        writer = processor.create_segment_writer(source_id, int(source_fps) or 30, w, h)
+                    if writer is not None:
+                        writer.write(recorded)
+                release(recorded)
+
+            saved = [(track_id, info['filepath'])
+                     for track_id, info in processor.tracked_objects[source_id].items()
+                     if track_id not in saved_before]
+
+            # GUI yetişemiyorsa görüntü atlanır, istatistikler yine gönderilir;
+            # kutular GUI'de çizilir, halka tampona ham frame yazılır
+            out_slot = _get_slot(out_free, stop_event, block=False)
+            out_h = out_w = 0
+            if out_slot is not None:
+                out_h, out_w = out_ring.write(out_slot, frame)
+            in_free.put(slot)
+
+            # Kuyruk nesneyi arka planda pickle eder; kayıt tamponu sonraki frame'de değişeceği için kopyalanır
+            results.put(("frame", source_id, out_slot, out_h, out_w, detections.copy(), saved,
+                         position, dropped, cost, time.time() - captured))
+    finally:
+        if writer is not None:
+            writer.release()
+        if recorder is not None:
+            recorder.close()
+        in_ring.close()
+        out_ring.close()
+        if stop_event.is_set():
+            results.cancel_join_thread()
+
+
+class SourceWorkers:
+    """Bir kaynağın halka tamponları, kuyrukları ve süreçleri"""
+
+    def __init__(self, source_id, source, ring_shape, pool_max_free=8):
+        self.source_id = source_id
+        self.source = source
+        self.is_live = isinstance(source, int) or is_stream_source(source)
+        self.in_ring = SharedFrameRing(*ring_shape)
+        self.out_ring = SharedFrameRing(*ring_shape)
+        self.frame_pool = FramePool(f"gui{source_id}", pool_max_free)  # GUI'ye giden kopyalar
+        self.capture = None
+        self.inference = None
+        self.queues = None
+        self.position = 0  # Son işlenen frame (dosyada yeniden başlatma buradan devam eder)
+        self.restarts = 0
+        self.finished = False
+        self.eof = False
+        self.meter = RateMeter()
+        self.busy_time = 0.0
+        self.served = 0
+
+    def processes(self):
+        return [p for p in (self.capture, self.inference) if p is not None]
+
+    def close(self):
+        self.in_ring.close()
+        self.out_ring.close()
+
+
+class ProcessDetectionRunner(QThread):
+    """
+    Çok süreçli tespit; DetectionThread ile aynı sinyal ve kontrol arayüzü.
+
+    QThread yalnızca sonuç kuyruğunu okur ve süreçleri denetler; yakalama,
+    çıkarım, çizim ve kayıt alt süreçlerde yapılır.
+    """
+
+    frame_ready = pyqtSignal(tuple)  # (source_id, önizleme frame'i, tespitler, tam boyut (w, h))
+    detection_stats = pyqtSignal(dict)
+    error_occurred = pyqtSignal(str)
+
+    def __init__(self, config):
+        super().__init__()
+        self.config = config
+        self.ctx = multiprocessing.get_context("spawn")
+        self.is_running = False
+        self.is_paused = False
+        self.workers = []
+        self.results = None
+        self.stop_event = None
+        self.resume_event = None
+        self.stats = None
+        self.preview_sizes = PreviewSizes()  # {source_id: görüntü alanı boyutu} GUI'den
+
+        self.class_names = ["Hasarlı", "Hasarsız"]
+        self.tracked_objects = defaultdict(dict)  # {source_id: {track_id: info}}
+        self.damage_count = 0
+        self.total_detections = 0
+
+        self.logger = logging.getLogger("CivataDetection.workers")
+        self.metrics = get_metrics()
+
+    def log(self, message, source_id=None, level=logging.INFO):
+        self.logger.log(level, message, extra={'source': source_id, 'track_id': None})
+
+    def run(self):
+        """Süreçleri başlat, sonuçları ilet ve çökenleri yeniden başlat"""
+        try:
+            self.is_running = True
+            self.start_workers()
+            last_check = time.monotonic()
+            while self.is_running:
+                self.drain_results(timeout=0.05)
+                if time.monotonic() - last_check >= SUPERVISE_INTERVAL:
+                    self.supervise()
+                    last_check = time.monotonic()
+                    if self.workers and all(w.finished for w in self.workers):
+                        # Tüm kaynaklar (video dosyaları) bitti; kuyrukta kalan sonuçlar işlenir
+                        self.drain_results(timeout=0.05)
+                        self.log("Tüm kaynaklar tamamlandı")
+                        self.is_running = False
+                self.emit_statistics()
+        except Exception as e:
+            self.error_occurred.emit(f"Süreç yönetici hatası: {str(e)}")
+        finally:
+            self.shutdown()
+
+    def torch_threads(self):
+        """Çıkarım süreci başına torch thread sayısı (çekirdekler paylaştırılır)"""
+        if self.config.process_torch_threads:
+            return self.config.process_torch_threads
+        return max(1, (os.cpu_count() or 1) // max(1, self.config.source_count))
+
+    def start_workers(self):
+        self.results = self.ctx.Queue()
+        self.stop_event = self.ctx.Event()
+        self.resume_event = self.ctx.Event()
+        self.resume_event.set()
+        ring_shape = (self.config.process_ring_slots, self.config.process_max_frame_height,
+                      self.config.process_max_frame_width)
+        # Disk kotası ana süreçte; alt süreçlerin kayıtları periyodik taramayla hesaba katılır
+        get_storage_manager(self.config)
+
+        for i in range(self.config.source_count):
+            source = self.config.sources[i]
+            # Arşiv ana süreçte tutulur; alt süreç kapanınca yarıda kalmasın
+            if (isinstance(source, str) and not is_rawcap_source(source) and not is_stream_source(source)
+                    and os.path.exists(source) and self.config.archive_sources):
+                get_source_archiver(self.config).submit(source)
+                self.log(f"Video arşiv kuyruğuna eklendi: {source}", i)
+
+            workers = SourceWorkers(i, source, ring_shape, self.config.frame_pool_max_free)
+            self.workers.append(workers)
+            self.spawn(workers)
+
+        self.stats = StatsAggregator(
+            len(self.workers),
+            num_classes=len(self.class_names),
+            emit_hz=self.config.stats_emit_hz,
+            window_seconds=self.config.stats_window_seconds,
+            damaged_class=self.class_names.index("Hasarlı")
+        )
+        self.log(f"{len(self.workers)} kaynak için {2 * len(self.workers)} süreç başlatıldı "
+                 f"(çıkarım süreci başına {self.torch_threads()} thread)")
+
+    def spawn(self, workers):
+        """Kaynağın yakalama ve çıkarım süreçlerini (yeniden) başlat"""
+        in_free, frames, out_free = self.ctx.Queue(), self.ctx.Queue(), self.ctx.Queue()
+        for slot in range(self.config.process_ring_slots):
+            in_free.put(slot)
+            out_free.put(slot)
+        workers.queues = (in_free, frames, out_free)
+        ring_shape = workers.in_ring.shape[:3]
+
+        workers.capture = self.ctx.Process(
+            target=capture_worker, name=f"capture-{workers.source_id}", daemon=True,
+            args=(workers.source_id, workers.source, self.config, workers.in_ring.name, ring_shape,
+                  in_free, frames, self.results, self.stop_event, self.resume_event,
+                  workers.position))
+        workers.inference = self.ctx.Process(
+            target=inference_worker, name=f"inference-{workers.source_id}", daemon=True,
+            args=(workers.source_id, self.config, workers.in_ring.name, workers.out_ring.name,
+                  ring_shape, in_free, frames, out_free, self.results, self.stop_event,
+                  workers.is_live, self.torch_threads()))
+        workers.inference.start()
+        workers.capture.start()
+        for role in ("capture", "inference"):
+            self.metrics.set_gauge("civata_worker_alive", 1, "Çalışan alt süreç",
+                                   source=workers.source_id, role=role)
+
+    def supervise(self):
+        """Beklenmedik şekilde kapanan süreçleri yeniden başlat"""
+        if not self.is_running:
+            return
+        for workers in self.workers:
+            if workers.finished:
+                continue
+            dead = [p for p in workers.processes() if not p.is_alive()]
+            # Çıkış kodu 0: video sonu, SIGTERM veya açılış hatası (hata mesajı ayrıca gelir)
+            crashed = [p for p in dead if p.exitcode != 0]
+            if not crashed:
+                if dead and len(dead) == len(workers.processes()):
+                    workers.finished = True
+                    if workers.eof:
+                        self.log(f"Kaynak {workers.source_id} video sonuna ulaştı", workers.source_id)
+                continue
+
+            for process in crashed:
+                role = process.name.split("-")[0]
+                self.metrics.inc("civata_worker_restarts_total", 1, "Yeniden başlatılan alt süreçler",
+                                 source=workers.source_id, role=role)
+                self.log(f"Kaynak {workers.source_id} {role} süreci çöktü "
+                         f"(çıkış kodu {process.exitcode})", workers.source_id, logging.WARNING)
+
+            self.terminate(workers)
+            workers.restarts += 1
+            if workers.restarts > self.config.process_max_restarts:
+                workers.finished = True
+                self.error_occurred.emit(f"Kaynak {workers.source_id} süreçleri "
+                                         f"{self.config.process_max_restarts} kez yeniden başlatıldı, durduruldu")
+                continue
+            self.log(f"Kaynak {workers.source_id} süreçleri yeniden başlatılıyor "
+                     f"({workers.restarts}. deneme, frame {workers.position})", workers.source_id,
+                     logging.WARNING)
+            self.spawn(workers)
+
+    def terminate(self, workers):
+        """Kaynağın süreçlerini durdur; kuyrukları bir daha kullanılmaz"""
+        for process in workers.processes():
+            if process.is_alive():
+                process.terminate()
+        deadline = time.monotonic() + 2.0
+        for process in workers.processes():
+            # Çıkarken sonuç kuyruğuna yazanlar bloklanmasın diye okumaya devam edilir
+            while process.is_alive() and time.monotonic() < deadline:
+                self.drain_results(timeout=0.05)
+                process.join(timeout=0.05)
+            if process.is_alive():
+                process.kill()
+                process.join()
+        for q in workers.queues or ():
+            q.cancel_join_thread()
+            q.close()
+        for role in ("capture", "inference"):
+            self.metrics.set_gauge("civata_worker_alive", 0, "Çalışan alt süreç",
+                                   source=workers.source_id, role=role)
+
+    def drain_results(self, timeout):
+        """Sonuç kuyruğundaki tüm mesajları işle"""
+        try:
+            message = self.results.get(timeout=timeout)
+        except queue.Empty:
+            return
+        while True:
+            self.handle_message(message)
+            try:
+                message = self.results.get_nowait()
+            except queue.Empty:
+                return
+
+    def handle_message(self, message):
+        if isinstance(message, logging.LogRecord):
+            logging.getLogger(message.name).handle(message)
+            return
+
+        kind, source_id = message[0], message[1]
+        workers = self.workers[source_id]
+        if kind == "frame" and self.is_running:
+            self.on_frame(workers, *message[2:])
+        elif kind == "eof":
+            workers.eof = True
+        elif kind == "fatal":
+            # Kaynak/model açılamadı; thread modundaki gibi tespit durdurulur
+            self.error_occurred.emit(message[2])
+            self.is_running = False
+
+    def on_frame(self, workers, out_slot, h, w, detections, saved, position, dropped, cost, latency):
+        source_id = workers.source_id
+        workers.position = position
+        workers.busy_time += cost
+        workers.served += 1
+
+        if dropped:
+            self.metrics.inc("civata_dropped_frames_total", dropped, "Okunamayan/atlanan frame sayısı",
+                             source=source_id, reason="stale")
+        self.metrics.inc("civata_frames_processed_total", 1, "İşlenen frame sayısı", source=source_id)
+        self.metrics.set_gauge("civata_inference_fps", workers.meter.tick(),
+                               "Kaynak başına işleme FPS", source=source_id)
+        self.metrics.observe("civata_stage_latency_seconds", cost, "Pipeline aşama gecikmeleri",
+                             stage="inference", source=source_id)
+        self.metrics.observe("civata_worker_latency_seconds", latency,
+                             "Yakalamadan sonucun ana sürece ulaşmasına kadar geçen süre", source=source_id)
+
+        # İstatistikler (çıkarım sürecinden gelen tespit kayıtlarından)
+        classes = detections['cls']
+        self.stats.add_frame(source_id, classes)
+        if len(classes):
+            self.total_detections += len(classes)
+            for class_id, count in enumerate(class_counts(detections, self.stats.num_classes)):
+                self.metrics.inc("civata_detections_total", int(count),
+                                 "Sınıf bazında toplam tespit sayısı", class_id=class_id)
+            self.metrics.set_gauge("civata_total_detections", self.total_detections,
+                                   "DetectionThread.total_detections değeri")
+        for track_id, filepath in saved:
+            self.tracked_objects[source_id][track_id] = {'filepath': filepath}
+            track_file("crops", filepath)
+            self.damage_count += 1
+            self.stats.add_saved(source_id)
+            self.metrics.inc("civata_damaged_saved_total", 1, "Kaydedilen hasarlı cıvata sayısı",
+                             source=source_id)
+            self.metrics.set_gauge("civata_damage_count", self.damage_count,
+                                   "DetectionThread.damage_count değeri")
+
+        if out_slot is None:
+            return
+        # Slot hemen geri verilir; GUI havuzdan kiralanan kopyayı (ya da doğrudan halkadan
+        # küçültülmüş önizlemeyi) gösterip bırakır
+        view = workers.out_ring.view(out_slot, h, w)
+        pool = workers.frame_pool if self.config.frame_pool_enabled else None
+        frame = None
+        if self.config.display_preview_downscale:
+            frame = make_preview(view, self.preview_sizes.get(source_id), pool)
+        if frame is None:
+            frame = pool.copy(view) if pool is not None else view.copy()
+        workers.queues[2].put(out_slot)
+        self.metrics.add_gauge("civata_queue_depth", 1, "Bekleyen öğe sayısı",
+                               queue="ui_frames", source=source_id)
+        self.frame_ready.emit((source_id, frame, detections, (w, h)))
+
+    def set_preview_size(self, source_id, width, height):
+        """Kaynağın GUI görüntü alanı boyutu (GUI thread'inden, yeniden boyutlandırmada çağrılır)"""
+        self.preview_sizes.set(source_id, width, height)
+
+    def emit_statistics(self):
+        """Emit aralığı dolduysa istatistik özetini UI'ye gönder"""
+        if self.stats is None:
+            return
+        snapshot = self.stats.maybe_snapshot({'model_conf': self.config.confidence_threshold})
+        if snapshot is None:
+            return
+
+        # DetectionThread'deki zamanlayıcı raporuyla aynı biçim (pay: çıkarım süresi oranı)
+        total_busy = sum(w.busy_time for w in self.workers) or 1.0
+        active = [w for w in self.workers if not w.finished]
+        snapshot['scheduler'] = [
+            {
+                'source': w.source_id,
+                'weight': self.config.get_source_priority(w.source_id),
+                'target_fps': self.config.get_source_fps(w.source_id),
+                'achieved_fps': w.meter.rate,
+                'share': w.busy_time / total_busy,
+                'fair_share': (1.0 / len(active)) if w in active else 0.0,
+                'served': w.served,
+            }
+            for w in self.workers
+        ]
+        snapshot['storage'] = storage_usage()
+        now = time.monotonic()
+        snapshot['frame_pools'] = [w.frame_pool.report(now) for w in self.workers]
+        self.detection_stats.emit(snapshot)
+
+    def stop(self):
+        """Tespiti durdur"""
+        self.is_running = False
+        self.is_paused = False
+
+    def toggle_pause(self):
+        """Pause/Resume (yakalama süreçleri bekletilir)"""
+        self.is_paused = not self.is_paused
+        if self.resume_event is not None:
+            if self.is_paused:
+                self.resume_event.clear()
+            else:
+                self.resume_event.set()
+
+    def shutdown(self):
+        """Süreçleri durdur, paylaşımlı belleği serbest bırak"""
+        if self.stop_event is not None:
+            self.stop_event.set()
+            self.resume_event.set()
+
+        deadline = time.monotonic() + 5.0
+        for workers in self.workers:
+            # Önce stop_event ile kendiliğinden kapanmaları beklenir
+            for process in workers.processes():
+                while process.is_alive() and time.monotonic() < deadline:
+                    self.drain_results(timeout=0.05)
+                    process.join(timeout=0.05)
+            self.terminate(workers)
+            workers.close()
+
+        if self.results is not None:
+            self.results.cancel_join_thread()
+            self.results.close()
+        self.workers = []
+        self.log("Süreçler durduruldu, kaynaklar temizlendi")
+
+
+def create_detection_runner(config):
+    """execution_mode ayarına göre tespit çalıştırıcısını oluştur"""
+    if config.execution_mode == "process":
+        return ProcessDetectionRunner(config)
+    from .detection_thread import DetectionThread
+    return DetectionThread(config)
@@ -0,0 +1,78 @@
+"""
+src/core/progress.py
+Video dosyası kaynakları için ilerleme, işleme hızı ve kalan süre (ETA) takibi
+"""
+
+import time
+
+
+def format_duration(seconds):
+    """Saniyeyi SS:DD:ss biçimine çevir (bilinmiyorsa "--:--")"""
+    if seconds is None:
+        return "--:--"
+    seconds = int(round(seconds))
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    return f"{hours:d}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes:02d}:{seconds:02d}"
+
+
+class FileProgress:
+    """
+    Bir video dosyasının işlenme ilerlemesi.
+
+    Hız, kısa dalgalanmalardan etkilenmemesi için son `window` saniyedeki
+    konum değişiminden; ETA kalan frame / bu hızdan hesaplanır.
+    """
+
+    def __init__(self, total_frames, window=5.0):
+        self.total = max(0, int(total_frames))
+        self.window = window
+        self.position = 0
+        self.started = time.monotonic()
+        self.finished = None
+        self.start_position = None
+        self.samples = []  # [(zaman, konum)]
+
+    def update(self, position, now=None):
+        """İşlenen son frame'in konumunu kaydet"""
+        now = time.monotonic() if now is None else now
+        if self.start_position is None or position < self.position:
+            # İlk frame veya başa sarma (döngü): hız ölçümü yeniden başlar
+            self.start_position = position
+            self.samples = []
+        self.position = position
+        self.samples.append((now, position))
+        while len(self.samples) > 2 and now - self.samples[1][0] >= self.window:
+            self.samples.pop(0)
+
+    def finish(self, now=None):
+        self.finished = time.monotonic() if now is None else now
+
+    @property
+    def fps(self):
+        if len(self.samples) < 2:
+            return 0.0
+        (t0, p0), (t1, p1) = self.samples[0], self.samples[-1]
+        return (p1 - p0) / (t1 - t0) if t1 > t0 else 0.0
+
+    @property
+    def elapsed(self):
+        return (self.finished or time.monotonic()) - self.started
+
+    def report(self):
+        """İlerleme özeti (toplam bilinmiyorsa yüzde ve ETA None)"""
+        fps = self.fps
+        percent = eta = None
+        if self.total:
+            percent = min(100.0, 100.0 * self.position / self.total)
+            remaining = max(0, self.total - self.position)
+            eta = 0.0 if self.finished else (remaining / fps if fps > 0 else None)
+        return {
+            'position': self.position,
+            'total': self.total,
+            'percent': percent,
+            'fps': fps,
+            'eta': eta,
+            'elapsed': self.elapsed,
+            'finished': self.finished is not None,
+        }
@@ -0,0 +1,354 @@
+"""
+src/core/raw_capture.py
+Ham frame kayıt (capture) ve tekrar oynatma (replay) formatı
+
+Bir kayıt `<isim>.rawcap/` klasörüdür:
+    meta.json          -> çözünürlük, sıkıştırma, kaynak bilgisi
+    chunk_00000.bin    -> arka arkaya frame verisi (ham veya zlib)
+    chunk_00000.idx    -> frame başına (offset, size, timestamp) kaydı
+
+Ham (sıkıştırmasız) chunk'lar doğrudan np.memmap ile okunur; decode
+gerekmez. İndeks her frame'de diske eklendiğinden çökme durumunda
+yalnızca son yazılmamış frame'ler kaybolur.
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+import zlib
+from datetime import datetime
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from ..utils.storage_manager import disk_low, track_file, watch_file
+from .frame_pool import is_pooled, retain, release
+
+RAWCAP_EXTENSION = ".rawcap"
+FORMAT_VERSION = 1
+
+# Frame başına indeks kaydı
+INDEX_DTYPE = np.dtype([('offset', '<u8'), ('size', '<u8'), ('timestamp', '<f8')])
+
+
+def is_rawcap_source(source):
+    """Kaynak bir rawcap kaydı mı"""
+    return isinstance(source, str) and source.rstrip("/\\").lower().endswith(RAWCAP_EXTENSION)
+
+
+class RawCaptureWriter:
+    """
+    Frame'leri arka plan thread'inde chunk dosyalarına yazar.
+
+    write() varsayılan olarak bloklamaz; kuyruk doluysa frame atlanır
+    ve `dropped` sayacı artar.
+    """
+
+    def __init__(self, path, width, height, channels=3, compression="none", chunk_frames=300,
+                 max_queue=120, source_info=None):
+        self.path = Path(path)
+        self.width = width
+        self.height = height
+        self.channels = channels
+        self.compression = compression
+        self.chunk_frames = max(1, chunk_frames)
+        self.source_info = source_info
+
+        self.frame_bytes = width * height * channels
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.written = 0
+        self.dropped = 0
+        self.error = None
+
+        self._chunk_index = -1
+        self._chunk_count = 0
+        self._chunk_offset = 0
+        self._data_file = None
+        self._index_file = None
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._write_meta()
+        watch_file("raw", self.path)
+
+        self.thread = threading.Thread(target=self._run, name=f"rawcap-{self.path.name}", daemon=True)
+        self.thread.start()
+
+    def _write_meta(self):
+        meta = {
+            'format_version': FORMAT_VERSION,
+            'width': self.width,
+            'height': self.height,
+            'channels': self.channels,
+            'dtype': 'uint8',
+            'compression': self.compression,
+            'chunk_frames': self.chunk_frames,
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'source': self.source_info,
+        }
+        with open(self.path / "meta.json", 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=2, ensure_ascii=False)
+
+    def write(self, frame, timestamp=None, block=False):
+        """Frame'i yazma kuyruğuna ekle (havuz frame'i tutulur, diğerleri kopyalanır); block=False ve kuyruk doluysa atla"""
+        if frame is None or frame.shape != (self.height, self.width, self.channels) or disk_low():
+            self.dropped += 1
+            return False
+        payload = retain(frame) if is_pooled(frame) else np.ascontiguousarray(frame).copy()
+        try:
+            self.queue.put((payload, time.time() if timestamp is None else timestamp), block=block)
+            return True
+        except queue.Full:
+            release(payload)
+            self.dropped += 1
+            return False
+
+    def _open_chunk(self):
+        self._close_chunk()
+        self._chunk_index += 1
+        name = f"chunk_{self._chunk_index:05d}"
+        self._data_file = open(self.path / f"{name}.bin", 'wb')
+        self._index_file = open(self.path / f"{name}.idx", 'wb')
+        self._chunk_count = 0
+        self._chunk_offset = 0
+
+    def _close_chunk(self):
+        for handle in (self._data_file, self._index_file):
+            if handle is not None:
+                handle.close()
+        self._data_file = None
+        self._index_file = None
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            frame, timestamp = item
+            try:
+                if self._data_file is None or self._chunk_count >= self.chunk_frames:
+                    self._open_chunk()
+
+                payload = frame.reshape(-1).data  # Düz byte görünümü, kopya yok
+                if self.compression == "zlib":
+                    payload = zlib.compress(payload, 1)
+
+                self._data_file.write(payload)
+                record = np.array([(self._chunk_offset, len(payload), timestamp)], dtype=INDEX_DTYPE)
+                self._index_file.write(record.tobytes())
+                # İndeks kaydı veriden sonra diske gitsin (çökmede tutarlılık)
+                self._data_file.flush()
+                self._index_file.flush()
+
+                self._chunk_offset += len(payload)
+                self._chunk_count += 1
+                self.written += 1
+            except Exception as e:
+                self.error = str(e)
+                self.dropped += 1
+            finally:
+                release(frame)
+        self._close_chunk()
+
+    @property
+    def pending(self):
+        return self.queue.qsize()
+
+    def close(self, timeout=10):
+        """Kuyruktaki frame'leri yaz ve dosyaları kapat"""
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join(timeout=timeout)
+            track_file("raw", self.path)
+
+
+class RawCaptureReader:
+    """Rawcap kaydını rastgele erişimli olarak okur"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path / "meta.json", 'r', encoding='utf-8') as f:
+            self.meta = json.load(f)
+
+        self.width = self.meta['width']
+        self.height = self.meta['height']
+        self.channels = self.meta['channels']
+        self.compression = self.meta.get('compression', 'none')
+        self.frame_shape = (self.height, self.width, self.channels)
+
+        # Chunk'ları sırayla indeksle: (data memmap, index dizisi)
+        self.chunks = []
+        self.frame_map = []  # global frame -> (chunk, yerel indeks)
+        for index_path in sorted(self.path.glob("chunk_*.idx")):
+            index = np.fromfile(index_path, dtype=INDEX_DTYPE)
+            data_path = index_path.with_suffix(".bin")
+            if len(index) == 0 or not data_path.exists():
+                continue
+            # Yarım yazılmış son kaydı at
+            data_size = data_path.stat().st_size
+            index = index[index['offset'] + index['size'] <= data_size]
+            if len(index) == 0:
+                continue
+            data = np.memmap(data_path, dtype=np.uint8, mode='r')
+            chunk_id = len(self.chunks)
+            self.chunks.append((data, index))
+            self.frame_map.extend((chunk_id, i) for i in range(len(index)))
+
+        self.timestamps = (np.concatenate([index['timestamp'] for _, index in self.chunks])
+                           if self.chunks else np.zeros(0))
+
+    def __len__(self):
+        return len(self.frame_map)
+
+    def frame(self, i, copy=True):
+        """i. frame'i döndür (ham kayıtta copy=False ise salt okunur memmap görünümü)"""
+        chunk_id, local = self.frame_map[i]
+        data, index = self.chunks[chunk_id]
+        offset, size = int(index['offset'][local]), int(index['size'][local])
+        payload = data[offset:offset + size]
+
+        if self.compression == "zlib":
+            # bytearray: dönen frame yazılabilir olsun (üzerine çizim yapılabilir)
+            return np.frombuffer(bytearray(zlib.decompress(payload)), dtype=np.uint8).reshape(self.frame_shape)
+
+        view = payload.reshape(self.frame_shape)
+        return np.array(view) if copy else view
+
+    @property
+    def fps(self):
+        """Kayıttaki ortalama frame hızı"""
+        if len(self.timestamps) < 2:
+            return 30.0
+        duration = self.timestamps[-1] - self.timestamps[0]
+        return (len(self.timestamps) - 1) / duration if duration > 0 else 30.0
+
+
+class ReplayCapture:
+    """
+    Rawcap kaydını cv2.VideoCapture arayüzüyle sunar.
+
+    realtime=True ise frame'ler kayıttaki zaman aralıklarıyla verilir,
+    False ise olabildiğince hızlı.
+    """
+
+    def __init__(self, path, realtime=True):
+        self.reader = RawCaptureReader(path)
+        self.realtime = realtime
+        self.position = 0
+        self.replay_start = None
+        self._opened = len(self.reader) > 0
+
+    def isOpened(self):
+        return self._opened
+
+    def grab(self):
+        if not self._opened or self.position >= len(self.reader):
+            return False
+        self._wait_for_frame(self.position)
+        self.position += 1
+        return True
+
+    def retrieve(self, image=None, flag=None):
+        if self.position == 0:
+            return False, None
+        frame = self.reader.frame(self.position - 1)
+        if image is not None and image.shape == frame.shape:
+            np.copyto(image, frame)
+            frame = image
+        return True, frame
+
+    def read(self, image=None):
+        if not self.grab():
+            return False, None
+        return self.retrieve(image)
+
+    def _wait_for_frame(self, i):
+        """Gerçek zamanlı modda orijinal zamanlamayı bekle"""
+        if not self.realtime:
+            return
+        now = time.monotonic()
+        if self.replay_start is None or i == 0:
+            self.replay_start = now - (self.reader.timestamps[i] - self.reader.timestamps[0])
+            return
+        target = self.replay_start + (self.reader.timestamps[i] - self.reader.timestamps[0])
+        delay = target - now
+        if delay > 0:
+            time.sleep(delay)
+
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.reader.width)
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.reader.height)
+        if prop == cv2.CAP_PROP_FPS:
+            return float(self.reader.fps)
+        if prop == cv2.CAP_PROP_FRAME_COUNT:
+            return float(len(self.reader))
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            return float(self.position)
+        if prop == cv2.CAP_PROP_POS_MSEC and len(self.reader) and self.position:
+            return float((self.reader.timestamps[self.position - 1] - self.reader.timestamps[0]) * 1000)
+        return 0.0
+
+    def set(self, prop, value):
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            self.position = int(max(0, min(value, len(self.reader))))
+            self.replay_start = None
+            return True
+        return False
+
+    def release(self):
+        self._opened = False
+
+
+def new_capture_path(base_dir, name):
+    """Tarih damgalı yeni kayıt klasörü yolu"""
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return os.path.join(base_dir, f"{name}_{timestamp}{RAWCAP_EXTENSION}")
+
+
+def record_source(source, output, max_frames=None, compression="none", chunk_frames=300):
+    """Bir video dosyası veya kameradan rawcap kaydı oluştur (komut satırı için)"""
+    cap = cv2.VideoCapture(source)
+    if not cap.isOpened():
+        raise RuntimeError(f"Kaynak açılamadı: {source}")
+
+    writer = None
+    count = 0
+    is_file = isinstance(source, str)
+    try:
+        while max_frames is None or count < max_frames:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            if writer is None:
+                h, w = frame.shape[:2]
+                writer = RawCaptureWriter(output, w, h, frame.shape[2], compression, chunk_frames,
+                                          source_info=str(source))
+            # Dosyada orijinal zamanlama videonun kendi zaman damgasından gelir
+            timestamp = cap.get(cv2.CAP_PROP_POS_MSEC) / 1000 if is_file else time.time()
+            writer.write(frame, timestamp, block=True)  # Çevrimdışı kayıtta frame atlanmaz
+            count += 1
+    finally:
+        cap.release()
+        if writer is not None:
+            writer.close()
+    return count
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Video/kameradan rawcap kaydı oluştur")
+    parser.add_argument("source", help="Video dosyası veya kamera ID")
+    parser.add_argument("output", help=f"Çıktı klasörü (*{RAWCAP_EXTENSION})")
+    parser.add_argument("--max-frames", type=int)
+    parser.add_argument("--compression", choices=["none", "zlib"], default="none")
+    parser.add_argument("--chunk-frames", type=int, default=300)
+    args = parser.parse_args()
+
+    source = int(args.source) if args.source.isdigit() else args.source
+    frames = record_source(source, args.output, args.max_frames, args.compression, args.chunk_frames)
+    print(f"{frames} frame kaydedildi: {args.output}")
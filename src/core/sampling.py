@@ -0,0 +1,113 @@
+"""
+src/core/sampling.py
+Uzun video taraması için frame örnekleme (her N. frame / zaman aralığı)
+
+Atlanan frame'ler retrieve edilmeden grab() ile geçilir; renk dönüşümü,
+kopya ve YOLO çalışmaz. OpenCV'de grab() sıkıştırılmış frame'i yine decode
+eder, bu yüzden adım `seek_stride` veya üstündeyse konum doğrudan
+CAP_PROP_POS_FRAMES ile ilerletilir ve decoder en yakın anahtar frame'den
+başlar. Rawcap kayıtlarında grab() yalnızca indeksi ilerletir.
+
+Adaptif modda hasar bulunan frame'den sonraki `dense_frames` frame boyunca
+adım 1 olur. Geri sarılmaz: hasarlı frame ikinci kez işlenmez ve takipçi
+(ByteTrack) frame'leri hep ileri giden sırada görür.
+"""
+
+import logging
+
+import cv2
+
+from ..utils.metrics import get_metrics
+
+
+def stride_for(stride, interval, fps):
+    """Zaman aralığı (sn) verildiyse FPS'e göre frame adımına çevir"""
+    if interval and interval > 0 and fps > 0:
+        return max(1, int(round(interval * fps)))
+    return max(1, int(stride))
+
+
+class SampledCapture:
+    """Video dosyasından her `stride`. frame'i okuyan cv2.VideoCapture uyumlu sarmalayıcı"""
+
+    def __init__(self, cap, source_id, stride, seek_stride=0, adaptive=False, dense_frames=0):
+        self.cap = cap
+        self.source_id = source_id
+        self.stride = max(1, int(stride))
+        self.seek_stride = max(0, int(seek_stride))
+        self.adaptive = adaptive
+        self.dense_frames = max(0, int(dense_frames))
+        self.logger = logging.getLogger("CivataDetection.sampling")
+        self.metrics = get_metrics()
+
+        self.position = int(cap.get(cv2.CAP_PROP_POS_FRAMES))
+        self.last_sampled = None  # Son okunan (işlenen) frame'in indeksi
+        self.dense_until = -1  # Bu indekse kadar adım 1 (hasar çevresi)
+        self.skipped = 0
+        self.sampled = 0
+
+    def current_stride(self):
+        return 1 if self.position < self.dense_until else self.stride
+
+    def _skip(self, count):
+        """count frame'i işlemeden geç; kullanılan yöntemi (dosya biterse None) döndür"""
+        if self.seek_stride and count + 1 >= self.seek_stride:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, self.position + count)
+            self.position += count
+            return "seek"
+        for _ in range(count):
+            if not self.cap.grab():
+                return None
+            self.position += 1
+        return "grab"
+
+    def read(self, image=None):
+        if self.last_sampled is not None:
+            skip = self.current_stride() - 1
+            if skip > 0:
+                method = self._skip(skip)
+                if not method:
+                    return False, None
+                self.skipped += skip
+                self.metrics.inc("civata_frames_sampled_out_total", skip,
+                                 "Örnekleme ile işlenmeden geçilen frame'ler",
+                                 source=self.source_id, method=method)
+
+        ret, frame = self.cap.read(image=image) if image is not None else self.cap.read()
+        if not ret:
+            return False, None
+        self.last_sampled = self.position
+        self.position += 1
+        self.sampled += 1
+        return True, frame
+
+    def mark_damage(self):
+        """Son okunan frame'de hasar bulundu: sonraki frame'leri tam hızda işle"""
+        if not self.adaptive or self.last_sampled is None or self.stride == 1:
+            return
+        hit = self.last_sampled
+        previous_dense = self.dense_until
+        self.dense_until = max(previous_dense, hit + 1 + self.dense_frames)
+        if hit < previous_dense:
+            return  # Zaten tam hızda; aralık uzatıldı
+        self.logger.info(f"Kaynak {self.source_id}: {hit}. frame'de hasar, "
+                         f"{hit + 1}-{self.dense_until} aralığı tam hızda işleniyor")
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            return float(self.position)
+        return self.cap.get(prop)
+
+    def set(self, prop, value):
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            # Başa sarma / konum değişimi: örnekleme durumu sıfırlanır
+            self.position = int(value)
+            self.last_sampled = None
+            self.dense_until = -1
+        return self.cap.set(prop, value)
+
+    def release(self):
+        self.cap.release()
@@ -0,0 +1,127 @@
+"""
+src/core/scheduler.py
+Kaynaklar arasında çıkarım kapasitesini ağırlığa göre paylaştıran zamanlayıcı
+"""
+
+import time
+
+from ..utils.metrics import RateMeter
+
+# Frame gelmeyen kaynak (bağlantısı kopan akış, boş yük atma kuyruğu) ilk olarak bu kadar sonra
+# yeniden denenir; art arda her boş denemede bekleme iki katına çıkar (en fazla MISS_RETRY_MAX) (sn)
+MISS_RETRY_INTERVAL = 0.005
+MISS_RETRY_MAX = 0.25
+
+
+class WeightedSourceScheduler:
+    """
+    Ağırlıklı adil zamanlayıcı (weighted fair queuing).
+
+    Her kaynağın bir hedef FPS'i ve önceliği (ağırlık) vardır. Hedef
+    zamanı gelmiş kaynaklar arasından sanal zamanı en küçük olan seçilir;
+    işlem süresi / ağırlık kadar sanal zamanı ilerler. Böylece kapasite
+    yetmediğinde her kaynak eşit yavaşlamaz, ağırlığı oranında pay alır;
+    kapasite yettiğinde her kaynak kendi hedef FPS'iyle sınırlıdır.
+    """
+
+    def __init__(self, weights, target_fps):
+        self.num_sources = len(weights)
+        self.weights = [max(1e-3, float(w)) for w in weights]
+        self.target_fps = [float(f) for f in target_fps]
+        self.intervals = [1.0 / f if f > 0 else 0.0 for f in self.target_fps]
+
+        now = time.monotonic()
+        self.next_due = [now] * self.num_sources
+        self.virtual_time = [0.0] * self.num_sources
+        self.busy_time = [0.0] * self.num_sources
+        self.served = [0] * self.num_sources
+        self.misses = [0] * self.num_sources  # Art arda frame gelmeyen denemeler
+        self.enabled = [True] * self.num_sources
+        self.waiting = [True] * self.num_sources  # Hedef zamanını bekliyor
+        self.meters = [RateMeter() for _ in range(self.num_sources)]
+
+    def next_source(self, now=None):
+        """
+        Sıradaki kaynağı seç.
+
+        Returns:
+            tuple: (kaynak indeksi veya None, None ise beklenecek süre)
+        """
+        now = time.monotonic() if now is None else now
+        due = []
+        earliest = None
+        for i in range(self.num_sources):
+            if not self.enabled[i]:
+                continue
+            if self.next_due[i] <= now:
+                due.append(i)
+            elif earliest is None or self.next_due[i] < earliest:
+                earliest = self.next_due[i]
+
+        if not due:
+            return None, (earliest - now) if earliest is not None else 0.1
+
+        # Hedef FPS'i yüzünden bekleyen kaynak geri geldiğinde biriktirdiği
+        # sanal zaman avantajıyla diğerlerini bastırmasın
+        backlogged = [self.virtual_time[i] for i in due if not self.waiting[i]]
+        floor = min(backlogged) if backlogged else min(self.virtual_time[i] for i in due)
+        for i in due:
+            if self.waiting[i]:
+                self.virtual_time[i] = max(self.virtual_time[i], floor)
+                self.waiting[i] = False
+
+        return min(due, key=lambda i: self.virtual_time[i]), 0.0
+
+    def record(self, source_id, cost, now=None):
+        """Kaynağın işlendiğini ve harcanan süreyi kaydet"""
+        now = time.monotonic() if now is None else now
+        self.virtual_time[source_id] += cost / self.weights[source_id]
+
+        # Geç kalındıysa en fazla bir frame'lik telafi; birikmiş frame'ler için patlama yapma
+        interval = self.intervals[source_id]
+        self.next_due[source_id] = max(self.next_due[source_id] + interval, now - interval) if interval else now
+        self.waiting[source_id] = self.next_due[source_id] > now
+
+        self.busy_time[source_id] += cost
+        self.served[source_id] += 1
+        self.misses[source_id] = 0
+        self.meters[source_id].tick()
+
+    def defer(self, source_id, now=None):
+        """Kaynaktan frame gelmedi: yalnızca bir sonraki denemeyi ertele (işlenmiş sayılmaz)"""
+        now = time.monotonic() if now is None else now
+        interval = self.intervals[source_id]
+        first = min(interval, MISS_RETRY_INTERVAL) if interval else MISS_RETRY_INTERVAL
+        self.next_due[source_id] = now + min(first * 2 ** min(self.misses[source_id], 16), MISS_RETRY_MAX)
+        self.misses[source_id] += 1
+        # Frame gelince beklerken biriken sanal zaman avantajı kullanılmasın
+        self.waiting[source_id] = True
+        # Olay sayılmaz; frame gelmedikçe ulaşılan FPS pencere sonunda düşer
+        self.meters[source_id].tick(0)
+
+    def disable(self, source_id):
+        """Kaynağı zamanlamadan çıkar (ör. dosya bitti)"""
+        self.enabled[source_id] = False
+
+    def enable(self, source_id):
+        """Kaynağı tekrar zamanlamaya al"""
+        self.enabled[source_id] = True
+        self.waiting[source_id] = True
+        self.next_due[source_id] = time.monotonic()
+
+    def report(self):
+        """Kaynak başına ağırlık, hedef ve ulaşılan FPS, kapasite payı"""
+        total_busy = sum(self.busy_time) or 1.0
+        total_weight = sum(w for w, on in zip(self.weights, self.enabled) if on) or 1.0
+        return [
+            {
+                'source': i,
+                'weight': self.weights[i],
+                'target_fps': self.target_fps[i],
+                'achieved_fps': self.meters[i].rate,
+                'share': self.busy_time[i] / total_busy,
+                'fair_share': (self.weights[i] / total_weight) if self.enabled[i] else 0.0,
+                'served': self.served[i],
+            }
+            for i in range(self.num_sources)
+        ]
@@ -0,0 +1,362 @@
+"""
+src/core/segmented_recorder.py
+Çökmeye dayanıklı, sabit süreli parçalara bölünmüş sürekli video kaydı
+
+Kayıt `segment_seconds` süreli parçalara (segment) bölünür. ffmpeg varsa
+her parça fragmented MP4 olarak yazılır (moov başta boş, her anahtar
+frame'de bir fragment); süreç veya güç kesilirse dosya son tamamlanan
+fragment'e kadar oynatılabilir. ffmpeg yoksa OpenCV VideoWriter kullanılır
+ve kayıp en fazla açık olan parça ile sınırlıdır.
+
+Her kaynak için `<önek>_index.jsonl` dosyasına parça açılış/kapanış
+kayıtları, her parçanın yanındaki `.idx` dosyasına frame başına duvar
+saati zaman damgası eklenir; `locate()` bir anı (parça, saniye) olarak bulur:
+
+    python -m src.core.segmented_recorder --index src/source/17062024/camera_0_index.jsonl \
+        --at "2024-06-17 14:31:05"
+"""
+
+import argparse
+import json
+import logging
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime
+
+import cv2
+import numpy as np
+
+from ..utils.metrics import get_metrics
+from ..utils.storage_manager import disk_low, track_file, watch_file
+from .ffmpeg_source import ffmpeg_available
+from .frame_pool import retain, release
+
+
+class _Segment:
+    """Tek bir kayıt parçası (ffmpeg pipe'ı veya OpenCV VideoWriter)"""
+
+    def __init__(self, path, width, height, fps, codec, preset, cv_codec, use_ffmpeg):
+        self.path = path
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.frames = 0
+        self.start = None
+        self.end = None
+        self.process = None
+        self.writer = None
+        self.index_path = os.path.splitext(path)[0] + ".idx"
+        self.index_file = open(self.index_path, 'ab')
+
+        if use_ffmpeg:
+            import imageio_ffmpeg
+
+            gop = max(1, int(round(fps)))  # Saniyede bir fragment
+            command = [imageio_ffmpeg.get_ffmpeg_exe(), "-nostdin", "-y", "-loglevel", "error",
+                       "-f", "rawvideo", "-pix_fmt", "bgr24", "-s", f"{width}x{height}", "-r", str(fps),
+                       "-i", "-", "-an", "-c:v", codec]
+            if codec == "libx264":
+                command += ["-preset", preset]
+            command += ["-pix_fmt", "yuv420p", "-g", str(gop),
+                        "-movflags", "+frag_keyframe+empty_moov+default_base_moof",
+                        "-flush_packets", "1", path]  # Tamamlanan fragment hemen diske yazılır
+            self.process = subprocess.Popen(command, stdin=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        else:
+            self.writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*cv_codec), fps, (width, height))
+
+    def is_open(self):
+        if self.process is not None:
+            return self.process.poll() is None
+        return self.writer.isOpened()
+
+    def write(self, frame, timestamp):
+        if self.process is not None:
+            self.process.stdin.write(memoryview(np.ascontiguousarray(frame)).cast("B"))
+        else:
+            self.writer.write(frame)
+        self.index_file.write(np.float64(timestamp).tobytes())
+        if self.start is None:
+            self.start = timestamp
+        self.end = timestamp
+        self.frames += 1
+        if self.frames % max(1, int(self.fps)) == 0:
+            self.index_file.flush()
+
+    def close(self):
+        self.index_file.close()
+        if self.process is not None:
+            try:
+                self.process.stdin.close()
+            except OSError:
+                pass
+            self.process.wait()
+        else:
+            self.writer.release()
+
+
+class SegmentedRecorder:
+    """
+    cv2.VideoWriter gibi kullanılan (write/release) parçalı kayıt.
+
+    write() bloklamaz; frame'ler yazma thread'ine kuyrukla gider. Sıradaki
+    parça bir önceki dolmadan arka planda açılır ve kapanan parça arka
+    planda sonlandırılır; parça değişiminde frame atlanmaz. Kuyruk dolarsa
+    (encoder yetişemiyorsa) frame atlanır ve `dropped` artar.
+    """
+
+    def __init__(self, directory, prefix, width, height, fps=30.0, segment_seconds=300.0,
+                 codec="libx264", preset="veryfast", cv_codec="mp4v", max_queue=120, source_id=None):
+        self.directory = directory
+        self.prefix = prefix
+        self.width = int(width)
+        self.height = int(height)
+        self.fps = fps if fps and fps > 0 else 30.0
+        self.segment_seconds = segment_seconds
+        # Sıradaki parça değişimden bu kadar önce açılır (dosya adı gerçek başlangıca yakın kalır)
+        self.lead = min(2.0, segment_seconds / 2) if segment_seconds else 0.0
+        self.codec = codec
+        self.preset = preset
+        self.cv_codec = cv_codec
+        self.use_ffmpeg = ffmpeg_available()
+        self.source_id = source_id
+        self.index_path = os.path.join(directory, f"{prefix}_index.jsonl")
+        self.logger = logging.getLogger("CivataDetection.recorder")
+        self.metrics = get_metrics()
+
+        self.written = 0
+        self.dropped = 0
+        self.segments = 0
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.index_lock = threading.Lock()
+
+        # Sıradaki parça arka planda hazırlanır
+        self.next_segment = None
+        self.next_ready = threading.Event()
+        self.preparing = False
+        self._prepare_next()
+        self.next_ready.wait()
+        self.opened = self.next_segment is not None and self.next_segment.is_open()
+
+        self.thread = threading.Thread(target=self._run, name=f"segment-writer-{prefix}", daemon=True)
+        if self.opened:
+            self.thread.start()
+
+    @property
+    def extension(self):
+        return ".mp4"
+
+    def isOpened(self):
+        return self.opened and self.thread.is_alive()
+
+    def _new_path(self):
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = os.path.join(self.directory, f"{self.prefix}_{timestamp}{self.extension}")
+        suffix = 1
+        # .idx dosyası parça açılırken hemen oluşur; ffmpeg henüz dosyayı yaratmamış olabilir
+        while os.path.exists(path) or os.path.exists(os.path.splitext(path)[0] + ".idx"):
+            path = os.path.join(self.directory, f"{self.prefix}_{timestamp}_{suffix}{self.extension}")
+            suffix += 1
+        return path
+
+    def _prepare_next(self):
+        """Sıradaki parçayı arka plan thread'inde aç"""
+        self.preparing = True
+        self.next_ready.clear()
+
+        def open_segment():
+            try:
+                self.next_segment = _Segment(self._new_path(), self.width, self.height, self.fps,
+                                             self.codec, self.preset, self.cv_codec, self.use_ffmpeg)
+            except Exception as e:
+                self.logger.error(f"Kayıt parçası açılamadı: {e}")
+                self.next_segment = None
+            self.next_ready.set()
+
+        threading.Thread(target=open_segment, name=f"segment-open-{self.prefix}", daemon=True).start()
+
+    def _append_index(self, record):
+        with self.index_lock:
+            with open(self.index_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record) + "\n")
+
+    def _activate_next(self):
+        """Hazırlanan parçaya geç (hazırlanmadıysa şimdi aç)"""
+        if not self.preparing:
+            self._prepare_next()
+        self.next_ready.wait()
+        segment = self.next_segment
+        self.next_segment = None
+        self.preparing = False
+        if segment is None or not segment.is_open():
+            return None
+        self.segments += 1
+        watch_file("recordings", segment.path)
+        watch_file("recordings", segment.index_path)
+        self._append_index({'event': 'open', 'segment': os.path.basename(segment.path),
+                            'start': time.time(), 'fps': self.fps,
+                            'width': self.width, 'height': self.height})
+        self.logger.info(f"Video kaydı parçası: {segment.path}")
+        return segment
+
+    def _finish(self, segment):
+        """Parçayı arka planda kapat (encoder kuyruğu boşalırken yazma sürer)"""
+        def close_segment():
+            try:
+                segment.close()
+            except Exception as e:
+                self.logger.error(f"Kayıt parçası kapatma hatası: {e}")
+            self._append_index({'event': 'close', 'segment': os.path.basename(segment.path),
+                                'start': segment.start, 'end': segment.end, 'frames': segment.frames})
+            track_file("recordings", segment.path)
+            track_file("recordings", segment.index_path)
+
+        thread = threading.Thread(target=close_segment, name=f"segment-close-{self.prefix}", daemon=True)
+        thread.start()
+        return thread
+
+    def _run(self):
+        segment = self._activate_next()
+        closers = []
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            frame, timestamp = item
+            try:
+                if segment is None:
+                    self.dropped += 1
+                    continue
+
+                if (self.segment_seconds and segment.start is not None
+                        and timestamp - segment.start >= self.segment_seconds):
+                    closers = [thread for thread in closers if thread.is_alive()]
+                    closers.append(self._finish(segment))
+                    segment = self._activate_next()
+                    if segment is None:
+                        self.dropped += 1
+                        continue
+
+                if frame.shape[1] != self.width or frame.shape[0] != self.height:
+                    frame = cv2.resize(frame, (self.width, self.height))
+                try:
+                    segment.write(frame, timestamp)
+                    self.written += 1
+                    if (self.segment_seconds and not self.preparing
+                            and timestamp - segment.start >= self.segment_seconds - self.lead):
+                        self._prepare_next()
+                except (OSError, ValueError) as e:
+                    self.logger.error(f"Video kaydı yazılamadı ({segment.path}): {e}")
+                    closers.append(self._finish(segment))
+                    segment = self._activate_next()
+            finally:
+                release(item[0])  # Havuz tamponu encode edildi (veya atıldı)
+
+        if segment is not None:
+            closers.append(self._finish(segment))
+        # Hazırlanmış ama kullanılmayan parça silinir
+        if self.preparing:
+            self.next_ready.wait()
+        if self.next_segment is not None:
+            self.next_segment.close()
+            for path in (self.next_segment.path, self.next_segment.index_path):
+                if os.path.exists(path):
+                    os.remove(path)
+        for thread in closers:
+            thread.join()
+
+    def write(self, frame, timestamp=None):
+        if disk_low():
+            self.dropped += 1
+            self.metrics.inc("civata_dropped_frames_total", 1, "Okunamayan/atlanan frame sayısı",
+                             source=self.source_id, reason="disk_full")
+            return
+        try:
+            self.queue.put_nowait((retain(frame), time.time() if timestamp is None else timestamp))
+        except queue.Full:
+            release(frame)
+            self.dropped += 1
+            self.metrics.inc("civata_dropped_frames_total", 1, "Okunamayan/atlanan frame sayısı",
+                             source=self.source_id, reason="record_queue_full")
+
+    def release(self):
+        """Kuyruktakileri yaz, açık parçayı kapat"""
+        if not self.opened:
+            if self.next_segment is not None:
+                self.next_segment.close()
+            return
+        self.queue.put(None)
+        self.thread.join()
+
+
+def read_index(index_path):
+    """Index dosyasından diskte duran parçaların listesi: [{'segment', 'start', 'end', 'fps', 'frames'}]"""
+    directory = os.path.dirname(index_path)
+    segments = {}
+    with open(index_path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # Çökme sırasında yarım kalmış satır
+            entry = segments.setdefault(record['segment'], {'segment': record['segment']})
+            entry.update({k: v for k, v in record.items() if k != 'event' and v is not None})
+
+    result = []
+    for entry in segments.values():
+        timestamps_path = os.path.join(directory, os.path.splitext(entry['segment'])[0] + ".idx")
+        if not (os.path.exists(os.path.join(directory, entry['segment'])) and os.path.exists(timestamps_path)):
+            continue  # Parça disk kotası nedeniyle (veya elle) silinmiş
+        if 'frames' not in entry:
+            # Kapanış kaydı yok (çökme): sınırlar frame zaman damgalarından okunur
+            timestamps = np.fromfile(timestamps_path, dtype=np.float64)
+            if len(timestamps):
+                entry.update(start=float(timestamps[0]), end=float(timestamps[-1]), frames=len(timestamps))
+        result.append(entry)
+    return sorted(result, key=lambda e: e.get('start', 0))
+
+
+def locate(index_path, when):
+    """Duvar saati anını (parça yolu, parça içi saniye) olarak bul; yoksa None"""
+    directory = os.path.dirname(index_path)
+    for entry in read_index(index_path):
+        if 'end' not in entry or not entry['start'] <= when <= entry['end']:
+            continue
+        try:
+            timestamps = np.fromfile(os.path.join(directory, os.path.splitext(entry['segment'])[0] + ".idx"),
+                                     dtype=np.float64)
+        except FileNotFoundError:
+            continue  # Okuma sırasında silindi
+        frame = max(0, int(np.searchsorted(timestamps, when, side='right')) - 1)
+        return os.path.join(directory, entry['segment']), frame / entry.get('fps', 30.0)
+    return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parçalı kayıtta bir anın dosyasını ve konumunu bul")
+    parser.add_argument("--index", required=True, help="<önek>_index.jsonl dosyası")
+    parser.add_argument("--at", help="Zaman (YYYY-AA-GG SS:DD:ss); verilmezse parçalar listelenir")
+    args = parser.parse_args(argv)
+
+    if not args.at:
+        for entry in read_index(args.index):
+            start = datetime.fromtimestamp(entry.get('start', 0)).strftime("%Y-%m-%d %H:%M:%S")
+            end = datetime.fromtimestamp(entry['end']).strftime("%H:%M:%S") if 'end' in entry else "?"
+            print(f"{entry['segment']}: {start} - {end} ({entry.get('frames', '?')} frame)")
+        return 0
+
+    when = datetime.strptime(args.at, "%Y-%m-%d %H:%M:%S").timestamp()
+    found = locate(args.index, when)
+    if found is None:
+        print("Bu zamana ait kayıt bulunamadı")
+        return 1
+    path, offset = found
+    print(f"{path} @ {offset:.2f} sn")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
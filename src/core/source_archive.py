@@ -0,0 +1,284 @@
+"""
+src/core/source_archive.py
+Video kaynaklarını tespiti bekletmeden arka planda arşive alma
+
+Tespit her zaman orijinal dosyadan okur. Arşiv kopyası ayrı bir thread'de
+hardlink, reflink (copy-on-write) veya hız sınırlı kopya ile oluşturulur ve
+SHA-256 ile doğrulanır. İçeriği aynı olan dosyalar (isimleri farklı olsa da)
+tekrar arşivlenmez.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+from ..utils.metrics import get_metrics
+
+INDEX_FILENAME = "archive_index.json"
+PARTIAL_SUFFIX = ".partial"
+CHUNK_SIZE = 4 * 1024 * 1024
+
+# Linux FICLONE ioctl (btrfs, XFS, bcachefs üzerinde reflink)
+FICLONE = 0x40049409
+
+
+def file_digest(path, stop_event=None, max_bytes_per_sec=None):
+    """Dosyanın SHA-256 özeti (isteğe bağlı okuma hızı sınırıyla)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in _throttled_chunks(f, stop_event, max_bytes_per_sec):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _throttled_chunks(handle, stop_event=None, max_bytes_per_sec=None):
+    """Dosyayı parça parça oku; hız sınırı varsa aradaki süreyi bekle"""
+    started = time.monotonic()
+    total = 0
+    while True:
+        if stop_event is not None and stop_event.is_set():
+            raise InterruptedError("Arşivleme durduruldu")
+        chunk = handle.read(CHUNK_SIZE)
+        if not chunk:
+            return
+        yield chunk
+        total += len(chunk)
+        if max_bytes_per_sec:
+            ahead = total / max_bytes_per_sec - (time.monotonic() - started)
+            if ahead > 0:
+                time.sleep(ahead)
+
+
+def try_hardlink(source, target):
+    """Aynı dosya sisteminde hardlink oluştur (veri kopyalanmaz)"""
+    try:
+        os.link(source, target)
+        return True
+    except OSError:
+        return False
+
+
+def try_reflink(source, target):
+    """Copy-on-write klon (destekleyen dosya sistemlerinde anında)"""
+    try:
+        import fcntl
+    except ImportError:
+        return False
+
+    try:
+        with open(source, 'rb') as src, open(target, 'wb') as dst:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        return True
+    except OSError:
+        if os.path.exists(target):
+            os.remove(target)
+        return False
+
+
+def throttled_copy(source, target, stop_event=None, max_bytes_per_sec=None):
+    """Hız sınırlı kopya; kopyalanan verinin SHA-256 özetini döndür"""
+    digest = hashlib.sha256()
+    with open(source, 'rb') as src, open(target, 'wb') as dst:
+        for chunk in _throttled_chunks(src, stop_event, max_bytes_per_sec):
+            dst.write(chunk)
+            digest.update(chunk)
+        dst.flush()
+        os.fsync(dst.fileno())
+    return digest.hexdigest()
+
+
+class SourceArchiver:
+    """
+    Arşivleme işlerini sırayla yürüten arka plan thread'i.
+
+    İndeks dosyası (`archive_index.json`) içerik özetinden arşiv yoluna
+    ve kaynak dosyanın (boyut, mtime) bilgisinden özete eşleme tutar;
+    böylece değişmemiş büyük dosyalar her başlatmada yeniden okunmaz.
+    """
+
+    def __init__(self, archive_root="src/source", method="auto", max_mb_per_sec=50.0):
+        self.archive_root = archive_root
+        self.method = method
+        self.max_bytes_per_sec = max_mb_per_sec * 1024 * 1024 if max_mb_per_sec else None
+        self.index_path = os.path.join(archive_root, INDEX_FILENAME)
+        self.logger = logging.getLogger("CivataDetection.archive")
+        self.metrics = get_metrics()
+
+        self.jobs = queue.Queue()
+        self.stop_event = threading.Event()
+        self.lock = threading.Lock()
+        self.index = self._load_index()
+        self.results = {}  # {kaynak yolu: arşiv yolu veya None}
+
+        os.makedirs(archive_root, exist_ok=True)
+        self._remove_partials()
+
+        self.thread = threading.Thread(target=self._run, name="source-archiver", daemon=True)
+        self.thread.start()
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            index = {}
+        index.setdefault('by_hash', {})
+        index.setdefault('sources', {})
+        return index
+
+    def _save_index(self):
+        temp_path = self.index_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f, indent=2, ensure_ascii=False)
+        os.replace(temp_path, self.index_path)
+
+    def _remove_partials(self):
+        """Yarıda kalmış kopyaları sil"""
+        for root, _, files in os.walk(self.archive_root):
+            for name in files:
+                if name.endswith(PARTIAL_SUFFIX):
+                    try:
+                        os.remove(os.path.join(root, name))
+                    except OSError:
+                        pass
+
+    def submit(self, source):
+        """Kaynağı arşiv kuyruğuna ekle (hemen döner)"""
+        self.jobs.put(os.path.abspath(source))
+
+    def pending(self):
+        """Kuyrukta bekleyen iş sayısı"""
+        return self.jobs.qsize()
+
+    def wait(self, timeout=None):
+        """Kuyruktaki tüm işler bitene kadar bekle"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.jobs.unfinished_tasks:
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(0.05)
+        return True
+
+    def stop(self, timeout=5):
+        """Devam eden kopyayı kes ve thread'i durdur"""
+        self.stop_event.set()
+        self.jobs.put(None)
+        self.thread.join(timeout=timeout)
+
+    def _run(self):
+        while True:
+            source = self.jobs.get()
+            try:
+                if source is None:
+                    return
+                self.results[source] = self.archive(source)
+            except InterruptedError:
+                self.logger.info(f"Arşivleme yarıda kesildi: {source}")
+            except Exception as e:
+                self.results[source] = None
+                self.metrics.inc("civata_archive_jobs_total", 1, "Kaynak arşivleme işleri", result="error")
+                self.logger.error(f"Arşivleme hatası ({source}): {e}")
+            finally:
+                self.jobs.task_done()
+
+    def source_digest(self, source):
+        """Kaynağın özeti; boyut/mtime değişmediyse indeksten"""
+        stat = os.stat(source)
+        signature = [stat.st_size, stat.st_mtime_ns]
+        with self.lock:
+            cached = self.index['sources'].get(source)
+        if cached and cached['signature'] == signature:
+            return cached['sha256']
+
+        digest = file_digest(source, self.stop_event, self.max_bytes_per_sec)
+        with self.lock:
+            self.index['sources'][source] = {'signature': signature, 'sha256': digest}
+        return digest
+
+    def archive(self, source):
+        """Tek bir kaynağı arşivle, arşiv yolunu döndür"""
+        digest = self.source_digest(source)
+
+        with self.lock:
+            existing = self.index['by_hash'].get(digest)
+        if existing and os.path.exists(existing['path']):
+            self.metrics.inc("civata_archive_jobs_total", 1, "Kaynak arşivleme işleri", result="duplicate")
+            self.logger.info(f"Video zaten arşivde (aynı içerik): {existing['path']}")
+            with self.lock:
+                self._save_index()
+            return existing['path']
+
+        target = self._target_path(source, digest)
+        method = self._materialize(source, target, digest)
+
+        with self.lock:
+            self.index['by_hash'][digest] = {
+                'path': target,
+                'original': source,
+                'method': method,
+                'size': os.path.getsize(target),
+                'archived': datetime.now().isoformat(timespec='seconds'),
+            }
+            self._save_index()
+
+        self.metrics.inc("civata_archive_jobs_total", 1, "Kaynak arşivleme işleri", result=method)
+        self.metrics.inc("civata_archive_bytes_total", os.path.getsize(target),
+                         "Arşive alınan bayt", method=method)
+        self.logger.info(f"Video arşivlendi ({method}): {target}")
+        return target
+
+    def _target_path(self, source, digest):
+        """Günün klasöründe çakışmayan hedef yol"""
+        day_dir = os.path.join(self.archive_root, datetime.now().strftime("%d%m%Y"))
+        os.makedirs(day_dir, exist_ok=True)
+        target = os.path.join(day_dir, os.path.basename(source))
+        if os.path.exists(target):
+            stem, ext = os.path.splitext(os.path.basename(source))
+            target = os.path.join(day_dir, f"{stem}_{digest[:8]}{ext}")
+        return target
+
+    def _materialize(self, source, target, digest):
+        """Hedef dosyayı oluştur ve doğrula; kullanılan yöntemi döndür"""
+        partial = target + PARTIAL_SUFFIX
+        methods = ["hardlink", "reflink", "copy"] if self.method == "auto" else [self.method]
+
+        try:
+            for method in methods:
+                if method == "hardlink" and try_hardlink(source, partial):
+                    # Aynı inode; içerik zaten kaynağın kendisi
+                    os.replace(partial, target)
+                    return method
+                if method == "reflink" and try_reflink(source, partial):
+                    if file_digest(partial, self.stop_event) != digest:
+                        raise IOError("Reflink doğrulaması başarısız")
+                    os.replace(partial, target)
+                    return method
+                if method == "copy":
+                    if throttled_copy(source, partial, self.stop_event, self.max_bytes_per_sec) != digest:
+                        raise IOError("Kopya doğrulaması başarısız (kaynak kopyalama sırasında değişmiş olabilir)")
+                    os.replace(partial, target)
+                    return method
+        except BaseException:
+            if os.path.exists(partial):
+                os.remove(partial)
+            raise
+
+        raise IOError(f"Arşivleme yöntemi kullanılamadı: {self.method}")
+
+
+# Uygulama genelinde tek arşivleyici (tespit durdurulsa da işler devam eder)
+source_archiver = None
+
+
+def get_source_archiver(config):
+    """Global arşivleyiciyi döndür (ilk çağrıda oluşturulur)"""
+    global source_archiver
+    if source_archiver is None:
+        source_archiver = SourceArchiver(config.archive_dir, config.archive_method,
+                                         config.archive_max_mb_per_sec)
+    return source_archiver
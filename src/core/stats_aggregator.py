@@ -0,0 +1,127 @@
+"""
+src/core/stats_aggregator.py
+Tespit istatistiklerini artımlı toplayan ve sabit hızda özet üreten sınıf
+"""
+
+import time
+
+import numpy as np
+
+
+class StatsAggregator:
+    """
+    Kaynak ve sınıf bazında sayaçları numpy dizilerinde biriktirir.
+
+    Her frame için sadece dizi toplama yapılır; UI'ye gidecek dict
+    yalnızca `emit_hz` hızında (ör. 4 Hz) oluşturulur. Kayan pencere,
+    her biri bir emit aralığını kapsayan halka tampon (ring buffer)
+    dilimleriyle tutulur.
+    """
+
+    def __init__(self, num_sources, num_classes=2, emit_hz=4.0, window_seconds=10.0,
+                 damaged_class=0):
+        self._init_args = (num_sources, num_classes, emit_hz, window_seconds, damaged_class)
+        self.num_sources = max(1, num_sources)
+        self.num_classes = max(1, num_classes)
+        self.damaged_class = damaged_class
+        self.emit_interval = 1.0 / emit_hz if emit_hz > 0 else 0.0
+        self.window_slots = max(1, int(round(window_seconds * emit_hz))) if emit_hz > 0 else 1
+
+        # Kümülatif sayaçlar
+        self.class_totals = np.zeros((self.num_sources, self.num_classes), dtype=np.int64)
+        self.frame_totals = np.zeros(self.num_sources, dtype=np.int64)
+        self.saved_totals = np.zeros(self.num_sources, dtype=np.int64)
+        self.last_frame_counts = np.zeros((self.num_sources, self.num_classes), dtype=np.int64)
+
+        # Kayan pencere (halka tampon) ve penceredeki toplamlar
+        self.ring_counts = np.zeros((self.window_slots, self.num_sources, self.num_classes), dtype=np.int64)
+        self.ring_frames = np.zeros((self.window_slots, self.num_sources), dtype=np.int64)
+        self.ring_durations = np.zeros(self.window_slots, dtype=np.float64)
+        self.window_counts = np.zeros((self.num_sources, self.num_classes), dtype=np.int64)
+        self.window_frames = np.zeros(self.num_sources, dtype=np.int64)
+        self.head = 0
+
+        self.slot_start = time.monotonic()
+        self.last_emit = 0.0
+
+    def add_frame(self, source_id, classes=None):
+        """Bir frame'in tespit sınıflarını ekle (classes: sınıf indeksleri dizisi)"""
+        if not 0 <= source_id < self.num_sources:
+            return
+
+        if classes is not None and len(classes) > 0:
+            counts = np.bincount(np.asarray(classes, dtype=np.int64).clip(0, self.num_classes - 1),
+                                 minlength=self.num_classes)
+        else:
+            counts = np.zeros(self.num_classes, dtype=np.int64)
+
+        self.class_totals[source_id] += counts
+        self.ring_counts[self.head, source_id] += counts
+        self.window_counts[source_id] += counts
+        self.last_frame_counts[source_id] = counts
+        self.frame_totals[source_id] += 1
+        self.ring_frames[self.head, source_id] += 1
+        self.window_frames[source_id] += 1
+
+    def add_saved(self, source_id):
+        """Kaydedilen hasarlı kırpıntıyı say"""
+        if 0 <= source_id < self.num_sources:
+            self.saved_totals[source_id] += 1
+
+    def _advance(self, now):
+        """Aktif dilimi kapat ve en eski dilimi pencereden çıkar"""
+        self.ring_durations[self.head] = now - self.slot_start
+        self.slot_start = now
+
+        self.head = (self.head + 1) % self.window_slots
+        self.window_counts -= self.ring_counts[self.head]
+        self.window_frames -= self.ring_frames[self.head]
+        self.ring_counts[self.head] = 0
+        self.ring_frames[self.head] = 0
+        self.ring_durations[self.head] = 0.0
+
+    def maybe_snapshot(self, extra=None, now=None):
+        """Emit zamanı geldiyse özet dict döndür, gelmediyse None"""
+        now = time.monotonic() if now is None else now
+        if now - self.last_emit < self.emit_interval:
+            return None
+        self.last_emit = now
+
+        # Pencere süresi: kapanmış dilimler + aktif dilim
+        window_duration = self.ring_durations.sum() + (now - self.slot_start)
+        snapshot = self.snapshot(window_duration, extra)
+        self._advance(now)
+        return snapshot
+
+    def snapshot(self, window_duration, extra=None):
+        """Mevcut sayaçlardan UI'ye gidecek özet dict'i oluştur"""
+        window_duration = max(window_duration, 1e-6)
+        source_fps = self.window_frames / window_duration
+        damaged = self.damaged_class if self.damaged_class < self.num_classes else self.num_classes - 1
+
+        stats = {
+            'total_detections': int(self.class_totals.sum()),
+            'damaged_count': int(self.saved_totals.sum()),
+            'current_damaged': int(self.last_frame_counts[:, damaged].sum()),
+            'fps': float(source_fps.mean()),
+            'class_totals': self.class_totals.sum(axis=0).tolist(),
+            'window_class_counts': self.window_counts.sum(axis=0).tolist(),
+            'window_seconds': float(window_duration),
+            'per_source': [
+                {
+                    'frames': int(self.frame_totals[i]),
+                    'fps': float(source_fps[i]),
+                    'class_totals': self.class_totals[i].tolist(),
+                    'window_class_counts': self.window_counts[i].tolist(),
+                    'saved': int(self.saved_totals[i]),
+                }
+                for i in range(self.num_sources)
+            ],
+        }
+        if extra:
+            stats.update(extra)
+        return stats
+
+    def reset(self):
+        """Tüm sayaçları sıfırla"""
+        self.__init__(*self._init_args)
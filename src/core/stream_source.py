@@ -0,0 +1,260 @@
+"""
+src/core/stream_source.py
+Ağ akışı (RTSP/HTTP) kaynakları: gecikmesi sınırlı okuma ve otomatik yeniden bağlanma
+
+Arka plan thread'i akışı sürekli okur; OpenCV/FFmpeg tamponunda eski
+frame'ler birikmez ve tespit döngüsü yavaşladığında gecikme artmaz. Her
+yeni frame tüketicide bekleyen frame'in yerine geçer; tüketici her zaman
+en yeni frame'i alır.
+
+RTSP taşıma protokolü (rtsp_transport) süreç genelindeki
+OPENCV_FFMPEG_CAPTURE_OPTIONS ortam değişkeniyle verilir; main.py bunu
+başlangıçta config'den bir kez ayarlar.
+
+Yerel test için ffmpeg ile bir video dosyası loopback üzerinden yayınlanabilir:
+    python -m src.core.stream_source --serve test.mp4 --port 8090
+"""
+
+import argparse
+import logging
+import random
+import subprocess
+import sys
+import threading
+import time
+
+import cv2
+
+from ..utils.metrics import get_metrics
+
+STREAM_SCHEMES = ("rtsp://", "rtsps://", "rtmp://", "http://", "https://", "udp://", "tcp://", "srt://")
+
+# Gerçekçi olmayan FPS değerleri (ör. RTSP'de 90000 zaman tabanı) yok sayılır
+MAX_REPORTED_FPS = 240.0
+
+
+def is_stream_source(source):
+    """Kaynak bir ağ akışı URL'si mi"""
+    return isinstance(source, str) and source.lower().startswith(STREAM_SCHEMES)
+
+
+def mask_url(url):
+    """Log ve metriklerde kullanıcı adı/şifreyi gizle"""
+    scheme, sep, rest = url.partition("://")
+    if not sep or "@" not in rest.split("/", 1)[0]:
+        return url
+    return f"{scheme}://***@{rest.split('@', 1)[1]}"
+
+
+class StreamCapture:
+    """
+    Ağ akışını cv2.VideoCapture arayüzüyle sunar.
+
+    Tüketici alamadan yenisi gelen frame'ler atılır (yerine en yenisi
+    konur). Akış takılıp bekleyen frame `max_latency` saniyeden eskirse
+    verilmez. read() beklemez: hazır yeni frame yoksa hemen (False, None)
+    döner ve zamanlayıcı kaynağı biraz sonra yeniden dener.
+    Bağlantı koparsa veya `read_timeout` boyunca frame gelmezse üstel geri
+    çekilmeyle yeniden bağlanılır.
+    """
+
+    def __init__(self, url, name=None, open_timeout=10.0, read_timeout=5.0,
+                 max_latency=0.2, reconnect_initial=0.5, reconnect_max=30.0):
+        self.url = url
+        self.name = name if name is not None else mask_url(url)
+        self.open_timeout = open_timeout
+        self.read_timeout = read_timeout
+        self.max_latency = max_latency
+        self.reconnect_initial = reconnect_initial
+        self.reconnect_max = reconnect_max
+        self.logger = logging.getLogger("CivataDetection.stream")
+        self.metrics = get_metrics()
+
+        self.cond = threading.Condition()
+        self.frame = None
+        self.frame_time = 0.0
+        self.frame_seq = 0
+        self.consumed_seq = 0
+        self.connected = False
+        self.ever_connected = False
+        self.reconnects = 0
+        self.width = 0
+        self.height = 0
+        self.fps = 0.0
+        self.position = 0
+
+        self.stop_event = threading.Event()
+        self.first_attempt = threading.Event()
+        self.thread = threading.Thread(target=self._run, name=f"stream-{self.name}", daemon=True)
+        self.thread.start()
+
+        # İlk bağlantıyı bekle; açılamayan akış diğer kaynaklar gibi hata verir
+        self.first_attempt.wait(open_timeout + 1.0)
+        self._opened = self.ever_connected
+        if not self._opened:
+            self.release()
+
+    def _open(self):
+        """Akışı zaman aşımlarıyla aç"""
+        params = [cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, int(self.open_timeout * 1000),
+                  cv2.CAP_PROP_READ_TIMEOUT_MSEC, int(self.read_timeout * 1000)]
+        cap = cv2.VideoCapture(self.url, cv2.CAP_FFMPEG, params)
+        if not cap.isOpened():
+            cap.release()
+            return None
+        return cap
+
+    def _set_connected(self, connected):
+        self.connected = connected
+        self.metrics.set_gauge("civata_stream_connected", 1 if connected else 0,
+                               "Ağ akışı bağlı mı", stream=self.name)
+
+    def _run(self):
+        delay = self.reconnect_initial
+        cap = None
+        while not self.stop_event.is_set():
+            if cap is None:
+                cap = self._open()
+                if cap is None:
+                    self.first_attempt.set()
+                    self.logger.warning(f"Akışa bağlanılamadı: {self.name} ({delay:.1f} sn sonra tekrar)")
+                    # Aynı anda kopan kameralar sunucuya birlikte yüklenmesin
+                    self.stop_event.wait(delay * random.uniform(0.8, 1.2))
+                    delay = min(delay * 2, self.reconnect_max)
+                    continue
+
+                fps = cap.get(cv2.CAP_PROP_FPS)
+                self.fps = fps if 0 < fps <= MAX_REPORTED_FPS else 0.0
+                self.width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+                self.height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+                self.ever_connected = True
+                self._set_connected(True)
+                self.first_attempt.set()
+                self.logger.info(f"Akışa bağlanıldı: {self.name} ({self.width}x{self.height}, "
+                                 f"{self.fps:.1f} FPS)")
+
+            if not cap.grab():
+                cap.release()
+                cap = None
+                with self.cond:
+                    self._set_connected(False)
+                    self.cond.notify_all()
+                if self.stop_event.is_set():
+                    break
+                self.reconnects += 1
+                self.metrics.inc("civata_stream_reconnects_total", 1,
+                                 "Ağ akışı yeniden bağlanma sayısı", stream=self.name)
+                self.logger.warning(f"Akış koptu veya frame gelmedi: {self.name}, yeniden bağlanılıyor")
+                delay = self.reconnect_initial
+                continue
+
+            delay = self.reconnect_initial
+            ok, frame = cap.retrieve()
+            if not ok:
+                continue
+            now = time.monotonic()
+            with self.cond:
+                if self.frame_seq > self.consumed_seq:
+                    # Tüketici önceki frame'i almadı; yerine en yenisi konur
+                    self.metrics.inc("civata_stream_frames_skipped_total", 1,
+                                     "Tüketilmeden yerine yenisi gelen akış frame'leri", stream=self.name)
+                self.frame = frame
+                self.height, self.width = frame.shape[:2]
+                self.frame_time = now
+                self.frame_seq += 1
+                self.cond.notify_all()
+
+        if cap is not None:
+            cap.release()
+        self._set_connected(False)
+        self.first_attempt.set()
+
+    def isOpened(self):
+        return self._opened
+
+    def read(self, image=None):
+        """En yeni frame'i döndür; yeni ve taze frame yoksa (veya bağlantı yoksa) beklemeden (False, None)"""
+        with self.cond:
+            fresh = self.frame_seq > self.consumed_seq
+            if not (self.connected and fresh and time.monotonic() - self.frame_time <= self.max_latency):
+                return False, None
+
+            frame = self.frame
+            self.consumed_seq = self.frame_seq
+            age = time.monotonic() - self.frame_time
+
+        self.position += 1
+        self.metrics.observe("civata_stream_frame_age_seconds", age,
+                             "Akış frame'inin alınmasından tüketilmesine kadar geçen süre",
+                             stream=self.name)
+        if image is not None and image.shape == frame.shape:
+            image[...] = frame
+            frame = image
+        return True, frame
+
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.width)
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.height)
+        if prop == cv2.CAP_PROP_FPS:
+            return float(self.fps)
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            return float(self.position)
+        return 0.0
+
+    def set(self, prop, value):
+        # Çözünürlük/FPS kamera tarafında belirlenir
+        return False
+
+    def release(self):
+        self.stop_event.set()
+        self.thread.join(timeout=self.read_timeout + 1.0)
+        self._opened = False
+        with self.cond:
+            self.cond.notify_all()
+
+
+def serve_file(path, port=8090, host="127.0.0.1", loop=True, copy=False):
+    """
+    Video dosyasını ffmpeg ile HTTP/MPEG-TS olarak yayınla (tek istemci).
+
+    İstemci bağlantıyı kapatınca ffmpeg çıkar; yeniden bağlanma testleri
+    için süreç döngü içinde tekrar başlatılmalıdır.
+    """
+    import imageio_ffmpeg
+
+    command = [imageio_ffmpeg.get_ffmpeg_exe(), "-nostdin", "-loglevel", "error", "-re"]
+    if loop:
+        command += ["-stream_loop", "-1"]
+    command += ["-i", path, "-an"]
+    # MPEG-4 Part 2 (mp4v) kopyalanınca TS'te boyut bilgisi kaybolur; varsayılan yeniden kodlamaktır
+    command += ["-c:v", "copy"] if copy else ["-c:v", "mpeg2video", "-q:v", "4"]
+    command += ["-f", "mpegts", "-listen", "1", f"http://{host}:{port}/stream.ts"]
+    return subprocess.Popen(command, stdin=subprocess.DEVNULL)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ağ akışı kaynağı için yerel test sunucusu")
+    parser.add_argument("--serve", required=True, help="Yayınlanacak video dosyası")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--copy", action="store_true",
+                        help="Yeniden kodlamadan yayınla (H.264 kaynaklar için)")
+    parser.add_argument("--restart", action="store_true",
+                        help="İstemci kopunca yayını yeniden başlat (yeniden bağlanma testi)")
+    args = parser.parse_args(argv)
+
+    print(f"Yayın: http://{args.host}:{args.port}/stream.ts")
+    try:
+        while True:
+            code = serve_file(args.serve, args.port, args.host, copy=args.copy).wait()
+            if not args.restart:
+                return code
+            time.sleep(0.5)
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
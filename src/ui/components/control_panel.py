@@ -20,6 +20,7 @@ class ControlPanel(QWidget):
         super().__init__()
         self.is_running = False
         self.is_paused = False
+        self.is_ready = True  # Ağır modüller yüklenene kadar False
         self.init_ui()
         
     def init_ui(self):
@@ -149,11 +150,16 @@ class ControlPanel(QWidget):
             else:
                 self.pause_button.setText("Duraklat")
         else:
-            self.start_button.setEnabled(True)
+            self.start_button.setEnabled(self.is_ready)
             self.stop_button.setEnabled(False)
             self.pause_button.setEnabled(False)
             self.pause_button.setText("Duraklat")
             
+    def set_ready(self, ready):
+        """Başlat butonunu hazır olma durumuna göre aç/kapat"""
+        self.is_ready = ready
+        self.update_button_states()
+        
     def reset_states(self):
         """Durumları sıfırla"""
         self.is_running = False
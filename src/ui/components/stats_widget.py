@@ -113,6 +113,12 @@ class StatsWidget(QWidget):
         
         layout.addWidget(perf_group)
         
+        # Disk kullanımı (kota yöneticisi)
+        self.storage_label = QLabel("Disk: -")
+        self.storage_label.setWordWrap(True)
+        self.storage_label.setStyleSheet("color: #34495e;")
+        layout.addWidget(self.storage_label)
+        
         # Ana layout
         main_layout = QVBoxLayout(self)
         main_layout.addWidget(group)
@@ -121,12 +127,16 @@ class StatsWidget(QWidget):
         """İstatistikleri güncelle"""
         self.stats_data = stats
         
-        # Değerleri güncelle
-        self.total_label.setText(str(stats.get('total_detections', 0)))
-        self.damaged_label.setText(str(stats.get('damaged_count', 0)))
-        self.saved_label.setText(str(stats.get('damaged_count', 0)))  # Kaydedilen = hasarlı
-        self.fps_label.setText(f"{stats.get('fps', 0):.1f}")
-        self.conf_label.setText(f"{stats.get('model_conf', 50)}%")
+        # Değerleri güncelle (sadece değişen label'lar yeniden çizilir)
+        self.set_label_text(self.total_label, str(stats.get('total_detections', 0)))
+        self.set_label_text(self.damaged_label, str(stats.get('damaged_count', 0)))
+        self.set_label_text(self.saved_label, str(stats.get('damaged_count', 0)))  # Kaydedilen = hasarlı
+        self.set_label_text(self.fps_label, f"{stats.get('fps', 0):.1f}")
+        self.set_label_text(self.conf_label, f"{stats.get('model_conf', 50)}%")
+        
+        storage = stats.get('storage')
+        if storage:
+            self.set_label_text(self.storage_label, self.format_storage(storage))
         
         # İşlem yükü (FPS'e göre tahmin)
         fps = stats.get('fps', 0)
@@ -137,6 +147,32 @@ class StatsWidget(QWidget):
         if self.start_time is None:
             self.start_time = time.time()
             
+    def format_storage(self, storage):
+        """Kategori başına kullanım ve boş alan özeti"""
+        names = {'recordings': "Kayıt", 'crops': "Kırpılmış", 'logs': "Log", 'raw': "Ham"}
+        gb = 1024 ** 3
+        parts = []
+        free = None
+        for category, name in names.items():
+            entry = storage.get(category)
+            if not entry:
+                continue
+            text = f"{name} {entry['bytes'] / gb:.1f}"
+            if entry['quota']:
+                text += f"/{entry['quota'] / gb:.0f}"
+            parts.append(text + " GB")
+            if entry['free'] is not None:
+                free = entry['free'] if free is None else min(free, entry['free'])
+        if free is not None:
+            parts.append(f"Boş {free / gb:.1f} GB")
+        text = "Disk: " + ", ".join(parts)
+        return text + " (DOLU, kayıt atlanıyor)" if storage.get('low_space') else text
+        
+    def set_label_text(self, label, text):
+        """Metin değiştiyse label'ı güncelle (gereksiz relayout'u önler)"""
+        if label.text() != text:
+            label.setText(text)
+            
     def update_runtime(self):
         """Çalışma süresini güncelle"""
         if self.start_time is not None:
@@ -160,6 +196,7 @@ class StatsWidget(QWidget):
         self.fps_label.setText("0")
         self.conf_label.setText("50%")
         self.load_progress.setValue(0)
+        self.storage_label.setText("Disk: -")
         
     def start_timing(self):
         """Zamanlama başlat"""
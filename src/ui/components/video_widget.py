@@ -3,21 +3,34 @@ src/ui/components/video_widget.py
 Video görüntüleme widget'ı
 """
 
-import cv2
 import numpy as np
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QFrame
-from PyQt6.QtCore import Qt, pyqtSignal
-from PyQt6.QtGui import QPixmap, QImage, QFont
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QFrame, QSizePolicy
+from PyQt6.QtCore import Qt, pyqtSignal, QRectF, QEvent, QSize
+from PyQt6.QtGui import QPixmap, QImage, QFont, QPainter, QPen, QColor, QFontMetrics
+
+from ...core.overlay import CLASS_NAMES, CLASS_COLORS
+from ...core.preview import fit_size
+
+# Kutu renkleri (overlay.CLASS_COLORS BGR'dir)
+BOX_COLORS = [QColor(r, g, b) for b, g, r in CLASS_COLORS]
 
 class VideoWidget(QWidget):
     """Video görüntüleme widget'ı"""
     
     frame_clicked = pyqtSignal(tuple)  # (x, y) koordinatları
+    display_size_changed = pyqtSignal(int, int)  # Görüntü alanı boyutu (fiziksel piksel)
     
     def __init__(self, title="Video"):
         super().__init__()
         self.title = title
-        self.current_frame = None
+        self.frame_size = None  # Kaynağın tam çözünürlüğü (w, h); tıklama ve kutu koordinatları için
+        self.shown_size = None  # Gösterilen görüntünün mantıksal piksel boyutu (w, h)
+        self.rate_text = ""  # Zamanlayıcıdan gelen ulaşılan/hedef FPS
+        self.progress_text = ""  # Video dosyası ilerlemesi ve kalan süre
+        self.show_labels = True  # Sınıf adı ve güven skoru
+        self.show_ids = True  # Track ID
+        self.label_font = QFont("Arial", 9, QFont.Weight.Bold)
+        self.label_metrics = QFontMetrics(self.label_font)
         self.init_ui()
         
     def init_ui(self):
@@ -44,7 +57,8 @@ class VideoWidget(QWidget):
         # Video görüntü alanı
         self.video_label = QLabel()
         self.video_label.setMinimumSize(480, 360)
-        self.video_label.setScaledContents(True)
+        # Görüntü alanı pencereyle büyüyüp küçülür; gösterilen görüntünün boyutu yerleşimi etkilemez
+        self.video_label.setSizePolicy(QSizePolicy.Policy.Ignored, QSizePolicy.Policy.Ignored)
         self.video_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.video_label.setStyleSheet("""
             QLabel {
@@ -57,6 +71,7 @@ class VideoWidget(QWidget):
         """)
         self.video_label.setText("Video bekleniyor...")
         self.video_label.mousePressEvent = self.on_video_click
+        self.video_label.installEventFilter(self)
         
         layout.addWidget(self.video_label)
         
@@ -74,28 +89,55 @@ class VideoWidget(QWidget):
         """)
         layout.addWidget(self.status_label)
         
-    def update_frame(self, frame):
-        """Frame'i güncelle"""
+    def eventFilter(self, obj, event):
+        """Görüntü alanı yeniden boyutlanınca önizleme boyutunu bildir"""
+        if obj is self.video_label and event.type() == QEvent.Type.Resize:
+            self.display_size_changed.emit(*self.display_size())
+        return super().eventFilter(obj, event)
+        
+    def display_size(self):
+        """Görüntü alanının fiziksel piksel boyutu (w, h); önizleme bu boyuta küçültülür"""
+        size = self.video_label.contentsRect().size()
+        ratio = self.video_label.devicePixelRatioF()
+        return round(size.width() * ratio), round(size.height() * ratio)
+        
+    def update_frame(self, frame, detections=None, source_size=None):
+        """
+        Frame'i güncelle. Frame küçültülmüş önizleme olabilir; tespitler ve
+        tıklama koordinatları kaynağın tam çözünürlüğündedir (source_size).
+        Görüntü en-boy oranı korunarak görüntü alanına fiziksel piksel
+        çözünürlüğünde sığdırılır; kutular bu çözünürlükte çizilir.
+        """
         try:
             if frame is None:
                 return
                 
-            self.current_frame = frame.copy()
+            # BGR verisi doğrudan okunur (RGB kopyası yok); QPixmap kendi kopyasını alır,
+            # frame bu metottan sonra tutulmaz (havuz tamponu serbest bırakılabilir)
+            frame = np.ascontiguousarray(frame)
+            h, w, ch = frame.shape
+            self.frame_size = source_size or (w, h)
+            qt_image = QImage(frame.data, w, h, ch * w, QImage.Format.Format_BGR888)
             
-            # OpenCV BGR'den RGB'ye çevir
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            
-            # QImage oluştur
-            h, w, ch = rgb_frame.shape
-            bytes_per_line = ch * w
-            qt_image = QImage(rgb_frame.data, w, h, bytes_per_line, QImage.Format.Format_RGB888)
-            
-            # QPixmap'e çevir ve göster
+            # QPixmap'e çevir, görüntü alanına sığdır (önizleme zaten bu boyuttaysa ölçekleme yok)
             pixmap = QPixmap.fromImage(qt_image)
+            target = self.display_size()
+            if target[0] > 0 and target[1] > 0:
+                fitted = fit_size((w, h), target)
+                if fitted != (w, h):
+                    pixmap = pixmap.scaled(QSize(*fitted), Qt.AspectRatioMode.IgnoreAspectRatio,
+                                           Qt.TransformationMode.SmoothTransformation)
+            # Fiziksel piksel boyutundaki pixmap HiDPI ekranda yeniden ölçeklenmeden çizilir
+            ratio = self.video_label.devicePixelRatioF()
+            pixmap.setDevicePixelRatio(ratio)
+            self.shown_size = (pixmap.width() / ratio, pixmap.height() / ratio)
+            if detections is not None and len(detections):
+                self.draw_overlays(pixmap, detections, *self.frame_size)
             self.video_label.setPixmap(pixmap)
             
             # Durum güncelle
-            self.status_label.setText(f"Aktif - {w}x{h}")
+            self.status_label.setText(f"Aktif - {self.frame_size[0]}x{self.frame_size[1]}"
+                                      f"{self.rate_text}{self.progress_text}")
             self.status_label.setStyleSheet("""
                 QLabel {
                     background-color: #27ae60;
@@ -109,6 +151,57 @@ class VideoWidget(QWidget):
         except Exception as e:
             self.show_error(f"Frame güncelleme hatası: {str(e)}")
             
+    def draw_overlays(self, pixmap, detections, frame_w, frame_h):
+        """Kutuları ve etiketleri gösterilecek pixmap'e QPainter ile çiz (frame_w/h: tespit koordinatlarının çözünürlüğü)"""
+        shown_w, shown_h = self.shown_size
+        sx, sy = shown_w / frame_w, shown_h / frame_h
+        text_h = self.label_metrics.height()
+        
+        painter = QPainter(pixmap)
+        painter.setFont(self.label_font)
+        for x1, y1, x2, y2, conf, class_id, track_id, _, _ in detections.tolist():
+            color = BOX_COLORS[class_id] if class_id < len(BOX_COLORS) else BOX_COLORS[-1]
+            rect = QRectF(x1 * sx, y1 * sy, (x2 - x1) * sx, (y2 - y1) * sy)
+            painter.setPen(QPen(color, 2))
+            painter.drawRect(rect)
+            
+            # Etiket: "Hasarlı 0.87 ID:12" (seçeneklere göre parçalar)
+            parts = []
+            if self.show_labels:
+                name = CLASS_NAMES[class_id] if class_id < len(CLASS_NAMES) else str(class_id)
+                parts.append(f"{name} {conf:.2f}")
+            if self.show_ids and track_id != -1:
+                parts.append(f"ID:{track_id}")
+            if not parts:
+                continue
+            text = " ".join(parts)
+            text_w = self.label_metrics.horizontalAdvance(text) + 6
+            top = rect.top() - text_h - 2 if rect.top() - text_h - 2 >= 0 else rect.top()
+            label_rect = QRectF(rect.left() - 1, top, text_w, text_h + 2)
+            painter.fillRect(label_rect, color)
+            painter.setPen(Qt.GlobalColor.white)
+            painter.drawText(label_rect, Qt.AlignmentFlag.AlignCenter, text)
+        painter.end()
+        
+    def set_overlay_options(self, show_labels, show_ids):
+        """Etiket ve track ID gösterimini aç/kapat (kutular her zaman çizilir)"""
+        self.show_labels = show_labels
+        self.show_ids = show_ids
+        
+    def set_min_video_size(self, width, height):
+        """Izgarada çok kaynak varken görüntü alanının en küçük boyutu"""
+        self.video_label.setMinimumSize(width, height)
+        
+    def set_rate(self, achieved_fps, target_fps, shed=0):
+        """Kaynağa ayrılan işleme hızını (ve yük atmayla atılan frame'leri) durum satırında göster"""
+        self.rate_text = f" | {achieved_fps:.1f}/{target_fps:.0f} FPS"
+        if shed:
+            self.rate_text += f" | {shed} atıldı"
+        
+    def set_progress(self, percent, eta_text):
+        """Video dosyası ilerlemesini durum satırında göster"""
+        self.progress_text = f" | %{percent:.0f}, kalan {eta_text}" if percent is not None else ""
+        
     def show_error(self, error_message):
         """Hata göster"""
         self.video_label.setText(f"HATA:\n{error_message}")
@@ -139,29 +232,29 @@ class VideoWidget(QWidget):
         
     def on_video_click(self, event):
         """Video tıklandığında"""
-        if self.current_frame is not None:
+        if self.frame_size is not None and self.shown_size is not None:
             # Tıklanan pozisyonu al
             pos = event.position()
-            x, y = int(pos.x()), int(pos.y())
-            
-            # Gerçek frame koordinatlarına çevir
-            label_size = self.video_label.size()
-            frame_h, frame_w = self.current_frame.shape[:2]
             
-            # Ölçekleme faktörlerini hesapla
-            scale_x = frame_w / label_size.width()
-            scale_y = frame_h / label_size.height()
+            # Görüntü alanında ortalanmış görüntünün sol üst köşesi
+            area = self.video_label.contentsRect()
+            shown_w, shown_h = self.shown_size
+            left = area.x() + (area.width() - shown_w) / 2
+            top = area.y() + (area.height() - shown_h) / 2
             
-            # Gerçek koordinatlar
-            real_x = int(x * scale_x)
-            real_y = int(y * scale_y)
+            # Gerçek frame koordinatlarına çevir
+            frame_w, frame_h = self.frame_size
+            real_x = int((pos.x() - left) * frame_w / shown_w)
+            real_y = int((pos.y() - top) * frame_h / shown_h)
             
-            # Sinyal gönder
-            self.frame_clicked.emit((real_x, real_y))
+            # Görüntünün yanındaki boş bantlara tıklandıysa yok say
+            if 0 <= real_x < frame_w and 0 <= real_y < frame_h:
+                self.frame_clicked.emit((real_x, real_y))
             
     def clear(self):
         """Widget'ı temizle"""
         self.video_label.clear()
         self.video_label.setText("Video bekleniyor...")
-        self.current_frame = None
+        self.frame_size = None
+        self.shown_size = None
         self.show_waiting()
\ No newline at end of file
@@ -3,19 +3,29 @@ src/ui/main_window.py
 Ana pencere UI sınıfı
 """
 
+import logging
+import math
 import os
 from PyQt6.QtWidgets import (QMainWindow, QVBoxLayout, QHBoxLayout, QWidget, 
                              QPushButton, QLabel, QComboBox, QSpinBox, QGroupBox,
-                             QFileDialog, QMessageBox, QProgressBar, QTextEdit,
-                             QSplitter, QFrame, QGridLayout)
+                             QFileDialog, QMessageBox, QProgressBar, QPlainTextEdit,
+                             QSplitter, QFrame, QGridLayout, QCheckBox)
 from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer
 from PyQt6.QtGui import QPixmap, QFont, QIcon
 
 from .components.video_widget import VideoWidget
 from .components.control_panel import ControlPanel
 from .components.stats_widget import StatsWidget
-from ..core.detection_thread import DetectionThread
+from ..core.process_pipeline import create_detection_runner
+from ..core.preloader import ModulePreloader
+from ..core.progress import format_duration
+from ..core.frame_pool import release
+from ..core.stream_source import is_stream_source, mask_url
 from ..utils.styles import MAIN_STYLE
+from ..utils.metrics import get_metrics
+from ..utils.soak_monitor import SoakMonitor
+from ..utils.log_pipeline import LogPipeline, PipelineHandler
+from ..utils.logger import add_log_sink, remove_log_sink
 
 class MainWindow(QMainWindow):
     """Ana pencere sınıfı"""
@@ -27,9 +37,32 @@ class MainWindow(QMainWindow):
         self.video_widgets = []
         self.source_count = 1
         
+        # Log tamponu (satırlar timer ile toplu olarak görünüme aktarılır);
+        # uygulama logger'ına ek bir hedef olarak bağlanır
+        self.logger = logging.getLogger("CivataDetection.ui")
+        self.log_pipeline = LogPipeline(config.log_rate_per_source, config.log_burst)
+        self.log_handler = add_log_sink(PipelineHandler(self.log_pipeline))
+        
+        # Soak modu
+        self.soak_monitor = None
+        self.soak_timer = None
+        self.soak_hours = None
+        self.start_when_ready = False  # Modüller yüklenince tespiti başlat
+        
         self.init_ui()
         self.setup_connections()
         
+        # torch/ultralytics pencere açıldıktan sonra arka planda yüklenir
+        self.preloader = ModulePreloader()
+        self.preloader.progress.connect(self.on_preload_progress)
+        self.preloader.loaded.connect(self.on_preload_finished)
+        self.control_panel.set_ready(False)
+        self.preloader.start()
+        
+        self.log_timer = QTimer(self)
+        self.log_timer.timeout.connect(self.flush_logs)
+        self.log_timer.start(config.log_flush_interval_ms)
+        
     def init_ui(self):
         """UI bileşenlerini oluştur"""
         self.setWindowTitle("YOLO Hasarlı Cıvata Tespit Sistemi v1.0")
@@ -53,6 +86,13 @@ class MainWindow(QMainWindow):
         right_panel = self.create_right_panel()
         main_layout.addWidget(right_panel, 1)
         
+        # Modül yükleme göstergesi
+        self.preload_bar = QProgressBar()
+        self.preload_bar.setRange(0, 100)
+        self.preload_bar.setMaximumWidth(200)
+        self.statusBar().addPermanentWidget(self.preload_bar)
+        self.statusBar().showMessage("Modüller yükleniyor...")
+        
         # Stil uygula
         self.setStyleSheet(MAIN_STYLE)
         
@@ -122,6 +162,18 @@ class MainWindow(QMainWindow):
         conf_layout.addWidget(self.conf_spinbox)
         layout.addLayout(conf_layout)
         
+        # Görüntüdeki etiketler (yalnızca ekran; kayıtlar etkilenmez)
+        overlay_layout = QHBoxLayout()
+        self.labels_checkbox = QCheckBox("Etiketler")
+        self.labels_checkbox.setChecked(self.config.display_show_labels)
+        self.labels_checkbox.toggled.connect(self.on_overlay_options_changed)
+        self.ids_checkbox = QCheckBox("Track ID")
+        self.ids_checkbox.setChecked(self.config.display_show_ids)
+        self.ids_checkbox.toggled.connect(self.on_overlay_options_changed)
+        overlay_layout.addWidget(self.labels_checkbox)
+        overlay_layout.addWidget(self.ids_checkbox)
+        layout.addLayout(overlay_layout)
+        
         return group
         
     def create_source_group(self):
@@ -133,7 +185,7 @@ class MainWindow(QMainWindow):
         source_layout = QHBoxLayout()
         source_layout.addWidget(QLabel("Kaynak Tipi:"))
         self.source_combo = QComboBox()
-        self.source_combo.addItems(["Kamera", "Video Dosyası"])
+        self.source_combo.addItems(["Kamera", "Video Dosyası", "Ağ Akışı (RTSP/HTTP)"])
         self.source_combo.currentTextChanged.connect(self.on_source_type_changed)
         source_layout.addWidget(self.source_combo)
         layout.addLayout(source_layout)
@@ -142,13 +194,13 @@ class MainWindow(QMainWindow):
         count_layout = QHBoxLayout()
         count_layout.addWidget(QLabel("Kaynak Sayısı:"))
         self.source_count_combo = QComboBox()
-        self.source_count_combo.addItems(["1", "2"])
+        self.source_count_combo.addItems([str(i) for i in range(1, self.config.max_sources + 1)])
         self.source_count_combo.currentTextChanged.connect(self.on_source_count_changed)
         count_layout.addWidget(self.source_count_combo)
         layout.addLayout(count_layout)
         
-        # Kaynak seçimi butonları
-        self.source_buttons_layout = QVBoxLayout()
+        # Kaynak seçimi butonları (iki sütun)
+        self.source_buttons_layout = QGridLayout()
         self.update_source_buttons()
         layout.addLayout(self.source_buttons_layout)
         
@@ -159,9 +211,10 @@ class MainWindow(QMainWindow):
         group = QGroupBox("Sistem Logları")
         layout = QVBoxLayout(group)
         
-        self.log_text = QTextEdit()
+        self.log_text = QPlainTextEdit()
         self.log_text.setMaximumHeight(150)
         self.log_text.setReadOnly(True)
+        self.log_text.setMaximumBlockCount(self.config.log_view_max_lines)
         layout.addWidget(self.log_text)
         
         return group
@@ -171,7 +224,7 @@ class MainWindow(QMainWindow):
         panel = QFrame()
         panel.setFrameStyle(QFrame.Shape.StyledPanel)
         
-        self.video_layout = QVBoxLayout(panel)
+        self.video_layout = QGridLayout(panel)
         self.video_layout.setSpacing(10)
         
         # Başlangıçta bir video widget'ı oluştur
@@ -186,11 +239,30 @@ class MainWindow(QMainWindow):
             widget.deleteLater()
         self.video_widgets.clear()
         
-        # Yeni widget'lar oluştur
+        # Yeni widget'lar oluştur (yaklaşık kare ızgara: 1, 2 -> 1 sütun, 3-4 -> 2, 5-9 -> 3)
+        columns = max(1, math.ceil(math.sqrt(self.source_count))) if self.source_count > 2 else 1
+        rows = math.ceil(self.source_count / columns)
         for i in range(self.source_count):
             video_widget = VideoWidget(f"Kaynak {i+1}")
+            video_widget.set_overlay_options(self.config.display_show_labels, self.config.display_show_ids)
+            video_widget.display_size_changed.connect(
+                lambda width, height, source_id=i: self.on_display_size_changed(source_id, width, height))
+            if rows > 2 or columns > 2:
+                video_widget.set_min_video_size(240, 180)
             self.video_widgets.append(video_widget)
-            self.video_layout.addWidget(video_widget)
+            self.video_layout.addWidget(video_widget, i // columns, i % columns)
+            
+    def on_overlay_options_changed(self):
+        """Etiket/ID gösterimini tüm video widget'larına uygula"""
+        self.config.display_show_labels = self.labels_checkbox.isChecked()
+        self.config.display_show_ids = self.ids_checkbox.isChecked()
+        for widget in self.video_widgets:
+            widget.set_overlay_options(self.config.display_show_labels, self.config.display_show_ids)
+            
+    def on_display_size_changed(self, source_id, width, height):
+        """Görüntü alanı boyutunu tespit thread'ine ilet (GUI'ye bu boyutta önizleme gelir)"""
+        if self.detection_thread:
+            self.detection_thread.set_preview_size(source_id, width, height)
             
     def update_source_buttons(self):
         """Kaynak seçim butonlarını güncelle"""
@@ -204,7 +276,7 @@ class MainWindow(QMainWindow):
         for i in range(self.source_count):
             button = QPushButton(f"Kaynak {i+1} Seç")
             button.clicked.connect(lambda checked, idx=i: self.select_source(idx))
-            self.source_buttons_layout.addWidget(button)
+            self.source_buttons_layout.addWidget(button, i // 2, i % 2)
             
     def select_model(self):
         """Model dosyası seç"""
@@ -247,7 +319,7 @@ class MainWindow(QMainWindow):
             
             if compatibility['warnings']:
                 for warning in compatibility['warnings']:
-                    self.log_message(f"UYARI: {warning}")
+                    self.logger.warning(f"UYARI: {warning}")
             else:
                 self.log_message("✅ Model uyumluluk kontrolü başarılı")
             
@@ -260,9 +332,13 @@ class MainWindow(QMainWindow):
                 self,
                 f"Video Dosyası Seç - Kaynak {index+1}",
                 "",
-                "Video Dosyaları (*.mp4 *.avi *.mov *.mkv);;Tüm Dosyalar (*)"
+                "Video Dosyaları (*.mp4 *.avi *.mov *.mkv);;Rawcap Kaydı (meta.json);;Tüm Dosyalar (*)"
             )
             
+            # Rawcap kaydı klasör olarak seçilir (içindeki meta.json üzerinden)
+            if file_path and os.path.basename(file_path) == "meta.json":
+                file_path = os.path.dirname(file_path)
+                
             if file_path:
                 # Video dosyası seçildi
                 self.config.sources[index] = file_path
@@ -273,7 +349,13 @@ class MainWindow(QMainWindow):
                 today_folder = datetime.now().strftime("%d%m%Y")
                 
                 self.log_message(f"Video seçildi: {filename}")
-                self.log_message(f"Video çalışma sırasında src/source/{today_folder}/ klasörüne kopyalanacak")
+                self.log_message(f"Video arka planda src/source/{today_folder}/ klasörüne arşivlenecek")
+                
+        elif source_type == "Ağ Akışı (RTSP/HTTP)":
+            url, ok = self.get_stream_url(index)
+            if ok:
+                self.config.sources[index] = url
+                self.log_message(f"Ağ akışı seçildi: {mask_url(url)} (Kaynak {index+1})")
                 
         else:
             # Kamera seçimi için dialog
@@ -299,6 +381,24 @@ class MainWindow(QMainWindow):
         
         return camera_id, ok
         
+    def get_stream_url(self, index):
+        """Ağ akışı adresi için dialog"""
+        from PyQt6.QtWidgets import QInputDialog
+        
+        current = self.config.sources.get(index)
+        url, ok = QInputDialog.getText(
+            self,
+            "Ağ Akışı",
+            "Akış adresi (rtsp://kullanici:sifre@ip:554/... veya http://...):",
+            text=current if is_stream_source(current) else "rtsp://"
+        )
+        url = url.strip()
+        
+        if ok and not is_stream_source(url):
+            QMessageBox.warning(self, "Uyarı", f"Desteklenmeyen akış adresi: {url}")
+            return url, False
+        return url, ok
+        
     def on_source_type_changed(self, source_type):
         """Kaynak tipi değiştiğinde"""
         self.log_message(f"Kaynak tipi değiştirildi: {source_type}")
@@ -320,7 +420,10 @@ class MainWindow(QMainWindow):
             
     def start_detection(self):
         """Tespit işlemini başlat"""
-        if not self.config.model_path:
+        # Sunucu modunda model çıkarım sunucusunda yüklüdür
+        use_server = self.config.inference_backend == "server"
+        
+        if not use_server and not self.config.model_path:
             QMessageBox.warning(self, "Uyarı", "Lütfen önce bir model seçin!")
             return
             
@@ -329,21 +432,26 @@ class MainWindow(QMainWindow):
             return
         
         # Model dosyası kontrolü
-        if not os.path.exists(self.config.model_path):
+        if not use_server and not os.path.exists(self.config.model_path):
             QMessageBox.critical(self, "Hata", f"Model dosyası bulunamadı:\n{self.config.model_path}")
             return
             
         try:
             self.log_message("Tespit işlemi başlatılıyor...")
-            self.log_message(f"Model: {self.config.model_path}")
+            if use_server:
+                self.log_message(f"Çıkarım sunucusu: {self.config.inference_server_address}")
+            else:
+                self.log_message(f"Model: {self.config.model_path}")
             self.log_message(f"Kaynak sayısı: {self.config.source_count}")
             
             # Tespit thread'ini oluştur ve başlat
-            self.detection_thread = DetectionThread(self.config)
+            self.detection_thread = create_detection_runner(self.config)
             self.detection_thread.frame_ready.connect(self.update_frame)
             self.detection_thread.detection_stats.connect(self.update_stats)
-            self.detection_thread.log_message.connect(self.log_message)
             self.detection_thread.error_occurred.connect(self.handle_error)
+            self.detection_thread.finished.connect(self.on_detection_finished)
+            for i, widget in enumerate(self.video_widgets):
+                self.detection_thread.set_preview_size(i, *widget.display_size())
             
             self.detection_thread.start()
             self.log_message("Tespit işlemi başlatıldı")
@@ -364,6 +472,12 @@ class MainWindow(QMainWindow):
             self.detection_thread.wait()
             self.log_message("Tespit işlemi durduruldu")
             
+    def on_detection_finished(self):
+        """Tespit kendiliğinden bittiyse (ör. tüm video dosyaları işlendi) butonları sıfırla"""
+        if hasattr(self, 'control_panel') and self.control_panel.is_running:
+            self.control_panel.reset_states()
+            self.log_message("Tespit işlemi tamamlandı")
+            
     def pause_detection(self):
         """Tespit işlemini duraklat/devam ettir"""
         if self.detection_thread:
@@ -373,29 +487,115 @@ class MainWindow(QMainWindow):
             
     def update_frame(self, frame_data):
         """Frame'i güncelle"""
-        source_id, frame = frame_data
+        source_id, frame, detections, source_size = frame_data
+        get_metrics().add_gauge("civata_queue_depth", -1, queue="ui_frames", source=source_id)
         if source_id < len(self.video_widgets):
-            self.video_widgets[source_id].update_frame(frame)
+            self.video_widgets[source_id].update_frame(frame, detections, source_size)
+        # Widget görüntüyü QPixmap'e kopyaladı; tampon havuza dönebilir
+        release(frame)
             
     def update_stats(self, stats):
         """İstatistikleri güncelle"""
         if hasattr(self, 'stats_widget'):
             self.stats_widget.update_stats(stats)
             
+        # Kaynak başına zamanlayıcı FPS'i
+        for entry in stats.get('scheduler', []):
+            if entry['source'] < len(self.video_widgets):
+                self.video_widgets[entry['source']].set_rate(entry['achieved_fps'], entry['target_fps'],
+                                                             entry.get('shed', 0))
+                
+        # Video dosyası ilerlemesi ve kalan süre
+        for entry in stats.get('progress', []):
+            if entry['source'] < len(self.video_widgets):
+                self.video_widgets[entry['source']].set_progress(entry['percent'], format_duration(entry['eta']))
+            
     def log_message(self, message):
-        """Log mesajı ekle"""
-        from datetime import datetime
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        formatted_message = f"[{timestamp}] {message}"
-        self.log_text.append(formatted_message)
+        """Log mesajı ekle (dosyaya yazılır, bir sonraki flush'ta görünür)"""
+        self.logger.info(message)
+        
+    def flush_logs(self):
+        """Tampondaki satırları tek seferde görünüme ekle"""
+        lines = self.log_pipeline.drain()
+        if not lines:
+            return
+            
+        self.log_text.appendPlainText("\n".join(lines))
         
         # Auto-scroll
         scrollbar = self.log_text.verticalScrollBar()
         scrollbar.setValue(scrollbar.maximum())
         
+    def on_preload_progress(self, percent, label):
+        """Modül yükleme ilerlemesi"""
+        self.preload_bar.setValue(percent)
+        self.statusBar().showMessage(f"{label} yükleniyor..." if percent < 100 else "Hazır")
+        
+    def on_preload_finished(self, success, error):
+        """Modüller yüklendi; başlat butonunu aç"""
+        self.preload_bar.hide()
+        if success:
+            self.statusBar().showMessage("Hazır", 5000)
+        else:
+            # Hata tespit başlatılınca model yüklemede tekrar raporlanır
+            self.statusBar().showMessage(error)
+        self.control_panel.set_ready(True)
+        
+        if self.start_when_ready:
+            self.start_when_ready = False
+            self.control_panel.on_start_clicked()
+            
+    def start_soak(self, hours):
+        """Konfigürasyondaki kaynaklarla döngüsel uzun süreli test başlat"""
+        self.soak_hours = hours
+        self.config.loop_video_files = True
+        
+        # Arayüzü konfigürasyondaki kaynak sayısına getir
+        self.source_count_combo.setCurrentText(str(self.config.source_count))
+        
+        self.soak_monitor = SoakMonitor(self.config, self.config.logs_dir)
+        self.soak_monitor.add_probe("tracked_objects", self.tracked_object_count)
+        self.soak_monitor.add_probe(
+            "queue_depth", lambda: sum(get_metrics().series("civata_queue_depth").values()))
+        self.soak_monitor.add_probe("log_lines", lambda: self.log_text.document().blockCount())
+        self.soak_monitor.start()
+        
+        self.soak_timer = QTimer(self)
+        self.soak_timer.timeout.connect(self.on_soak_tick)
+        self.soak_timer.start(int(self.config.soak_sample_interval * 1000))
+        
+        self.log_message(f"Soak modu başlatıldı: {hours} saat")
+        if self.control_panel.is_ready:
+            self.control_panel.on_start_clicked()
+        else:
+            self.start_when_ready = True
+        
+    def tracked_object_count(self):
+        """Takip edilen hasarlı nesne sayısı"""
+        if self.detection_thread is None:
+            return 0
+        return sum(len(ids) for ids in self.detection_thread.tracked_objects.values())
+        
+    def on_soak_tick(self):
+        """Soak örneği al, süre dolduysa testi bitir"""
+        sample = self.soak_monitor.sample()
+        self.log_message(f"Soak - RSS: {sample['rss_mb']:.1f} MB, Heap: {sample['heap_mb']:.1f} MB")
+        
+        if sample['elapsed'] >= self.soak_hours * 3600:
+            self.soak_timer.stop()
+            self.control_panel.on_stop_clicked()
+            passed = self.soak_monitor.finish()
+            self.log_message(f"Soak raporu: {self.soak_monitor.report_path}")
+            if passed:
+                self.log_message("✅ Soak testi başarılı")
+            else:
+                for failure in self.soak_monitor.failures:
+                    self.logger.error(f"Soak limiti aşıldı: {failure}")
+            self.soak_monitor = None
+            
     def handle_error(self, error_message):
         """Hata işleme"""
-        self.log_message(f"HATA: {error_message}")
+        self.logger.error(error_message)
         QMessageBox.critical(self, "Hata", error_message)
         
     def closeEvent(self, event):
@@ -403,4 +603,6 @@ class MainWindow(QMainWindow):
         if self.detection_thread and self.detection_thread.isRunning():
             self.detection_thread.stop()
             self.detection_thread.wait()
+        self.preloader.wait()
+        remove_log_sink(self.log_handler)
         event.accept()
\ No newline at end of file
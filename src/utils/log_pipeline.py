@@ -0,0 +1,139 @@
+"""
+src/utils/log_pipeline.py
+Thread-safe, hız sınırlı ve tekrar bastıran log tamponu
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+from .metrics import get_metrics
+
+
+class _TokenBucket:
+    """Basit token bucket hız sınırlayıcı"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def take(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class LogPipeline:
+    """
+    Log satırlarını GUI thread'i dışında biriktirir.
+
+    - Aynı kaynaktan art arda gelen aynı mesaj tek satıra indirgenir
+      ("... (N kez tekrarlandı)").
+    - Her kaynak (source) için ayrı token bucket hız sınırı uygulanır.
+    - drain() biriken satırları ve bastırılan mesaj özetlerini döndürür;
+      GUI bunu bir timer ile toplu olarak çağırır.
+    """
+
+    GLOBAL_KEY = "genel"
+
+    def __init__(self, rate_per_source=5.0, burst=20, max_pending=1000):
+        self.rate_per_source = rate_per_source
+        self.burst = burst
+        self.lock = threading.Lock()
+        self.pending = deque(maxlen=max_pending)
+        self.buckets = {}
+        self.last_message = {}  # {key: [mesaj, tekrar sayısı, ilk zaman damgası]}
+        self.suppressed = {}  # {key: hız sınırı nedeniyle bastırılan sayısı (son drain'den beri)}
+        self.suppressed_total = 0
+        self.repeated_total = 0
+        self.overflow_total = 0
+        self.metrics = get_metrics()
+
+    def push(self, message, source=None):
+        """Log satırı ekle (herhangi bir thread'den çağrılabilir)"""
+        key = self.GLOBAL_KEY if source is None else str(source)
+        now = time.monotonic()
+        timestamp = datetime.now().strftime("%H:%M:%S")
+
+        with self.lock:
+            # Tekrar bastırma
+            last = self.last_message.get(key)
+            if last is not None and last[0] == message:
+                last[1] += 1
+                self.repeated_total += 1
+                self.metrics.inc("civata_log_suppressed_total", 1, "Bastırılan log satırı sayısı",
+                                 reason="duplicate", source=key)
+                return
+            self._flush_repeat(key)
+
+            # Kaynak bazında hız sınırı
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                bucket = self.buckets[key] = _TokenBucket(self.rate_per_source, self.burst)
+            if not bucket.take(now):
+                self.suppressed[key] = self.suppressed.get(key, 0) + 1
+                self.suppressed_total += 1
+                self.metrics.inc("civata_log_suppressed_total", 1, "Bastırılan log satırı sayısı",
+                                 reason="rate_limit", source=key)
+                return
+
+            self.last_message[key] = [message, 0, timestamp]
+            self._append(f"[{timestamp}] {message}")
+
+    def _append(self, line):
+        if len(self.pending) == self.pending.maxlen:
+            self.overflow_total += 1
+        self.pending.append(line)
+
+    def _flush_repeat(self, key):
+        """Bekleyen tekrar sayısını satır olarak yaz"""
+        last = self.last_message.get(key)
+        if last is not None and last[1] > 0:
+            self._append(f"[{last[2]}] {last[0]} ({last[1]} kez tekrarlandı)")
+            last[1] = 0
+
+    def drain(self):
+        """Biriken satırları al ve tamponu boşalt"""
+        with self.lock:
+            for key in list(self.last_message):
+                self._flush_repeat(key)
+
+            for key, count in self.suppressed.items():
+                if count:
+                    label = "Genel" if key == self.GLOBAL_KEY else f"Kaynak {key}"
+                    self._append(f"[{datetime.now().strftime('%H:%M:%S')}] "
+                                 f"{label}: {count} mesaj bastırıldı (hız sınırı)")
+            self.suppressed.clear()
+
+            lines = list(self.pending)
+            self.pending.clear()
+            return lines
+
+    def pending_count(self):
+        """Bekleyen satır sayısı"""
+        with self.lock:
+            return len(self.pending)
+
+
+class PipelineHandler(logging.Handler):
+    """logging kayıtlarını LogPipeline'a aktaran handler (GUI log görünümü için)"""
+
+    def __init__(self, pipeline, level=logging.INFO):
+        super().__init__(level)
+        self.pipeline = pipeline
+
+    def emit(self, record):
+        try:
+            message = record.getMessage()
+            if record.levelno >= logging.ERROR and not message.startswith("HATA"):
+                message = f"HATA: {message}"
+            self.pipeline.push(message, getattr(record, 'source', None))
+        except Exception:
+            self.handleError(record)
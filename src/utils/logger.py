@@ -3,20 +3,106 @@ src/utils/logger.py
 Logging yardımcı fonksiyonları
 """
 
+import atexit
+import json
 import logging
+import logging.handlers
 import os
+import queue
 from datetime import datetime
 from pathlib import Path
 
-def setup_logger(name="CivataDetection", level=logging.INFO):
-    """Logger kurulumu"""
+# Aktif QueueListener ve kuyruğu (setup_logger tekrar çağrılırsa eskisi durdurulur)
+_listener = None
+_log_queue = None
+_hooks_registered = False  # atexit ve metrik toplayıcı yalnızca bir kez eklenir
+
+def _stop_listener():
+    """Çıkışta kuyrukta kalan kayıtları yazıp listener'ı durdur"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+def _collect_queue_depth(registry):
+    """Aktif log kuyruğunun derinliğini metrik olarak yayınla"""
+    if _log_queue is not None:
+        registry.set_gauge("civata_queue_depth", _log_queue.qsize(),
+                           "Bekleyen öğe sayısı", queue="log_records")
+
+class SizedTimedRotatingFileHandler(logging.handlers.TimedRotatingFileHandler):
+    """Hem zamana (ör. gece yarısı) hem boyuta göre dönen dosya handler'ı"""
+    
+    def __init__(self, filename, max_bytes=0, **kwargs):
+        super().__init__(filename, **kwargs)
+        self.max_bytes = max_bytes
+        
+    def shouldRollover(self, record):
+        if super().shouldRollover(record):
+            return True
+        if self.max_bytes > 0:
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.seek(0, 2)
+            return self.stream.tell() + len(self.format(record)) + 1 >= self.max_bytes
+        return False
+        
+    def rotation_filename(self, default_name):
+        """Hedef dosya varsa üzerine yazmak yerine sıra numarası ekle"""
+        name = super().rotation_filename(default_name)
+        if not os.path.exists(name):
+            return name
+        counter = 1
+        while os.path.exists(f"{name}.{counter}"):
+            counter += 1
+        return f"{name}.{counter}"
+        
+    def rotate(self, source, dest):
+        """Döndürülen dosyayı disk kotası yöneticisine bildir"""
+        super().rotate(source, dest)
+        from .storage_manager import track_file
+        track_file("logs", dest)
+
+class JsonLinesFormatter(logging.Formatter):
+    """Her kaydı tek satır JSON olarak yaz (source/track_id alanlarıyla)"""
+    
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'message': record.getMessage(),
+        }
+        for field in ('source', 'track_id'):
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+def setup_logger(name="CivataDetection", level=logging.INFO, config=None):
+    """
+    Logger kurulumu
+    
+    Kayıtlar QueueHandler ile kuyruğa yazılır; dosya ve konsol handler'ları
+    ayrı bir QueueListener thread'inde çalışır, böylece disk yazımı tespit
+    thread'ini bloklamaz. Ayarlar verilen config nesnesinden okunur.
+    """
+    global _listener, _log_queue, _hooks_registered
+    
+    log_dir = Path(getattr(config, 'logs_dir', "logs"))
+    json_format = getattr(config, 'log_json', False)
+    max_bytes = getattr(config, 'log_max_bytes', 10 * 1024 * 1024)
+    backup_count = getattr(config, 'log_backup_count', 14)
+    rotate_when = getattr(config, 'log_rotate_when', "midnight")
     
     # Logs klasörünü oluştur
-    log_dir = Path("logs")
-    log_dir.mkdir(exist_ok=True)
+    log_dir.mkdir(parents=True, exist_ok=True)
     
-    # Log dosyası adı (tarih ile)
-    log_filename = f"civata_detection_{datetime.now().strftime('%Y%m%d')}.log"
+    # Log dosyası adı (döndürülen dosyalara tarih soneki eklenir)
+    log_filename = "civata_detection.jsonl" if json_format else "civata_detection.log"
     log_filepath = log_dir / log_filename
     
     # Logger oluştur
@@ -24,6 +110,7 @@ def setup_logger(name="CivataDetection", level=logging.INFO):
     logger.setLevel(level)
     
     # Eğer handler'lar zaten varsa temizle
+    _stop_listener()
     if logger.handlers:
         logger.handlers.clear()
     
@@ -33,17 +120,37 @@ def setup_logger(name="CivataDetection", level=logging.INFO):
         datefmt='%Y-%m-%d %H:%M:%S'
     )
     
-    # File handler
-    file_handler = logging.FileHandler(log_filepath, encoding='utf-8')
+    # File handler (boyut + zaman bazlı döndürme, eski dosyalar backup_count ile sınırlı)
+    file_handler = SizedTimedRotatingFileHandler(
+        log_filepath, max_bytes=max_bytes, when=rotate_when,
+        backupCount=backup_count, encoding='utf-8'
+    )
     file_handler.setLevel(level)
-    file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+    file_handler.setFormatter(JsonLinesFormatter() if json_format else formatter)
     
     # Console handler
     console_handler = logging.StreamHandler()
     console_handler.setLevel(level)
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    
+    # Kuyruk: logger -> QueueHandler -> QueueListener thread'i -> dosya/konsol
+    _log_queue = queue.SimpleQueue()
+    logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+    _listener = logging.handlers.QueueListener(
+        _log_queue, file_handler, console_handler, respect_handler_level=True
+    )
+    _listener.start()
+    
+    # Aktif log dosyası disk kotası tarafından silinmez
+    from .storage_manager import watch_file
+    watch_file("logs", log_filepath)
+    
+    # Çıkış kancası ve kuyruk derinliği metriği her zaman aktif kuyruğu kullanır
+    if not _hooks_registered:
+        atexit.register(_stop_listener)
+        from .metrics import get_metrics
+        get_metrics().add_collector(_collect_queue_depth)
+        _hooks_registered = True
     
     # İlk log mesajı
     logger.info("Logger başlatıldı")
@@ -51,6 +158,15 @@ def setup_logger(name="CivataDetection", level=logging.INFO):
     
     return logger
 
+def add_log_sink(handler, name="CivataDetection"):
+    """Logger'a ek bir hedef (ör. GUI log görünümü) ekle"""
+    logging.getLogger(name).addHandler(handler)
+    return handler
+
+def remove_log_sink(handler, name="CivataDetection"):
+    """Eklenen hedefi kaldır"""
+    logging.getLogger(name).removeHandler(handler)
+
 def log_system_info(logger):
     """Sistem bilgilerini logla"""
     import platform
@@ -196,31 +312,6 @@ def create_error_report(logger, error, context=None):
     except Exception as e:
         logger.error(f"Hata raporu oluşturma hatası: {e}")
 
-def cleanup_old_logs(days_to_keep=30):
-    """Eski log dosyalarını temizle"""
-    try:
-        log_dir = Path("logs")
-        if not log_dir.exists():
-            return
-            
-        current_time = datetime.now()
-        deleted_count = 0
-        
-        for log_file in log_dir.glob("*.log"):
-            # Dosya yaş bilgisini al
-            file_time = datetime.fromtimestamp(log_file.stat().st_mtime)
-            age_days = (current_time - file_time).days
-            
-            if age_days > days_to_keep:
-                log_file.unlink()
-                deleted_count += 1
-                
-        if deleted_count > 0:
-            print(f"{deleted_count} eski log dosyası temizlendi")
-            
-    except Exception as e:
-        print(f"Log temizleme hatası: {e}")
-
 # Logger instance'ı global olarak kullanım için
 app_logger = None
 
@@ -0,0 +1,302 @@
+"""
+src/utils/metrics.py
+Prometheus metin formatında yerel metrik endpoint'i
+"""
+
+import os
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Gecikme histogramları için varsayılan sınırlar (saniye)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+def _format_labels(labels):
+    """Label tuple'ını Prometheus formatına çevir"""
+    if not labels:
+        return ""
+    parts = []
+    for key, value in labels:
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        parts.append(f'{key}="{value}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def _format_value(value):
+    """Sayıyı Prometheus formatına çevir"""
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _key(name, labels):
+    """Metrik anahtarı; label değerleri string olarak saklanır"""
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class RateMeter:
+    """Kayan pencere üzerinden olay hızı (olay/saniye) hesaplar"""
+
+    def __init__(self, window=2.0):
+        self.window = window
+        self.count = 0
+        self.window_start = time.monotonic()
+        self.rate = 0.0
+
+    def tick(self, n=1):
+        """Olay kaydet, pencere dolduysa hızı güncelle"""
+        self.count += n
+        now = time.monotonic()
+        elapsed = now - self.window_start
+        if elapsed >= self.window:
+            self.rate = self.count / elapsed
+            self.count = 0
+            self.window_start = now
+        return self.rate
+
+
+class MetricsRegistry:
+    """Counter, gauge ve histogram değerlerini thread-safe şekilde tutar"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._types = {}
+        self._help = {}
+        self._counters = defaultdict(float)  # {(name, labels): value}
+        self._gauges = {}
+        self._histograms = {}  # {(name, labels): [bucket_counts, sum, count]}
+        self._buckets = {}
+        self._collectors = []
+
+    def _declare(self, name, metric_type, help_text):
+        if name not in self._types:
+            self._types[name] = metric_type
+            self._help[name] = help_text
+
+    def inc(self, name, value=1, help_text="", **labels):
+        """Counter artır"""
+        key = _key(name, labels)
+        with self._lock:
+            self._declare(name, "counter", help_text)
+            self._counters[key] += value
+
+    def set_gauge(self, name, value, help_text="", **labels):
+        """Gauge değeri ata"""
+        key = _key(name, labels)
+        with self._lock:
+            self._declare(name, "gauge", help_text)
+            self._gauges[key] = value
+
+    def add_gauge(self, name, delta, help_text="", **labels):
+        """Gauge değerini artır/azalt (kuyruk derinliği gibi)"""
+        key = _key(name, labels)
+        with self._lock:
+            self._declare(name, "gauge", help_text)
+            self._gauges[key] = self._gauges.get(key, 0) + delta
+
+    def observe(self, name, value, help_text="", buckets=DEFAULT_BUCKETS, **labels):
+        """Histogram'a gözlem ekle"""
+        key = _key(name, labels)
+        with self._lock:
+            self._declare(name, "histogram", help_text)
+            bounds = self._buckets.setdefault(name, tuple(buckets))
+            entry = self._histograms.get(key)
+            if entry is None:
+                entry = [[0] * len(bounds), 0.0, 0]
+                self._histograms[key] = entry
+            for i, bound in enumerate(bounds):
+                if value <= bound:
+                    entry[0][i] += 1
+                    break
+            entry[1] += value
+            entry[2] += 1
+
+    def add_collector(self, collector):
+        """Her okumada çağrılacak toplayıcı ekle: collector(registry)"""
+        with self._lock:
+            self._collectors.append(collector)
+
+    def get(self, name, **labels):
+        """Counter/gauge değerini döndür (yoksa 0)"""
+        key = _key(name, labels)
+        with self._lock:
+            if key in self._gauges:
+                return self._gauges[key]
+            return self._counters.get(key, 0)
+
+    def series(self, name):
+        """Bir metriğin tüm label kombinasyonlarını {labels: değer} olarak döndür"""
+        with self._lock:
+            values = {labels: value for (key, labels), value in self._gauges.items() if key == name}
+            values.update({labels: value for (key, labels), value in self._counters.items() if key == name})
+        return values
+
+    def reset(self):
+        """Tüm metrikleri temizle (toplayıcılar korunur)"""
+        with self._lock:
+            self._types.clear()
+            self._help.clear()
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+            self._buckets.clear()
+
+    def render(self):
+        """Prometheus text exposition formatında çıktı üret"""
+        for collector in list(self._collectors):
+            try:
+                collector(self)
+            except Exception:
+                pass
+
+        with self._lock:
+            series = defaultdict(list)
+            for (name, labels), value in self._counters.items():
+                series[name].append((labels, value))
+            for (name, labels), value in self._gauges.items():
+                series[name].append((labels, value))
+            histograms = defaultdict(list)
+            for (name, labels), entry in self._histograms.items():
+                histograms[name].append((labels, [list(entry[0]), entry[1], entry[2]]))
+
+            lines = []
+            for name in sorted(self._types):
+                metric_type = self._types[name]
+                if self._help.get(name):
+                    lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} {metric_type}")
+
+                if metric_type == "histogram":
+                    bounds = self._buckets[name]
+                    for labels, (bucket_counts, total, count) in sorted(histograms[name]):
+                        cumulative = 0
+                        for bound, bucket_count in zip(bounds, bucket_counts):
+                            cumulative += bucket_count
+                            le_labels = labels + (("le", _format_value(float(bound))),)
+                            lines.append(f"{name}_bucket{_format_labels(le_labels)} {cumulative}")
+                        inf_labels = labels + (("le", "+Inf"),)
+                        lines.append(f"{name}_bucket{_format_labels(inf_labels)} {count}")
+                        lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(total)}")
+                        lines.append(f"{name}_count{_format_labels(labels)} {count}")
+                else:
+                    for labels, value in sorted(series[name]):
+                        lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        return "\n".join(lines) + "\n"
+
+
+def process_collector(registry):
+    """Süreç RSS ve CPU kullanımını topla (psutil varsa)"""
+    try:
+        import psutil
+    except ImportError:
+        return
+
+    process = getattr(process_collector, "_process", None)
+    if process is None:
+        process = psutil.Process(os.getpid())
+        process.cpu_percent(None)  # İlk çağrı her zaman 0 döner
+        process_collector._process = process
+
+    registry.set_gauge("civata_process_resident_memory_bytes", process.memory_info().rss,
+                       "Uygulama RSS bellek kullanımı")
+    registry.set_gauge("civata_process_cpu_percent", process.cpu_percent(None),
+                       "Uygulama CPU kullanımı (son okumadan beri)")
+    cpu_times = process.cpu_times()
+    registry.set_gauge("civata_process_cpu_seconds", cpu_times.user + cpu_times.system,
+                       "Toplam kullanıcı + sistem CPU süresi")
+    registry.set_gauge("civata_process_threads", process.num_threads(),
+                       "Süreçteki thread sayısı")
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """/metrics isteklerini karşılayan handler"""
+
+    registry = None
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+
+        body = self.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Her scrape isteğini konsola yazma
+        pass
+
+
+class MetricsServer:
+    """Arka plan thread'inde çalışan HTTP metrik sunucusu"""
+
+    def __init__(self, registry, host="127.0.0.1", port=9108):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self.httpd = None
+        self.thread = None
+
+    def start(self):
+        """Sunucuyu başlat; port 0 ise boş bir port seçilir"""
+        handler = type("MetricsHandler", (_MetricsHandler,), {"registry": self.registry})
+        self.httpd = ThreadingHTTPServer((self.host, self.port), handler)
+        self.httpd.daemon_threads = True
+        self.port = self.httpd.server_address[1]
+
+        self.thread = threading.Thread(target=self.httpd.serve_forever,
+                                       name="metrics-server", daemon=True)
+        self.thread.start()
+        return self.port
+
+    def stop(self):
+        """Sunucuyu durdur"""
+        if self.httpd is not None:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
+        if self.thread is not None:
+            self.thread.join(timeout=2)
+            self.thread = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}/metrics"
+
+
+# Uygulama genelinde tek registry
+metrics_registry = None
+
+
+def get_metrics():
+    """Global metrik registry'sini döndür"""
+    global metrics_registry
+    if metrics_registry is None:
+        metrics_registry = MetricsRegistry()
+        metrics_registry.add_collector(process_collector)
+    return metrics_registry
+
+
+def start_metrics_server(config, logger=None):
+    """Konfigürasyona göre metrik sunucusunu başlat"""
+    if not getattr(config, "metrics_enabled", False):
+        return None
+
+    try:
+        server = MetricsServer(get_metrics(), config.metrics_host, config.metrics_port)
+        server.start()
+        if logger:
+            logger.info(f"Metrik endpoint'i başlatıldı: {server.url}")
+        return server
+    except Exception as e:
+        if logger:
+            logger.error(f"Metrik sunucusu başlatılamadı: {e}")
+        return None
@@ -3,9 +3,10 @@ src/utils/model_loader.py
 Basit YOLO model yükleyici
 """
 
-import torch
+import logging
 import os
-from ultralytics import YOLO
+
+logger = logging.getLogger("CivataDetection.model")
 
 def load_yolo_model_safe(model_path):
     """
@@ -21,34 +22,21 @@ def load_yolo_model_safe(model_path):
     if not os.path.exists(model_path):
         raise Exception(f"Model dosyası bulunamadı: {model_path}")
     
+    # torch/ultralytics açılışı yavaşlatmasın diye ilk kullanımda import edilir
+    import torch
+    from ultralytics import YOLO
+    
     # PyTorch 2.6+ için basit düzeltme
     original_load = torch.load
     torch.load = lambda *args, **kwargs: original_load(*args, **{**kwargs, 'weights_only': False})
     
     try:
         model = YOLO(model_path)
-        print(f"✅ Model yüklendi: {model_path}")
+        logger.info(f"✅ Model yüklendi: {model_path}")
         return model
     finally:
         torch.load = original_load
 
-def check_model_compatibility(model_path):
-    """Basit model kontrolü"""
-    
-    result = {
-        'exists': os.path.exists(model_path),
-        'format': 'PyTorch' if model_path.endswith('.pt') else 'ONNX',
-        'size_mb': round(os.path.getsize(model_path) / (1024*1024), 2) if os.path.exists(model_path) else 0,
-        'compatible': True,
-        'warnings': []
-    }
-    
-    if not result['exists']:
-        result['warnings'].append("Model dosyası bulunamadı")
-        result['compatible'] = False
-    
-    return result
-
 if __name__ == "__main__":
     # Test
     model_path = "src/models/best.pt"
@@ -72,6 +60,9 @@ def check_model_compatibility(model_path):
     import os
     from pathlib import Path
     
+    # torch yalnızca model seçilirken gerekir; açılışta import edilmez
+    import torch
+    
     result = {
         'exists': False,
         'format': None,
@@ -121,6 +112,8 @@ def check_model_compatibility(model_path):
 # Test fonksiyonu
 def test_model_loading():
     """Model yükleme testleri"""
+    import torch
+    from ultralytics import YOLO
     
     print("🧪 Model Yükleme Test Başlıyor...")
     print(f"PyTorch Versiyonu: {torch.__version__}")
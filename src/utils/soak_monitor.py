@@ -0,0 +1,205 @@
+"""
+src/utils/soak_monitor.py
+Uzun süreli (soak) çalıştırmalarda bellek ve kuyruk büyümesini izleyen yardımcı
+"""
+
+import gc
+import json
+import os
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+
+def linear_slope(times, values):
+    """En küçük kareler eğimi (birim/saniye)"""
+    count = len(times)
+    if count < 2:
+        return 0.0
+    mean_t = sum(times) / count
+    mean_v = sum(values) / count
+    denominator = sum((t - mean_t) ** 2 for t in times)
+    if denominator == 0:
+        return 0.0
+    return sum((t - mean_t) * (v - mean_v) for t, v in zip(times, values)) / denominator
+
+
+def object_type_counts():
+    """GC tarafından izlenen nesnelerin tip bazında sayısı"""
+    return Counter(type(obj).__name__ for obj in gc.get_objects())
+
+
+def current_rss():
+    """Süreç RSS (byte), psutil yoksa 0"""
+    try:
+        import psutil
+        return psutil.Process(os.getpid()).memory_info().rss
+    except Exception:
+        return 0
+
+
+class SoakMonitor:
+    """
+    Belirli aralıklarla RSS, Python heap'i (tracemalloc), tip bazında
+    nesne sayıları ve kayıtlı probe değerlerini (kuyruk boyutları vb.)
+    örnekler. Isınma süresinden sonraki örneklere doğrusal eğim
+    uydurur ve saatlik büyüme limit aşılırsa çalıştırmayı başarısız sayar.
+    """
+
+    def __init__(self, config, report_dir="logs"):
+        self.interval = config.soak_sample_interval
+        self.warmup = config.soak_warmup_seconds
+        self.max_rss_slope = config.soak_max_rss_slope_mb_per_hour
+        self.max_heap_slope = config.soak_max_heap_slope_mb_per_hour
+        self.probe_limits = dict(config.soak_probe_slope_limits)
+        self.top_n = config.soak_top_allocators
+        self.report_dir = Path(report_dir)
+
+        self.probes = {}  # {isim: callable -> sayı}
+        self.samples = []
+        self.start_time = None
+        self.baseline_snapshot = None
+        self.baseline_objects = None
+        self.failures = []
+        self.report_path = None
+
+    def add_probe(self, name, func):
+        """Her örnekte okunacak sayısal değer ekle (ör. kuyruk boyutu)"""
+        self.probes[name] = func
+
+    def start(self):
+        """tracemalloc'u başlat ve ilk örneği al"""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(1)
+        self.start_time = time.monotonic()
+        self.sample()
+
+    def sample(self):
+        """Tek bir örnek al"""
+        elapsed = time.monotonic() - self.start_time
+        heap_current, heap_peak = tracemalloc.get_traced_memory()
+
+        probe_values = {}
+        for name, func in self.probes.items():
+            try:
+                probe_values[name] = float(func())
+            except Exception:
+                probe_values[name] = None
+
+        sample = {
+            'elapsed': elapsed,
+            'time': datetime.now().isoformat(timespec='seconds'),
+            'rss_mb': current_rss() / (1024 * 1024),
+            'heap_mb': heap_current / (1024 * 1024),
+            'heap_peak_mb': heap_peak / (1024 * 1024),
+            'gc_objects': len(gc.get_objects()),
+            'probes': probe_values,
+        }
+        self.samples.append(sample)
+
+        # Isınma bittiğinde karşılaştırma için referans al
+        if self.baseline_snapshot is None and elapsed >= self.warmup:
+            self.baseline_snapshot = tracemalloc.take_snapshot()
+            self.baseline_objects = object_type_counts()
+
+        return sample
+
+    def _steady_samples(self):
+        steady = [s for s in self.samples if s['elapsed'] >= self.warmup]
+        return steady if len(steady) >= 2 else self.samples
+
+    def slopes(self):
+        """Saatlik büyüme eğimleri"""
+        steady = self._steady_samples()
+        hours = [s['elapsed'] / 3600 for s in steady]
+
+        result = {
+            'rss_mb_per_hour': linear_slope(hours, [s['rss_mb'] for s in steady]),
+            'heap_mb_per_hour': linear_slope(hours, [s['heap_mb'] for s in steady]),
+            'gc_objects_per_hour': linear_slope(hours, [s['gc_objects'] for s in steady]),
+            'probes_per_hour': {},
+        }
+        for name in self.probes:
+            points = [(h, s['probes'].get(name)) for h, s in zip(hours, steady)
+                      if s['probes'].get(name) is not None]
+            result['probes_per_hour'][name] = linear_slope([p[0] for p in points],
+                                                           [p[1] for p in points])
+        return result
+
+    def evaluate(self):
+        """Limitleri kontrol et, aşılanları döndür"""
+        slopes = self.slopes()
+        failures = []
+
+        if slopes['rss_mb_per_hour'] > self.max_rss_slope:
+            failures.append(f"RSS büyümesi {slopes['rss_mb_per_hour']:.1f} MB/saat "
+                            f"(limit {self.max_rss_slope})")
+        if slopes['heap_mb_per_hour'] > self.max_heap_slope:
+            failures.append(f"Python heap büyümesi {slopes['heap_mb_per_hour']:.1f} MB/saat "
+                            f"(limit {self.max_heap_slope})")
+        for name, limit in self.probe_limits.items():
+            slope = slopes['probes_per_hour'].get(name)
+            if slope is not None and slope > limit:
+                failures.append(f"{name} büyümesi {slope:.1f}/saat (limit {limit})")
+
+        self.failures = failures
+        return failures
+
+    def top_allocators(self):
+        """Isınmadan bu yana en çok büyüyen tahsis noktaları"""
+        if self.baseline_snapshot is None or not tracemalloc.is_tracing():
+            return []
+        snapshot = tracemalloc.take_snapshot()
+        stats = snapshot.compare_to(self.baseline_snapshot, 'lineno')
+        return [
+            {
+                'location': str(stat.traceback),
+                'size_diff_kb': stat.size_diff / 1024,
+                'size_kb': stat.size / 1024,
+                'count_diff': stat.count_diff,
+            }
+            for stat in stats[:self.top_n]
+        ]
+
+    def top_object_growth(self):
+        """Isınmadan bu yana sayısı en çok artan nesne tipleri"""
+        if self.baseline_objects is None:
+            return []
+        growth = object_type_counts()
+        growth.subtract(self.baseline_objects)
+        return [{'type': name, 'growth': count}
+                for name, count in growth.most_common(self.top_n) if count > 0]
+
+    def finish(self):
+        """Son örneği al, değerlendir, raporu yaz; başarılıysa True"""
+        self.sample()
+        failures = self.evaluate()
+
+        report = {
+            'started': self.samples[0]['time'] if self.samples else None,
+            'finished': datetime.now().isoformat(timespec='seconds'),
+            'duration_seconds': self.samples[-1]['elapsed'] if self.samples else 0,
+            'passed': not failures,
+            'failures': failures,
+            'limits': {
+                'rss_mb_per_hour': self.max_rss_slope,
+                'heap_mb_per_hour': self.max_heap_slope,
+                'probes_per_hour': self.probe_limits,
+                'warmup_seconds': self.warmup,
+            },
+            'slopes': self.slopes(),
+            'top_allocators': self.top_allocators(),
+            'top_object_growth': self.top_object_growth(),
+            'samples': self.samples,
+        }
+
+        self.report_dir.mkdir(parents=True, exist_ok=True)
+        filename = f"soak_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        self.report_path = self.report_dir / filename
+        with open(self.report_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+        tracemalloc.stop()
+        return not failures
@@ -0,0 +1,362 @@
+"""
+src/utils/storage_manager.py
+Kayıtlar, kırpılmış görüntüler ve loglar için disk kotası yönetimi
+
+Kategori başına toplam bayt, dosyalar kapanırken bildirilen yollarla
+(`track_file`) artımlı tutulur; klasörler yalnızca başlangıçta ve seyrek
+aralıklarla (başka süreçlerin yazdıkları / dışarıdan silinenler için)
+taranır. Kota aşılırsa veya diskteki boş alan `min_free` altına inerse en
+eski dosyalar silinir. Yazılmakta olan dosyalar (`watch_file`) ve koruma
+süresi dolmamış kırpılmış görüntüler silinmez.
+
+Tüm disk işleri ayrı bir thread'de yapılır; tespit döngüsü yalnızca
+kuyruğa yazar ve `disk_low()` bayrağını okur.
+"""
+
+import heapq
+import logging
+import os
+import queue
+import shutil
+import threading
+import time
+
+from .metrics import get_metrics
+
+# Tek parça olarak sayılan/silinen klasörler (ör. rawcap kayıtları)
+UNIT_DIR_SUFFIXES = (".rawcap",)
+
+# Hiç silinmeyen dosyalar
+SKIP_SUFFIXES = (".partial", ".tmp")
+SKIP_NAMES = ("archive_index.json",)
+
+# Parçalı kaydın video dosyası uzantısı (.idx eşiyle birlikte silinir)
+SEGMENT_EXTENSION = ".mp4"
+
+GB = 1024 ** 3
+
+
+def _item_size(path):
+    """Dosya boyutu; klasörse içindeki dosyaların toplamı"""
+    if not os.path.isdir(path):
+        return os.path.getsize(path)
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+def _remove_item(path):
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    else:
+        os.remove(path)
+
+
+class StorageManager:
+    """
+    Disk kullanımını izleyen ve kotaları uygulayan arka plan thread'i.
+
+    Her kategori için {yol: (mtime, boyut)} ve en eskiyi hızlı bulmak için
+    (mtime, yol) yığını (heap) tutulur; yığından silinen/güncellenen
+    kayıtlar okunurken atlanır.
+    """
+
+    def __init__(self, roots, quotas=None, min_free_bytes=0, protect_seconds=None,
+                 interval=10.0, rescan_seconds=6 * 3600):
+        self.roots = {category: os.path.abspath(path) for category, path in roots.items()}
+        self.quotas = {category: int(quotas.get(category, 0)) for category in self.roots} if quotas else {}
+        self.min_free = int(min_free_bytes)
+        self.protect = dict(protect_seconds or {})
+        self.interval = interval
+        self.rescan_seconds = rescan_seconds
+        self.logger = logging.getLogger("CivataDetection.storage")
+        self.metrics = get_metrics()
+
+        self.files = {category: {} for category in self.roots}
+        self.heaps = {category: [] for category in self.roots}
+        self.totals = {category: 0 for category in self.roots}
+        self.evicted = {category: 0 for category in self.roots}
+        self.watched = {}  # {yol: kategori} yazılmakta olan dosyalar (silinmez)
+        self.free = {}  # {kategori: boş bayt}
+        self.low_space = False
+        self.report = {}
+
+        self.events = queue.SimpleQueue()
+        self.stop_event = threading.Event()
+        self.last_scan = 0.0
+        self.thread = threading.Thread(target=self._run, name="storage-manager", daemon=True)
+        self.thread.start()
+
+    # --- Tespit tarafından çağrılanlar (bloklamaz) ---
+
+    def track(self, category, path):
+        """Kapanmış dosyayı hesaba kat"""
+        self.events.put(("track", category, os.path.abspath(path)))
+
+    def watch(self, category, path):
+        """Yazılmakta olan dosya: boyutu sayılır, silinmez"""
+        self.events.put(("watch", category, os.path.abspath(path)))
+
+    def usage(self):
+        """Son kullanım özeti (istatistik/GUI için)"""
+        return self.report
+
+    def stop(self, timeout=5):
+        self.stop_event.set()
+        self.events.put(None)
+        self.thread.join(timeout=timeout)
+
+    # --- Yönetici thread'i ---
+
+    def _run(self):
+        try:
+            self._scan()
+        except Exception as e:
+            self.logger.error(f"Depolama taraması hatası: {e}")
+        next_check = 0.0
+        while not self.stop_event.is_set():
+            try:
+                event = self.events.get(timeout=max(0.0, next_check - time.monotonic()))
+                if event is None:
+                    break
+                self._apply(*event)
+            except queue.Empty:
+                pass
+            if time.monotonic() < next_check:
+                continue
+            try:
+                if self.rescan_seconds and time.monotonic() - self.last_scan >= self.rescan_seconds:
+                    self._scan()
+                self._enforce()
+                self._publish()
+            except Exception as e:
+                self.logger.error(f"Disk kotası kontrol hatası: {e}")
+            next_check = time.monotonic() + self.interval
+
+    def _add(self, category, path):
+        try:
+            stat = os.stat(path)
+            size = _item_size(path)
+        except OSError:
+            self._forget(category, path)
+            return
+        self._forget(category, path)
+        self.files[category][path] = (stat.st_mtime, size)
+        self.totals[category] += size
+        heapq.heappush(self.heaps[category], (stat.st_mtime, path))
+
+    def _forget(self, category, path):
+        entry = self.files[category].pop(path, None)
+        if entry is not None:
+            self.totals[category] -= entry[1]
+
+    def _apply(self, kind, category, path):
+        if category not in self.roots:
+            return
+        if kind == "watch":
+            self._forget(category, path)
+            self.watched[path] = category
+        else:
+            self.watched.pop(path, None)
+            self._add(category, path)
+
+    def _scan(self):
+        """Kategori klasörlerini baştan tara (başlangıçta ve rescan_seconds'da bir)"""
+        for category, root in self.roots.items():
+            self.files[category] = {}
+            self.heaps[category] = []
+            self.totals[category] = 0
+            for path in self._walk(root):
+                if path not in self.watched:
+                    self._add(category, path)
+        self.last_scan = time.monotonic()
+
+    def _walk(self, root):
+        if not os.path.isdir(root):
+            return
+        for entry in os.scandir(root):
+            if entry.name in SKIP_NAMES or entry.name.endswith(SKIP_SUFFIXES):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name.endswith(UNIT_DIR_SUFFIXES):
+                    yield entry.path
+                else:
+                    yield from self._walk(entry.path)
+            elif entry.is_file(follow_symlinks=False):
+                yield entry.path
+
+    def _oldest(self, category, now):
+        """Silinebilecek en eski kayıt (mtime, yol); yoksa None"""
+        heap = self.heaps[category]
+        while heap:
+            mtime, path = heap[0]
+            entry = self.files[category].get(path)
+            if entry is None or entry[0] != mtime:
+                heapq.heappop(heap)  # Güncel olmayan kayıt
+                continue
+            if now - mtime < self.protect.get(category, 0):
+                return None  # Yığın en eskiden sıralı: kalanların hepsi korumada
+            return mtime, path
+        return None
+
+    def _evict(self, category, path, reason):
+        """Dosyayı sil; kayıt parçası ve .idx zaman damgası dosyası birlikte silinir"""
+        stem, ext = os.path.splitext(path)
+        # .idx parçadan önce kapanır (daha eski mtime), hangisi seçilirse seçilsin eşi de gider
+        partner = stem + (SEGMENT_EXTENSION if ext == ".idx" else ".idx")
+        victims = [path]
+        if partner in self.files[category]:
+            victims.append(partner)
+        for victim in victims:
+            size = self.files[category].get(victim, (0, 0))[1]
+            try:
+                _remove_item(victim)
+            except FileNotFoundError:
+                pass  # Dışarıdan silinmiş (ör. log handler'ının backupCount'u)
+            except OSError as e:
+                self.logger.error(f"Silinemedi ({victim}): {e}")
+                self._forget(category, victim)
+                continue
+            self._forget(category, victim)
+            parent = os.path.dirname(victim)
+            if parent != self.roots[category]:
+                try:
+                    os.rmdir(parent)  # Boşalan gün klasörü
+                except OSError:
+                    pass
+            self.evicted[category] += 1
+            self.metrics.inc("civata_storage_evicted_total", 1, "Kota nedeniyle silinen dosyalar",
+                             category=category, reason=reason)
+            self.metrics.inc("civata_storage_evicted_bytes_total", size, "Kota nedeniyle silinen bayt",
+                             category=category)
+            self.logger.info(f"Disk kotası ({reason}): {victim} silindi ({size / 1024 ** 2:.1f} MB)")
+
+    def _enforce(self):
+        now = time.time()
+
+        # Kategori kotaları
+        for category, quota in self.quotas.items():
+            while quota and self._usage(category) > quota:
+                oldest = self._oldest(category, now)
+                if oldest is None:
+                    break
+                self._evict(category, oldest[1], "quota")
+
+        # Boş alan tabanı: aynı diskteki kategorilerden en eski dosya silinir
+        devices = {}
+        for category, root in self.roots.items():
+            if os.path.isdir(root):
+                devices.setdefault(os.stat(root).st_dev, []).append(category)
+        low = False
+        for categories in devices.values():
+            root = self.roots[categories[0]]
+            free = shutil.disk_usage(root).free
+            while self.min_free and free < self.min_free:
+                candidates = []
+                for category in categories:
+                    oldest = self._oldest(category, now)
+                    if oldest is not None:
+                        candidates.append((oldest, category))
+                if not candidates:
+                    break
+                (_, path), category = min(candidates)
+                self._evict(category, path, "min_free")
+                free = shutil.disk_usage(root).free
+            for category in categories:
+                self.free[category] = free
+            low = low or (self.min_free and free < self.min_free)
+
+        if low and not self.low_space:
+            self.logger.warning("Disk dolu: silinebilecek dosya kalmadı, yeni kayıtlar atlanıyor")
+        elif self.low_space and not low:
+            self.logger.info("Disk alanı yeniden yeterli, kayıtlar devam ediyor")
+        self.low_space = bool(low)
+
+    def _usage(self, category):
+        """Kapanmış dosyalar + yazılmakta olanların anlık boyutu"""
+        total = self.totals[category]
+        for path, watched_category in self.watched.items():
+            if watched_category == category:
+                try:
+                    total += os.path.getsize(path)
+                except OSError:
+                    pass
+        return total
+
+    def _publish(self):
+        report = {}
+        for category in self.roots:
+            used = self._usage(category)
+            report[category] = {
+                'bytes': used,
+                'files': len(self.files[category]),
+                'quota': self.quotas.get(category, 0),
+                'free': self.free.get(category),
+                'evicted': self.evicted[category],
+            }
+            self.metrics.set_gauge("civata_storage_bytes", used, "Kategori başına disk kullanımı",
+                                   category=category)
+            if category in self.free:
+                self.metrics.set_gauge("civata_storage_free_bytes", self.free[category],
+                                       "Kategorinin bulunduğu diskteki boş alan", category=category)
+        self.metrics.set_gauge("civata_storage_low_space", int(self.low_space),
+                               "Boş alan tabanının altında (yeni kayıtlar atlanıyor)")
+        report['low_space'] = self.low_space
+        self.report = report
+
+
+# Uygulama genelinde tek yönetici
+storage_manager = None
+
+# Yönetici başlamadan önce bildirilen, yazılmakta olan dosyalar (ör. aktif log dosyası)
+_pending_watch = {}
+
+
+def get_storage_manager(config):
+    """Global yöneticiyi döndür (ilk çağrıda oluşturulur; kapalıysa None)"""
+    global storage_manager
+    if storage_manager is None and config.storage_manager_enabled:
+        protect = {'crops': config.storage_crop_protect_hours * 3600}
+        storage_manager = StorageManager(
+            {'recordings': "src/source", 'crops': config.cropped_dir,
+             'logs': config.logs_dir, 'raw': config.raw_capture_dir},
+            quotas={category: gb * GB for category, gb in config.storage_quotas_gb.items()},
+            min_free_bytes=config.storage_min_free_gb * GB,
+            protect_seconds=protect,
+            interval=config.storage_check_interval,
+            rescan_seconds=config.storage_rescan_hours * 3600
+        )
+        for path, category in _pending_watch.items():
+            storage_manager.watch(category, path)
+        _pending_watch.clear()
+        storage_manager.logger.info(f"Disk kotası yönetimi başlatıldı (en az {config.storage_min_free_gb:.1f} GB boş)")
+    return storage_manager
+
+
+def track_file(category, path):
+    """Kapanan dosyayı bildir (yönetici yoksa bir şey yapmaz)"""
+    if storage_manager is not None:
+        storage_manager.track(category, path)
+
+
+def watch_file(category, path):
+    """Yazılmaya başlanan dosyayı bildir"""
+    if storage_manager is not None:
+        storage_manager.watch(category, path)
+    else:
+        _pending_watch[os.path.abspath(path)] = category
+
+
+def disk_low():
+    """Boş alan tabanının altında ve silinecek dosya kalmadı mı"""
+    return storage_manager is not None and storage_manager.low_space
+
+
+def storage_usage():
+    """Kategori başına kullanım özeti (yönetici yoksa boş)"""
+    return storage_manager.usage() if storage_manager is not None else {}